@@ -0,0 +1,92 @@
+"""
+Benchmark das escalações alternativas (top-K com cortes de diversidade)
+
+Mede o /optimize completo com K alternativas no pool de 800 jogadores e
+compara com o custo de refazer o modelo a cada alternativa, como fazia a
+versão recursiva de _gerar_alternativas (que, sem condição de parada,
+disparava 1 + 2 + 4 + ... otimizações; o cenário "refeito" conta só as 1 + K
+do primeiro nível, então é um limite inferior do custo antigo).
+
+Também confere que as escalações retornadas respeitam a distância mínima e
+vêm em ordem não crescente de objetivo.
+
+Uso:
+    python -m benchmarks.bench_alternatives
+"""
+
+import time
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from src.models.optimizer import TeamOptimizer
+from .bench_optimizer import _otimizar_legado
+from .synthetic import gerar_previsoes
+
+ORCAMENTO = 110.0
+ESQUEMA = '4-3-3'
+ESTRATEGIA = 'EQUILIBRADO'
+
+
+def _conferir(optimizer: TeamOptimizer, jogadores, resultado: Dict[str, Any], distancia: int) -> bool:
+    """Distância mínima entre todas as escalações e objetivos não crescentes"""
+    indice = {j.id: i for i, j in enumerate(jogadores)}
+    coef_escalado, coef_capitao = optimizer._coeficientes(jogadores, ESTRATEGIA)
+    
+    times = [resultado['time']] + resultado['alternativas']
+    conjuntos, objetivos = [], []
+    for t in times:
+        ids = [indice[j['jogador']['id']] for j in t['jogadores']]
+        capitao = next(indice[j['jogador']['id']] for j in t['jogadores'] if j['posicao_time'] == 'CAPITAO')
+        conjuntos.append(set(ids))
+        objetivos.append(coef_escalado[ids].sum() + coef_capitao[capitao])
+    
+    distantes = all(
+        len(a - b) >= distancia
+        for k, a in enumerate(conjuntos) for b in conjuntos[k + 1:]
+    )
+    ordenados = all(np.diff(objetivos) <= 1e-3 * abs(objetivos[0]))
+    
+    return distantes and ordenados
+
+
+def run(
+    ks: Tuple[int, ...] = (2, 5, 10),
+    distancia: int = 2,
+    repeticoes: int = 3
+) -> Dict[str, Any]:
+    previsoes = gerar_previsoes()
+    jogadores = TeamOptimizer._parse_previsoes(previsoes)
+    formacao = TeamOptimizer.FORMACOES[ESQUEMA]
+    
+    inicio = time.perf_counter()
+    _otimizar_legado(jogadores, ORCAMENTO, formacao, ESTRATEGIA)
+    custo_refeito = time.perf_counter() - inicio
+    
+    resultado = {}
+    for k in ks:
+        tempos = []
+        for _ in range(repeticoes):
+            optimizer = TeamOptimizer()
+            inicio = time.perf_counter()
+            saida = optimizer.optimize(
+                previsoes, ORCAMENTO, ESQUEMA, ESTRATEGIA,
+                n_alternativas=k, distancia_minima=distancia
+            )
+            tempos.append(time.perf_counter() - inicio)
+        
+        resultado[k] = {
+            'cortes_s': float(np.median(tempos)),
+            'refeito_s': custo_refeito * (1 + k),
+            'alternativas': len(saida['alternativas']),
+            'valido': _conferir(optimizer, jogadores, saida, distancia),
+        }
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    for k, metricas in run().items():
+        print(f"K={k:>2}: cortes {metricas['cortes_s'] * 1000:.0f}ms  "
+              f"modelo refeito por alternativa {metricas['refeito_s'] * 1000:.0f}ms  "
+              f"({metricas['alternativas']} alternativas, válido: {metricas['valido']})")
@@ -0,0 +1,127 @@
+"""
+Benchmark do batch-predict de uma rodada
+
+Compara o caminho anterior (lista de jogadores, features de todos com um
+ANY(:jogador_ids), predição e gravação de tudo de uma vez) com o pipeline
+em blocos (cursor no servidor, leitura, modelo e gravação sobrepostos), para
+rodadas de 800, 50 mil e 200 mil jogadores.
+
+Cada cenário roda em um subprocesso para medir o pico de memória (RSS)
+isolado; o modelo é treinado uma vez na temporada padrão e reaproveitado.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_batch_predict
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import os
+import time
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import text
+
+from src.batch_prediction import prever_rodada
+from src.database import Database
+from src.models.predictor import CartolaPredictor
+from .synthetic import bench_database_url, preparar_banco
+
+RODADA = 'rodada-01'
+
+
+def _memoria_mb(campo: str) -> float:
+    # VmHWM (pico) é zerado no exec, ao contrário do ru_maxrss, que herda o
+    # pico do processo pai
+    with open('/proc/self/status') as f:
+        for linha in f:
+            if linha.startswith(campo + ':'):
+                return int(linha.split()[1]) / 1024
+    raise RuntimeError(f"{campo} não encontrado em /proc/self/status")
+
+
+def _executar(cenario: str, modelo: str) -> Dict[str, Any]:
+    """Executa um cenário neste processo (chamado no subprocesso)"""
+    database = Database(bench_database_url())
+    predictor = CartolaPredictor()
+    predictor.load_model(modelo, lazy=False)
+    base_mb = _memoria_mb('VmRSS')
+    
+    inicio = time.perf_counter()
+    if cenario == 'antes':
+        jogadores = database.get_jogadores_rodada(RODADA)
+        features = database.get_jogadores_features([j['id'] for j in jogadores], RODADA)
+        predictions = predictor.predict(features)
+        database.save_predictions(RODADA, predictions, modelo_versao=predictor.versao)
+        total = len(predictions)
+    else:
+        total = prever_rodada(database, predictor, RODADA)['total_predictions']
+    tempo = time.perf_counter() - inicio
+    
+    database.close()
+    
+    return {
+        'total': total,
+        'tempo_s': tempo,
+        'pico_mb': _memoria_mb('VmHWM') - base_mb,
+    }
+
+
+def _limpar_previsoes(url: str) -> None:
+    database = Database(url)
+    with database.get_connection() as conn:
+        conn.execute(text('TRUNCATE previsoes'))
+        conn.commit()
+    database.close()
+
+
+def run(tamanhos: Tuple[int, ...] = (800, 50_000, 200_000)) -> Dict[int, Any]:
+    url = bench_database_url()
+    
+    engine = preparar_banco(url)
+    database = Database(url)
+    predictor = CartolaPredictor()
+    predictor.train(database.get_training_data().tail(5000))
+    database.close()
+    engine.dispose()
+    
+    resultado = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        modelo = os.path.join(tmp, 'modelo')
+        predictor.save_model(modelo)
+        
+        for n in tamanhos:
+            # 40 jogadores por clube; uma rodada basta para o batch-predict
+            engine = preparar_banco(url, n_clubes=max(n // 40, 1), n_rodadas=1)
+            engine.dispose()
+            resultado[n] = {}
+            
+            for cenario in ('antes', 'pipeline'):
+                _limpar_previsoes(url)
+                saida = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_batch_predict',
+                     '--cenario', cenario, '--modelo', modelo],
+                    check=True, capture_output=True, text=True,
+                )
+                resultado[n][cenario] = json.loads(saida.stdout.strip().splitlines()[-1])
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cenario', choices=['antes', 'pipeline'])
+    parser.add_argument('--modelo')
+    args = parser.parse_args()
+    
+    if args.cenario:
+        print(json.dumps(_executar(args.cenario, args.modelo)))
+    else:
+        for n, cenarios in run().items():
+            print(f"{n} jogadores")
+            for cenario, m in cenarios.items():
+                print(f"  {cenario:>8}: {m['tempo_s']:.2f}s  "
+                      f"{m['total'] / m['tempo_s']:.0f} previsões/s  "
+                      f"pico de memória +{m['pico_mb']:.0f}MB")
@@ -0,0 +1,143 @@
+"""
+Benchmark do batch-predict de várias rodadas (backfill após um retreino)
+
+Prevê as mesmas rodadas em três cenários e compara linhas gravadas por
+segundo, numa temporada do tamanho real (800 jogadores, 38 rodadas) e numa
+com rodadas grandes (10 mil jogadores, 10 rodadas):
+    loop antes: uma chamada por rodada com o caminho anterior ao pipeline
+        (lista de jogadores, features com ANY(:jogador_ids), predição e
+        gravação de tudo de uma vez)
+    loop pipeline: uma chamada de `prever_rodada` por rodada (o que N
+        chamadas ao /batch-predict fazem hoje)
+    multi-rodada: `prever_rodadas` com todas as rodadas numa única consulta
+
+Confere também que os três cenários gravam as mesmas previsões.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_batch_predict_rodadas
+"""
+
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from src.batch_prediction import prever_rodada, prever_rodadas
+from src.database import Database
+from src.models.predictor import CartolaPredictor
+from .synthetic import bench_database_url, preparar_banco
+
+
+def _loop_antes(database: Database, predictor: CartolaPredictor, rodada_ids: List[str]) -> int:
+    total = 0
+    for rodada_id in rodada_ids:
+        jogadores = database.get_jogadores_rodada(rodada_id)
+        features = database.get_jogadores_features([j['id'] for j in jogadores], rodada_id)
+        predictions = predictor.predict(features)
+        database.save_predictions(rodada_id, predictions, modelo_versao=predictor.versao)
+        total += len(predictions)
+    return total
+
+
+def _loop_pipeline(database: Database, predictor: CartolaPredictor, rodada_ids: List[str]) -> int:
+    return sum(
+        prever_rodada(database, predictor, rodada_id)['total_predictions']
+        for rodada_id in rodada_ids
+    )
+
+
+def _multi_rodada(database: Database, predictor: CartolaPredictor, rodada_ids: List[str]) -> int:
+    return prever_rodadas(database, predictor, rodada_ids)['total_predictions']
+
+
+CENARIOS = {
+    'loop antes': _loop_antes,
+    'loop pipeline': _loop_pipeline,
+    'multi-rodada': _multi_rodada,
+}
+
+
+def _previsoes_gravadas(database: Database) -> pd.DataFrame:
+    with database.get_connection() as conn:
+        return pd.read_sql(
+            text("""
+                SELECT rodada_id, jogador_id, pontos_esperados FROM previsoes
+                ORDER BY rodada_id, jogador_id
+            """),
+            conn
+        )
+
+
+def _limpar_previsoes(database: Database) -> None:
+    with database.get_connection() as conn:
+        conn.execute(text('TRUNCATE previsoes'))
+        conn.commit()
+
+
+def _executar(url: str, predictor: CartolaPredictor, n_clubes: int, n_rodadas: int) -> Dict[str, Any]:
+    # 40 jogadores por clube em cada rodada
+    engine = preparar_banco(url, n_clubes=n_clubes, n_rodadas=n_rodadas)
+    database = Database(url)
+    rodada_ids = database.get_rodadas_intervalo(1, n_rodadas)
+    
+    resultado = {}
+    gravadas = {}
+    try:
+        for cenario, executar in CENARIOS.items():
+            _limpar_previsoes(database)
+            inicio = time.perf_counter()
+            total = executar(database, predictor, rodada_ids)
+            tempo = time.perf_counter() - inicio
+            resultado[cenario] = {
+                'total': total,
+                'tempo_s': tempo,
+                'linhas_por_s': total / tempo,
+            }
+            gravadas[cenario] = _previsoes_gravadas(database)
+    finally:
+        database.close()
+        engine.dispose()
+    
+    esperado = gravadas['loop antes']
+    resultado['previsoes_iguais'] = all(
+        len(df) == len(esperado)
+        and (df['rodada_id'].values == esperado['rodada_id'].values).all()
+        and (df['jogador_id'].values == esperado['jogador_id'].values).all()
+        and np.allclose(df['pontos_esperados'], esperado['pontos_esperados'])
+        for df in gravadas.values()
+    )
+    
+    return resultado
+
+
+def run(temporadas: Tuple[Tuple[int, int], ...] = ((20, 38), (250, 10))) -> Dict[str, Any]:
+    """
+    Args:
+        temporadas: Pares (clubes, rodadas) testados
+    """
+    url = bench_database_url()
+    
+    # Modelo treinado na temporada padrão
+    engine = preparar_banco(url)
+    database = Database(url)
+    predictor = CartolaPredictor()
+    predictor.train(database.get_training_data().tail(5000))
+    database.close()
+    engine.dispose()
+    
+    return {
+        (n_clubes * 40, n_rodadas): _executar(url, predictor, n_clubes, n_rodadas)
+        for n_clubes, n_rodadas in temporadas
+    }
+
+
+if __name__ == '__main__':
+    for (n_jogadores, n_rodadas), resultado in run().items():
+        print(f"{n_jogadores} jogadores x {n_rodadas} rodadas")
+        for cenario in CENARIOS:
+            m = resultado[cenario]
+            print(f"  {cenario:>13}: {m['total']} previsões em {m['tempo_s']:.2f}s  "
+                  f"{m['linhas_por_s']:.0f} linhas/s")
+        print(f"  previsões iguais: {resultado['previsoes_iguais']}")
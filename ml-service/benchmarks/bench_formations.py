@@ -0,0 +1,79 @@
+"""
+Benchmark do modo esquema="AUTO" do /optimize
+
+Compara uma única requisição AUTO com as seis requisições sequenciais que o
+frontend precisava fazer (uma por formação) para descobrir a melhor, ambas
+pelo endpoint HTTP (inclui validação e serialização do pool de 800
+jogadores), e confere que a formação escolhida é a mesma.
+
+Uso:
+    python -m benchmarks.bench_formations
+"""
+
+import time
+from typing import Any, Dict
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from src import main
+from src.models.optimizer import TeamOptimizer
+from src.optimization_cache import OptimizationCache
+from src.optimization_pool import OptimizationPool
+from .synthetic import gerar_previsoes
+
+
+def _pool_aquecido() -> OptimizationPool:
+    """Pool de um processo, já iniciado, para não medir o spawn"""
+    pool = OptimizationPool(workers=1)
+    pool.warmup()
+    return pool
+
+
+def run(repeticoes: int = 5, orcamento: float = 110.0) -> Dict[str, Any]:
+    previsoes = gerar_previsoes()
+    client = TestClient(main.app)
+    main.optimization_cache = OptimizationCache(max_itens=0)
+    
+    def payload(esquema: str) -> Dict[str, Any]:
+        return {'orcamento': orcamento, 'esquema': esquema, 'previsoes': previsoes}
+    
+    tempos = {'sequencial': [], 'auto': []}
+    for _ in range(repeticoes):
+        # Pool novo a cada repetição: nenhum dos lados aproveita cache de uma
+        # repetição anterior
+        main.optimization_pool = _pool_aquecido()
+        inicio = time.perf_counter()
+        sequencial = {}
+        for esquema in TeamOptimizer.FORMACOES:
+            resposta = client.post('/optimize', json=payload(esquema))
+            resposta.raise_for_status()
+            sequencial[esquema] = resposta.json()['time']['pontos_previstos']
+        tempos['sequencial'].append(time.perf_counter() - inicio)
+        
+        main.optimization_pool.shutdown()
+        main.optimization_pool = _pool_aquecido()
+        inicio = time.perf_counter()
+        resposta = client.post('/optimize', json=payload('AUTO'))
+        resposta.raise_for_status()
+        auto = resposta.json()
+        tempos['auto'].append(time.perf_counter() - inicio)
+        main.optimization_pool.shutdown()
+    
+    return {
+        'sequencial_s': float(np.median(tempos['sequencial'])),
+        'auto_s': float(np.median(tempos['auto'])),
+        'melhor_sequencial': max(sequencial, key=sequencial.get),
+        'melhor_auto': auto['time']['esquema'],
+        'formacoes': auto['formacoes'],
+    }
+
+
+if __name__ == '__main__':
+    resultado = run()
+    print(f"6 requisições sequenciais: {resultado['sequencial_s'] * 1000:.0f}ms  "
+          f"(melhor: {resultado['melhor_sequencial']})")
+    print(f"1 requisição AUTO:         {resultado['auto_s'] * 1000:.0f}ms  "
+          f"(melhor: {resultado['melhor_auto']})")
+    for formacao in resultado['formacoes']:
+        print(f"  {formacao['esquema']}: {formacao.get('pontos_previstos', float('nan')):.2f} pontos")
@@ -0,0 +1,66 @@
+"""
+Benchmark do treinamento incremental do CartolaPredictor
+
+Simula o fechamento semanal de rodadas numa temporada sintética: a cada
+rodada nova compara o retreino completo (retrain=True, sobre todo o
+histórico) com a atualização incremental (só a rodada nova), medindo tempo
+de parede e o MAE de cada modelo na rodada seguinte, ainda não vista.
+
+Uso:
+    python -m benchmarks.bench_incremental_training
+"""
+
+import copy
+import time
+from typing import Any, Dict
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error
+
+from src.models.predictor import CartolaPredictor
+from .synthetic import gerar_features
+
+N_RODADAS = 38
+LINHAS_POR_RODADA = 680
+
+
+def run(rodada_inicial: int = 32, n_rodadas: int = N_RODADAS) -> Dict[str, Any]:
+    temporada = gerar_features(n_rodadas * LINHAS_POR_RODADA, n_rodadas=n_rodadas)
+    
+    base = CartolaPredictor()
+    base.train(temporada[temporada['rodada_numero'] <= rodada_inicial], retrain=True)
+    incremental = copy.deepcopy(base)
+    
+    tempos = {'completo': [], 'incremental': []}
+    maes = {'completo': [], 'incremental': []}
+    
+    for rodada in range(rodada_inicial + 1, n_rodadas):
+        historico = temporada[temporada['rodada_numero'] <= rodada]
+        proxima = temporada[temporada['rodada_numero'] == rodada + 1]
+        
+        completo = CartolaPredictor()
+        inicio = time.perf_counter()
+        completo.train(historico, retrain=True)
+        tempos['completo'].append(time.perf_counter() - inicio)
+        
+        inicio = time.perf_counter()
+        incremental.train(historico, retrain=False)
+        tempos['incremental'].append(time.perf_counter() - inicio)
+        
+        for nome, predictor in (('completo', completo), ('incremental', incremental)):
+            previsto = predictor.model.predict(predictor._preprocess_features(proxima))
+            maes[nome].append(mean_absolute_error(proxima['pontos'], previsto))
+    
+    return {
+        nome: {
+            'tempo_medio_s': float(np.mean(tempos[nome])),
+            'mae_medio': float(np.mean(maes[nome])),
+        }
+        for nome in tempos
+    }
+
+
+if __name__ == '__main__':
+    for nome, metricas in run().items():
+        print(f"{nome:>11}: tempo médio {metricas['tempo_medio_s']:.2f}s  "
+              f"MAE próxima rodada {metricas['mae_medio']:.4f}")
@@ -0,0 +1,97 @@
+"""
+Benchmark do custo das métricas por etapa
+
+Três medições, com a coleta ligada e desligada (METRICS_ENABLED):
+    etapa: custo por chamada de `instrumentation.etapa` vazio
+    predict: `predict_columnar` em lotes de 1, 30 e 800 jogadores
+    optimize: `TeamOptimizer.optimize` com 2 alternativas no pool de 800
+        jogadores (modelo já compilado)
+
+e o tempo de uma coleta do /metrics/prometheus depois das medições.
+
+Uso:
+    python -m benchmarks.bench_instrumentation
+"""
+
+import time
+from typing import Any, Callable, Dict
+
+from src import instrumentation
+from src.models.optimizer import TeamOptimizer
+from src.models.predictor import CartolaPredictor
+from .synthetic import gerar_features, gerar_previsoes
+
+LOTES_PREDICT = (1, 30, 800)
+
+
+def _mediana(fn: Callable[[], Any], repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def _etapa_vazia(n: int = 100_000) -> float:
+    inicio = time.perf_counter()
+    for _ in range(n):
+        with instrumentation.etapa('bench'):
+            pass
+    return (time.perf_counter() - inicio) / n
+
+
+def _medir(predictor: CartolaPredictor, optimizer: TeamOptimizer, previsoes) -> Dict[str, float]:
+    medidas = {'etapa_us': _etapa_vazia() * 1e6}
+    for n in LOTES_PREDICT:
+        data = gerar_features(n, seed=n)
+        predictor.predict_columnar(data)
+        medidas[f'predict/lote={n}'] = _mediana(lambda: predictor.predict_columnar(data), 200) * 1000
+    
+    params = dict(previsoes=previsoes, orcamento=100.0, esquema='4-3-3', n_alternativas=2)
+    optimizer.optimize(**params)
+    medidas['optimize/alternativas=2'] = _mediana(lambda: optimizer.optimize(**params), 30) * 1000
+    return medidas
+
+
+def run() -> Dict[str, Any]:
+    predictor = CartolaPredictor()
+    predictor.train(gerar_features(5_000))
+    optimizer = TeamOptimizer()
+    previsoes = gerar_previsoes()
+    
+    resultado = {}
+    # Alterna as medições para que o aquecimento não favoreça nenhuma
+    for _ in range(3):
+        for ligado in (False, True):
+            instrumentation.configurar(ligado)
+            medidas = _medir(predictor, optimizer, previsoes)
+            nome = 'ligado' if ligado else 'desligado'
+            anterior = resultado.get(nome)
+            resultado[nome] = (
+                medidas if anterior is None
+                else {k: min(v, anterior[k]) for k, v in medidas.items()}
+            )
+    
+    inicio = time.perf_counter()
+    conteudo, _ = instrumentation.exportar()
+    resultado['coleta'] = {
+        'tempo_ms': (time.perf_counter() - inicio) * 1000,
+        'bytes': len(conteudo),
+    }
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    resultado = run()
+    desligado, ligado = resultado['desligado'], resultado['ligado']
+    print(f"etapa vazia: desligado {desligado['etapa_us']:.2f}us  ligado {ligado['etapa_us']:.2f}us")
+    for caso in desligado:
+        if caso == 'etapa_us':
+            continue
+        print(f"{caso:<26} desligado {desligado[caso]:8.3f}ms  ligado {ligado[caso]:8.3f}ms  "
+              f"x{ligado[caso] / desligado[caso]:.3f}")
+    coleta = resultado['coleta']
+    print(f"coleta: {coleta['tempo_ms']:.2f}ms, {coleta['bytes']} bytes")
@@ -0,0 +1,149 @@
+"""
+Benchmark de inicialização do serviço: artefato pickle vs. formato nativo
+
+Salva o mesmo modelo duas vezes, uma como o pickle do modelo inteiro que o
+serviço carregava antes do registro (cartola_model.pkl) e outra como versão
+registrada no formato nativo (boosters em UBJSON + scaler .npz). Para cada
+formato sobe processos Python novos que executam o `lifespan` do serviço e
+medem o tempo de import, o tempo até o serviço estar pronto e a primeira
+predição (que no formato nativo inclui a leitura adiada dos boosters). Como o
+`lifespan` atual importa o pickle para o registro, no formato pickle ele roda
+com o registro vazio e o tempo de `load_model` do pickle é somado ao dele.
+
+O lifespan não abre conexões com o banco, então nenhum banco é necessário.
+
+Uso:
+    python -m benchmarks.bench_model_startup
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from .synthetic import gerar_features
+
+# URL sintaticamente válida: o lifespan só cria o engine, sem conectar
+DATABASE_URL_FICTICIA = 'postgresql://bench@localhost:1/bench'
+
+
+def _subir(model_path: str) -> Dict[str, float]:
+    """Corpo do processo filho: importa o serviço e executa o lifespan"""
+    pickle_path = model_path if os.path.isfile(model_path) else None
+    if pickle_path:
+        model_path = tempfile.mkdtemp()
+    os.environ['MODEL_PATH'] = model_path
+    os.environ['DATABASE_URL'] = DATABASE_URL_FICTICIA
+    
+    inicio = time.perf_counter()
+    from src import main
+    import_s = time.perf_counter() - inicio
+    
+    features = gerar_features(100, seed=7)
+    
+    async def ciclo() -> Dict[str, float]:
+        inicio = time.perf_counter()
+        async with main.lifespan(main.app):
+            if pickle_path:
+                main.predictor.load_model(pickle_path)
+            pronto_s = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            main.predictor.predict_columnar(features)
+            primeira_s = time.perf_counter() - inicio
+        return {'lifespan_s': pronto_s, 'primeira_predicao_s': primeira_s}
+    
+    medicao = {'import_s': import_s, **asyncio.run(ciclo())}
+    if pickle_path:
+        shutil.rmtree(model_path)
+    return medicao
+
+
+def _salvar_pickle(model_path: str, predictor) -> str:
+    """Grava o artefato legado (pickle do modelo inteiro)"""
+    from src.models.registry import LEGACY_FILE
+    
+    os.makedirs(model_path)
+    arquivo = os.path.join(model_path, LEGACY_FILE)
+    with open(arquivo, 'wb') as f:
+        pickle.dump({
+            'model': predictor.model,
+            'quantile_model': predictor.quantile_model,
+            'scaler': predictor.scaler,
+            'metrics': predictor.metrics,
+            'feature_columns': predictor.feature_columns,
+        }, f)
+    
+    return arquivo
+
+
+def _tamanho_mb(path: str) -> float:
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    total = 0
+    for raiz, _, arquivos in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(raiz, a)) for a in arquivos)
+    return total / 1e6
+
+
+def run(n_amostras: int = 20000, repeticoes: int = 5) -> Dict[str, Any]:
+    from src.models.predictor import CartolaPredictor
+    from src.models.registry import ModelRegistry
+    
+    predictor = CartolaPredictor()
+    predictor.train(gerar_features(n_amostras), retrain=True)
+    
+    resultado = {}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for formato in ('pickle', 'nativo'):
+            model_path = os.path.join(tmp, formato)
+            if formato == 'pickle':
+                alvo = artefato = _salvar_pickle(model_path, predictor)
+            else:
+                registry = ModelRegistry(model_path)
+                versao = registry.save(predictor)
+                registry.activate(versao)
+                alvo = model_path
+                artefato = os.path.join(registry.registry_path, versao)
+            
+            # A primeira execução só aquece o cache de disco dos imports
+            medicoes = []
+            for _ in range(repeticoes + 1):
+                saida = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_model_startup', '--subir', alvo],
+                    check=True, capture_output=True, text=True,
+                )
+                medicoes.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+            
+            medicoes = medicoes[1:]
+            resultado[formato] = {
+                chave: float(np.median([m[chave] for m in medicoes]))
+                for chave in medicoes[0]
+            }
+            resultado[formato]['artefato_mb'] = _tamanho_mb(artefato)
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--subir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.subir:
+        print(json.dumps(_subir(args.subir)))
+    else:
+        for formato, metricas in run().items():
+            print(f"{formato:>6}: import {metricas['import_s'] * 1000:.0f}ms  "
+                  f"lifespan {metricas['lifespan_s'] * 1000:.0f}ms  "
+                  f"primeira predição {metricas['primeira_predicao_s'] * 1000:.0f}ms  "
+                  f"artefato {metricas['artefato_mb']:.1f}MB")
@@ -0,0 +1,124 @@
+"""
+Benchmark do cache de resultados do /optimize
+
+Simula uma rodada em que a maioria dos usuários pede a recomendação com os
+padrões do frontend (orçamento 100, 4-3-3, EQUILIBRADO) e o restante varia
+orçamento, esquema, estratégia e clubes evitados. Os mesmos pedidos passam
+pelo endpoint HTTP com e sem cache; o cenário com cache confere que os
+resultados servidos do cache são iguais aos calculados e que a invalidação
+da rodada (feita pelo batch-predict) faz o pedido seguinte ser resolvido.
+
+O Redis entra no teste quando BENCH_REDIS_URL está definida (a rodada de
+teste é apagada ao final); sem ela, só o LRU local.
+
+Uso:
+    python -m benchmarks.bench_optimize_cache
+    BENCH_REDIS_URL=redis://localhost:6379/15 python -m benchmarks.bench_optimize_cache
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+from src import main
+from src.models.optimizer import TeamOptimizer
+from src.optimization_cache import OptimizationCache
+from src.optimization_pool import OptimizationPool
+from .synthetic import gerar_previsoes
+
+RODADA = 'rodada-bench-cache'
+
+
+def _pedidos(n: int, fracao_padrao: float = 0.6, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    esquemas = list(TeamOptimizer.FORMACOES)
+    estrategias = ('SEGURO', 'EQUILIBRADO', 'OUSADO')
+    clubes = [f'clube-{i:02d}' for i in range(3)]
+    
+    pedidos = []
+    for _ in range(n):
+        if rng.random() < fracao_padrao:
+            pedidos.append({'orcamento': 100.0, 'esquema': '4-3-3', 'estrategia': 'EQUILIBRADO'})
+        else:
+            pedidos.append({
+                'orcamento': float(rng.choice([90.0, 100.0, 110.0, 120.0])),
+                'esquema': esquemas[int(rng.integers(len(esquemas)))],
+                'estrategia': estrategias[int(rng.integers(len(estrategias)))],
+                'clubes_excluidos': list(rng.choice(clubes, int(rng.integers(0, 2)), replace=False)),
+            })
+    return pedidos
+
+
+async def _executar(pedidos: List[Dict[str, Any]], previsoes) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=main.app)
+    resultado = {}
+    respostas = {}
+    
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        for cenario in ('sem cache', 'com cache'):
+            main.optimization_cache = OptimizationCache(
+                max_itens=0 if cenario == 'sem cache' else 256,
+                redis_url=os.getenv('BENCH_REDIS_URL') if cenario == 'com cache' else None,
+            )
+            await main.optimization_cache.invalidar_rodada(RODADA)
+            
+            latencias = []
+            respostas[cenario] = []
+            inicio = time.perf_counter()
+            for pedido in pedidos:
+                t = time.perf_counter()
+                resposta = await client.post('/optimize', json={
+                    **pedido, 'previsoes': previsoes, 'rodada_id': RODADA
+                })
+                resposta.raise_for_status()
+                latencias.append(time.perf_counter() - t)
+                respostas[cenario].append(resposta.json())
+            total = time.perf_counter() - inicio
+            
+            ms = np.array(latencias) * 1000
+            resultado[cenario] = {
+                'total_s': total,
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p99_ms': float(np.percentile(ms, 99)),
+                'cache': (await client.get('/optimize/cache')).json(),
+            }
+        
+        resultado['resultados_iguais'] = respostas['sem cache'] == respostas['com cache']
+        
+        # Previsões novas da rodada: o próximo pedido igual volta a ser resolvido
+        cache = main.optimization_cache
+        misses = cache.stats()['misses']
+        await cache.invalidar_rodada(RODADA)
+        await client.post('/optimize', json={**pedidos[0], 'previsoes': previsoes, 'rodada_id': RODADA})
+        resultado['invalidacao_ok'] = cache.stats()['misses'] == misses + 1
+        
+        await cache.invalidar_rodada(RODADA)
+        await cache.close()
+    
+    return resultado
+
+
+def run(n_requisicoes: int = 200) -> Dict[str, Any]:
+    main.optimization_pool = OptimizationPool(workers=1)
+    main.optimization_pool.warmup()
+    try:
+        return asyncio.run(_executar(_pedidos(n_requisicoes), gerar_previsoes()))
+    finally:
+        main.optimization_pool.shutdown()
+
+
+if __name__ == '__main__':
+    resultado = run()
+    for cenario in ('sem cache', 'com cache'):
+        metricas = resultado[cenario]
+        print(f"{cenario:>9}: total {metricas['total_s']:.2f}s  "
+              f"p50 {metricas['p50_ms']:.1f}ms  p99 {metricas['p99_ms']:.1f}ms")
+    cache = resultado['com cache']['cache']
+    print(f"cache: {cache['hits_local']} hits locais, {cache['hits_redis']} hits Redis, "
+          f"{cache['misses']} misses (taxa de hit {cache['taxa_hit']:.0%})")
+    print(f"resultados iguais: {resultado['resultados_iguais']}  "
+          f"invalidação: {resultado['invalidacao_ok']}")
@@ -0,0 +1,127 @@
+"""
+Benchmark de latência do TeamOptimizer em otimizações sequenciais
+
+Resolve 1, 10 e 100 escalações seguidas sobre o mesmo pool de 800
+jogadores, variando orçamento, esquema e estratégia a cada chamada, como
+acontece quando vários usuários pedem recomendações para a mesma rodada.
+
+Cenários:
+    legado: monta o LpProblem do zero a cada chamada (listas varrendo todos
+        os jogadores por posição e por clube) e resolve com o CBC
+    cbc: modelo compilado uma vez por pool, CBC via PuLP
+    highs: modelo compilado uma vez por pool, HiGHS em processo
+
+Todos resolvem só a escalação principal (sem alternativas) e os objetivos
+são conferidos entre os cenários.
+
+Uso:
+    python -m benchmarks.bench_optimizer
+"""
+
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from pulp import (
+    LpProblem, LpVariable, LpMaximize, LpBinary, lpSum, value, PULP_CBC_CMD
+)
+
+from src.models.optimizer import TeamOptimizer, JogadorPrevisao
+from .synthetic import gerar_previsoes
+
+ESTRATEGIAS = ('EQUILIBRADO', 'SEGURO', 'OUSADO')
+
+
+def _otimizar_legado(
+    jogadores: List[JogadorPrevisao],
+    orcamento: float,
+    formacao: Dict[str, int],
+    estrategia: str
+) -> float:
+    """Construção anterior do problema, refeita a cada chamada"""
+    prob = LpProblem("Cartola_Optimization", LpMaximize)
+    x = {j.id: LpVariable(f"x_{j.id}", cat=LpBinary) for j in jogadores}
+    c = {j.id: LpVariable(f"c_{j.id}", cat=LpBinary) for j in jogadores}
+    
+    if estrategia == 'SEGURO':
+        peso = {j.id: j.pontos_esperados * (1 - j.desvio_padrao / 10) for j in jogadores}
+    elif estrategia == 'OUSADO':
+        peso = {j.id: j.pontos_esperados + j.desvio_padrao * 0.3 for j in jogadores}
+    else:
+        peso = {j.id: j.pontos_esperados for j in jogadores}
+    
+    prob += lpSum([x[j.id] * peso[j.id] for j in jogadores]) + lpSum([
+        c[j.id] * j.pontos_esperados * 0.5 for j in jogadores
+    ])
+    prob += lpSum([x[j.id] * j.preco for j in jogadores]) <= orcamento
+    for posicao, quantidade in formacao.items():
+        if quantidade > 0:
+            prob += lpSum([x[j.id] for j in jogadores if j.posicao == posicao]) == quantidade
+    prob += lpSum([x[j.id] for j in jogadores]) == sum(formacao.values())
+    prob += lpSum([c[j.id] for j in jogadores]) == 1
+    for j in jogadores:
+        prob += c[j.id] <= x[j.id]
+    for clube in set(j.clube_id for j in jogadores):
+        prob += lpSum([x[j.id] for j in jogadores if j.clube_id == clube]) <= 3
+    
+    prob.solve(PULP_CBC_CMD(msg=0))
+    
+    return value(prob.objective)
+
+
+def _objetivo(jogadores, optimizer: TeamOptimizer, escalacao, estrategia: str) -> float:
+    coef_escalado, coef_capitao = optimizer._coeficientes(jogadores, estrategia)
+    selecionados, capitao = escalacao
+    return float(coef_escalado[selecionados].sum() + coef_capitao[capitao])
+
+
+def _pedidos(n: int) -> List[Tuple[float, str, str]]:
+    rng = np.random.default_rng(n)
+    esquemas = list(TeamOptimizer.FORMACOES)
+    return [
+        (float(rng.uniform(80, 140)), esquemas[i % len(esquemas)], ESTRATEGIAS[i % len(ESTRATEGIAS)])
+        for i in range(n)
+    ]
+
+
+def run(sequencias: Tuple[int, ...] = (1, 10, 100)) -> Dict[str, Any]:
+    previsoes = gerar_previsoes()
+    jogadores = TeamOptimizer._parse_previsoes(previsoes)
+    
+    resultado = {}
+    for n in sequencias:
+        pedidos = _pedidos(n)
+        objetivos = {}
+        resultado[n] = {}
+        
+        for cenario in ('legado', 'cbc', 'highs'):
+            optimizer = TeamOptimizer(backend='cbc' if cenario == 'legado' else cenario)
+            objetivos[cenario] = []
+            
+            inicio = time.perf_counter()
+            for orcamento, esquema, estrategia in pedidos:
+                formacao = TeamOptimizer.FORMACOES[esquema]
+                if cenario == 'legado':
+                    objetivo = _otimizar_legado(jogadores, orcamento, formacao, estrategia)
+                else:
+                    escalacao = optimizer._escalar(jogadores, orcamento, formacao, estrategia)
+                    objetivo = _objetivo(jogadores, optimizer, escalacao, estrategia)
+                objetivos[cenario].append(objetivo)
+            total = time.perf_counter() - inicio
+            
+            resultado[n][cenario] = {'total_s': total, 'media_ms': total / n * 1000}
+        
+        resultado[n]['objetivos_iguais'] = all(
+            np.allclose(objetivos['legado'], objetivos[cenario], atol=1e-4)
+            for cenario in ('cbc', 'highs')
+        )
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    for n, cenarios in run().items():
+        print(f"{n} otimizações (objetivos iguais: {cenarios.pop('objetivos_iguais')})")
+        for cenario, metricas in cenarios.items():
+            print(f"  {cenario:>6}: total {metricas['total_s']:.2f}s  "
+                  f"média {metricas['media_ms']:.0f}ms")
@@ -0,0 +1,85 @@
+"""
+Benchmark de CartolaPredictor.predict para lotes grandes
+
+Separa o tempo de inferência do modelo do tempo de montagem do resultado,
+comparando o loop antigo (data.iloc[i] por linha) com a montagem colunar e a
+serialização JSON compacta do modo `formato=colunar`. Também compara o custo
+da incerteza antiga (desvio dos índices de folha via `apply`, que materializa
+uma matriz n x n_estimators) com o modelo de quantis.
+
+Uso:
+    python -m benchmarks.bench_predict
+"""
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.main import _colunar_response
+from src.models.predictor import CartolaPredictor
+from .synthetic import gerar_features
+
+TAMANHOS = (1_000, 10_000)
+
+
+def _montagem_legada(data: pd.DataFrame, predictions, std_predictions) -> List[Dict[str, Any]]:
+    """Montagem linha a linha usada antes do caminho colunar"""
+    results = []
+    for i, (pred, std) in enumerate(zip(predictions, std_predictions)):
+        jogador_id = data.iloc[i]['jogador_id']
+        results.append({
+            'jogador_id': str(jogador_id),
+            'pontos_esperados': float(max(0, pred)),
+            'desvio_padrao': float(std),
+            'intervalo_inferior': float(max(0, pred - 1.96 * std)),
+            'intervalo_superior': float(max(0, pred + 1.96 * std)),
+        })
+    return results
+
+
+def _cronometrar(fn, repeticoes: int = 3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = fn()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def run(tamanhos=TAMANHOS) -> Dict[str, Any]:
+    predictor = CartolaPredictor()
+    predictor.train(gerar_features(5_000))
+    
+    resultado = {}
+    for n in tamanhos:
+        data = gerar_features(n, seed=n)
+        X = predictor._preprocess_features(data)
+        
+        predictions, t_inferencia = _cronometrar(lambda: predictor.model.predict(X))
+        _, t_folhas = _cronometrar(lambda: np.std(predictor.model.apply(X), axis=1))
+        _, t_quantis = _cronometrar(lambda: predictor.quantile_model.predict(X))
+        std = np.ones(n)
+        _, t_legado = _cronometrar(lambda: _montagem_legada(data, predictions, std))
+        
+        _, t_predict = _cronometrar(lambda: predictor.predict(data))
+        columns, t_colunar = _cronometrar(lambda: predictor.predict_columnar(data))
+        _, t_json = _cronometrar(lambda: _colunar_response(columns))
+        
+        resultado[n] = {
+            'inferencia_s': t_inferencia,
+            'incerteza_folhas_s': t_folhas,
+            'incerteza_quantis_s': t_quantis,
+            'montagem_legada_s': t_legado,
+            'predict_registros_s': t_predict,
+            'predict_colunar_s': t_colunar,
+            'json_colunar_s': t_json,
+        }
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    for n, metricas in run().items():
+        print(f"{n:>6} jogadores: " + '  '.join(f"{k}={v * 1000:.1f}ms" for k, v in metricas.items()))
@@ -0,0 +1,167 @@
+"""
+Benchmark de latência do /predict sob carga concorrente
+
+Compara o acesso ao banco anterior (NullPool e consultas síncronas dentro dos
+handlers async, bloqueando o event loop) com o pool de conexões +
+AsyncDatabase. Cada cenário sobe o serviço com uvicorn em um subprocesso,
+apontado para o banco de BENCH_DATABASE_URL, e recebe requisições
+concorrentes via HTTP.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_predict_latency
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+from src.database import Database
+from src.models.predictor import CartolaPredictor
+from .synthetic import bench_database_url, preparar_banco
+
+PORTA = 8765
+
+
+class _BlockingDatabase:
+    """Reproduz o comportamento antigo: chamadas síncronas no event loop"""
+    
+    def __init__(self, database: Database):
+        self.database = database
+    
+    def is_connected(self) -> bool:
+        return self.database.is_connected()
+    
+    async def get_jogadores_features(self, jogador_ids, rodada_id):
+        return self.database.get_jogadores_features(jogador_ids, rodada_id)
+
+
+def _servir(modo: str, modelo: str, porta: int) -> None:
+    """Sobe o serviço com o acesso ao banco do cenário escolhido"""
+    import uvicorn
+    from src import main
+    from src.database import AsyncDatabase
+    
+    url = bench_database_url()
+    main.predictor = CartolaPredictor()
+    main.predictor.load_model(modelo)
+    if modo == 'antes':
+        main.db = _BlockingDatabase(Database(url, pool_size=0))
+    else:
+        main.db = AsyncDatabase(Database(url))
+    
+    uvicorn.run(main.app, host='127.0.0.1', port=porta, lifespan='off', log_level='warning')
+
+
+async def _disparar(
+    base_url: str,
+    payloads: List[Dict[str, Any]],
+    concorrencia: int
+) -> List[float]:
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias = []
+    limits = httpx.Limits(max_connections=concorrencia)
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def requisicao(payload):
+            async with semaforo:
+                inicio = time.perf_counter()
+                response = await client.post('/predict', json=payload)
+                latencias.append(time.perf_counter() - inicio)
+                response.raise_for_status()
+        
+        await asyncio.gather(*(requisicao(p) for p in payloads))
+    
+    return latencias
+
+
+def _aguardar_servico(base_url: str, timeout: float = 30) -> None:
+    limite = time.time() + timeout
+    while time.time() < limite:
+        try:
+            if httpx.get(f'{base_url}/health').status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Serviço não respondeu ao health check")
+
+
+def _resumo(latencias: List[float], total_s: float) -> Dict[str, float]:
+    ms = np.array(latencias) * 1000
+    return {
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'throughput_rps': len(latencias) / total_s,
+    }
+
+
+def run(
+    n_requisicoes: int = 300,
+    concorrencia: int = 20,
+    jogadores_por_requisicao: int = 30
+) -> Dict[str, Any]:
+    url = bench_database_url()
+    engine = preparar_banco(url)
+    
+    db = Database(url)
+    treino = db.get_training_data()
+    predictor = CartolaPredictor()
+    predictor.train(treino.tail(5000))
+    db.close()
+    
+    jogador_ids = [str(i) for i in treino['jogador_id'].unique()]
+    rng = np.random.default_rng(0)
+    payloads = [
+        {
+            'jogadores': [str(j) for j in rng.choice(jogador_ids, jogadores_por_requisicao, replace=False)],
+            'rodada_id': 'rodada-38',
+        }
+        for _ in range(n_requisicoes)
+    ]
+    
+    base_url = f'http://127.0.0.1:{PORTA}'
+    resultado = {}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        modelo = os.path.join(tmp, 'modelo')
+        predictor.save_model(modelo)
+        
+        for modo in ('antes', 'depois'):
+            servidor = subprocess.Popen([
+                sys.executable, '-m', 'benchmarks.bench_predict_latency',
+                '--servir', modo, '--modelo', modelo, '--porta', str(PORTA),
+            ])
+            try:
+                _aguardar_servico(base_url)
+                inicio = time.perf_counter()
+                latencias = asyncio.run(_disparar(base_url, payloads, concorrencia))
+                resultado[modo] = _resumo(latencias, time.perf_counter() - inicio)
+            finally:
+                servidor.terminate()
+                servidor.wait()
+    
+    engine.dispose()
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--servir', choices=['antes', 'depois'])
+    parser.add_argument('--modelo')
+    parser.add_argument('--porta', type=int, default=PORTA)
+    args = parser.parse_args()
+    
+    if args.servir:
+        _servir(args.servir, args.modelo, args.porta)
+    else:
+        for nome, metricas in run().items():
+            print(f"{nome:>6}: " + '  '.join(f"{k}={v:.1f}" for k, v in metricas.items()))
@@ -0,0 +1,125 @@
+"""
+Benchmark do cache de previsões do /predict
+
+Envia as mesmas requisições /predict (30 jogadores sorteados cada) em três
+cenários, pelo endpoint HTTP em processo e com o banco de
+BENCH_DATABASE_URL:
+    sem cache: features + modelo a cada requisição
+    frio: cache vazio, preenchido pelas próprias requisições
+    batch: cache preenchido antes pelo /batch-predict da rodada
+
+Reporta p50/p99, taxa de hit e o tempo economizado estimado pelo cache, e
+confere que as previsões servidas do cache são iguais às calculadas.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_prediction_cache
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+from src import main
+from src.database import Database, AsyncDatabase
+from src.models.predictor import CartolaPredictor
+from src.optimization_cache import OptimizationCache
+from src.prediction_cache import PredictionCache
+from .synthetic import bench_database_url, preparar_banco
+
+RODADA = 'rodada-38'
+
+
+def _por_jogador(respostas: List[List[Dict[str, Any]]]) -> Dict[str, float]:
+    return {p['jogador_id']: p['pontos_esperados'] for r in respostas for p in r}
+
+
+async def _executar(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=main.app)
+    resultado = {}
+    respostas = {}
+    
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=60) as client:
+        for cenario in ('sem cache', 'frio', 'batch'):
+            main.prediction_cache = PredictionCache(max_rodadas=0 if cenario == 'sem cache' else 2)
+            if cenario == 'batch':
+                inicio = time.perf_counter()
+                resposta = await client.post('/batch-predict', params={'rodada_id': RODADA})
+                resposta.raise_for_status()
+                resultado['batch_predict_s'] = time.perf_counter() - inicio
+            
+            latencias = []
+            respostas[cenario] = []
+            for payload in payloads:
+                inicio = time.perf_counter()
+                resposta = await client.post('/predict', json=payload)
+                resposta.raise_for_status()
+                latencias.append(time.perf_counter() - inicio)
+                respostas[cenario].append(resposta.json())
+            
+            ms = np.array(latencias) * 1000
+            stats = (await client.get('/predict/cache')).json()
+            resultado[cenario] = {
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p99_ms': float(np.percentile(ms, 99)),
+                'taxa_hit': stats['taxa_hit'],
+                'tempo_economizado_ms': stats['tempo_economizado_ms'],
+            }
+    
+    esperado = _por_jogador(respostas['sem cache'])
+    resultado['previsoes_iguais'] = all(
+        _por_jogador(respostas[cenario]).keys() == esperado.keys()
+        and np.allclose(
+            [_por_jogador(respostas[cenario])[j] for j in esperado],
+            list(esperado.values())
+        )
+        for cenario in ('frio', 'batch')
+    )
+    
+    return resultado
+
+
+def run(n_requisicoes: int = 300, jogadores_por_requisicao: int = 30) -> Dict[str, Any]:
+    url = bench_database_url()
+    engine = preparar_banco(url)
+    
+    database = Database(url)
+    treino = database.get_training_data()
+    predictor = CartolaPredictor()
+    predictor.train(treino.tail(5000))
+    
+    jogador_ids = [str(i) for i in treino['jogador_id'].unique()]
+    rng = np.random.default_rng(0)
+    payloads = [
+        {
+            'jogadores': [str(j) for j in rng.choice(jogador_ids, jogadores_por_requisicao, replace=False)],
+            'rodada_id': RODADA,
+        }
+        for _ in range(n_requisicoes)
+    ]
+    
+    main.predictor = predictor
+    main.db = AsyncDatabase(database)
+    main.optimization_cache = OptimizationCache(max_itens=0)
+    try:
+        return asyncio.run(_executar(payloads))
+    finally:
+        main.db.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    resultado = run()
+    print(f"batch-predict da rodada: {resultado['batch_predict_s'] * 1000:.0f}ms")
+    for cenario in ('sem cache', 'frio', 'batch'):
+        m = resultado[cenario]
+        taxa = f"{m['taxa_hit']:.0%}" if m['taxa_hit'] is not None else '-'
+        economizado = (
+            f"{m['tempo_economizado_ms'] / 1000:.1f}s"
+            if m['tempo_economizado_ms'] is not None else '-'
+        )
+        print(f"{cenario:>9}: p50 {m['p50_ms']:.1f}ms  p99 {m['p99_ms']:.1f}ms  "
+              f"hit {taxa}  economizado {economizado}")
+    print(f"previsões iguais: {resultado['previsoes_iguais']}")
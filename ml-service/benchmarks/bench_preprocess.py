@@ -0,0 +1,90 @@
+"""
+Benchmark de CartolaPredictor._preprocess_features
+
+Compara o preprocessamento anterior (cópia do DataFrame inteiro, map +
+fillna nas categorias, `.values` numa seleção mista e scaler em float64) com
+a passada coluna a coluna para uma matriz float32. Mede tempo e memória
+alocada (pico do tracemalloc) por 10 mil linhas e confere que a matriz e as
+previsões são as mesmas.
+
+Uso:
+    python -m benchmarks.bench_preprocess
+"""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.models.predictor import CartolaPredictor
+from .synthetic import gerar_features
+
+TAMANHOS = (10_000, 100_000)
+
+
+def _preprocess_legado(predictor: CartolaPredictor, df: pd.DataFrame) -> np.ndarray:
+    """Preprocessamento usado antes da passada em float32"""
+    data = df.copy()
+    data['posicao'] = data['posicao'].map(predictor.posicao_map).fillna(0)
+    data['status'] = data['status'].map(predictor.status_map).fillna(0)
+    for col in predictor.feature_columns:
+        if col not in data.columns:
+            data[col] = 0
+    features = data[predictor.feature_columns + predictor.categorical_columns].values
+    return predictor.scaler.transform(features)
+
+
+def _medir(fn: Callable[[], np.ndarray], repeticoes: int = 5) -> Dict[str, float]:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    
+    tracemalloc.start()
+    fn()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {'tempo_s': melhor, 'pico_mb': pico / 1024 ** 2}
+
+
+def run(tamanhos=TAMANHOS) -> Dict[int, Any]:
+    predictor = CartolaPredictor()
+    predictor.train(gerar_features(5_000))
+    
+    resultado = {}
+    for n in tamanhos:
+        data = gerar_features(n, seed=n)
+        # Categorias fora do mapa e features nulas, como vêm do banco
+        data.loc[data.index[::97], 'status'] = 'DESCONHECIDO'
+        data.loc[data.index[::89], 'forca_adversario'] = np.nan
+        
+        antes = _preprocess_legado(predictor, data)
+        depois = predictor._preprocess_features(data)
+        
+        resultado[n] = {
+            'antes': _medir(lambda: _preprocess_legado(predictor, data)),
+            'depois': _medir(lambda: predictor._preprocess_features(data)),
+            'dtype': {'antes': str(antes.dtype), 'depois': str(depois.dtype)},
+            'matriz_igual': bool(np.array_equal(
+                antes.astype(np.float32), depois, equal_nan=True
+            )),
+            'previsoes_iguais': bool(np.array_equal(
+                predictor.model.predict(antes), predictor.model.predict(depois)
+            )),
+        }
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    for n, m in run().items():
+        print(f"{n} linhas")
+        for cenario in ('antes', 'depois'):
+            por_10k = m[cenario]['tempo_s'] * 10_000 / n * 1000
+            print(f"  {cenario:>6}: {por_10k:.2f}ms / 10k linhas  "
+                  f"pico alocado {m[cenario]['pico_mb']:.1f}MB  ({m['dtype'][cenario]})")
+        print(f"  matriz igual: {m['matriz_igual']}  previsões iguais: {m['previsoes_iguais']}")
@@ -0,0 +1,168 @@
+"""
+Benchmark da poda por dominância do TeamOptimizer
+
+Duas partes:
+    propriedade: em pools aleatórios (clubes, status, orçamentos, esquemas,
+        estratégias, número de alternativas e distâncias), confere que a
+        escalação ótima e cada uma das K alternativas do otimizador com
+        poda valem o mesmo que o ótimo sem poda sob os mesmos cortes de
+        diversidade
+    tempo: tamanho do modelo e latência média por otimização no pool de 800
+        jogadores, com e sem poda, nos backends CBC e HiGHS
+
+Qualquer divergência na propriedade termina com código de saída 1, para
+usar o benchmark como verificação de regressão (só a propriedade com
+--propriedade).
+
+Uso:
+    python -m benchmarks.bench_pruning
+    python -m benchmarks.bench_pruning --propriedade --casos 50
+"""
+
+import sys
+import time
+import argparse
+from typing import Any, Dict
+
+import numpy as np
+
+from src.models.optimizer import TeamOptimizer
+from .bench_optimizer import ESTRATEGIAS, _objetivo, _pedidos
+from .synthetic import gerar_previsoes
+
+# Tolerância relativa do gap de otimalidade do MIP (padrão do HiGHS: 1e-4)
+TOLERANCIA = 2e-4
+
+# Alternativas e distâncias mínimas sorteadas em cada caso
+N_ALTERNATIVAS = (2, 5, 10)
+DISTANCIAS = (2, 4, 7)
+
+# Casos fixos em que a poda com folga constante (independente do número de
+# cortes) mudava alternativas tardias: (seed do pool de 20 clubes,
+# orçamento, esquema, estratégia, alternativas, distância mínima)
+CASOS_FIXOS = [
+    (21, 120.0, '3-5-2', 'SEGURO', 10, 7),
+    (21, 100.0, '5-3-2', 'SEGURO', 10, 7),
+    (21, 140.0, '3-4-3', 'SEGURO', 10, 7),
+]
+
+
+def verificar_propriedade(n_casos: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """
+    Compara as escalações com e sem poda em casos aleatórios e em
+    CASOS_FIXOS
+    
+    A cadeia de alternativas é a do otimizador com poda; a k-ésima é
+    comparada com o ótimo sem poda sob os mesmos k cortes (empates podem
+    levar as duas cadeias a escalações diferentes de mesmo valor).
+    
+    Returns:
+        Casos, divergências (caso, alternativa, esperado, obtido) e fração
+        média de candidatos removidos
+    """
+    rng = np.random.default_rng(seed)
+    esquemas = list(TeamOptimizer.FORMACOES)
+    casos = []
+    for _ in range(n_casos):
+        previsoes = gerar_previsoes(
+            n_clubes=int(rng.integers(8, 21)),
+            status_provavel=float(rng.uniform(0.5, 1.0)),
+            seed=int(rng.integers(1 << 31)),
+        )
+        casos.append((
+            previsoes,
+            float(rng.uniform(70, 160)),
+            esquemas[int(rng.integers(len(esquemas)))],
+            ESTRATEGIAS[int(rng.integers(len(ESTRATEGIAS)))],
+            N_ALTERNATIVAS[int(rng.integers(len(N_ALTERNATIVAS)))],
+            DISTANCIAS[int(rng.integers(len(DISTANCIAS)))],
+        ))
+    for seed_pool, *pedido in CASOS_FIXOS:
+        casos.append((gerar_previsoes(n_clubes=20, seed=seed_pool), *pedido))
+    
+    divergencias = []
+    removidos = []
+    alternativas = 0
+    
+    for caso, (previsoes, orcamento, esquema, estrategia, n_alternativas, distancia) in enumerate(casos):
+        jogadores = TeamOptimizer._parse_previsoes(previsoes)
+        formacao = TeamOptimizer.FORMACOES[esquema]
+        
+        com_poda = TeamOptimizer(backend='highs')
+        sem_poda = TeamOptimizer(backend='highs', podar=False)
+        removidos.append(1 - len(com_poda._modelo_para(jogadores)[1]) / len(jogadores))
+        
+        cortes = []
+        for k in range(n_alternativas + 1):
+            esperado = sem_poda._escalar(jogadores, orcamento, formacao, estrategia, cortes, distancia)
+            obtido = com_poda._escalar(jogadores, orcamento, formacao, estrategia, cortes, distancia)
+            if esperado is None or obtido is None:
+                if (esperado is None) != (obtido is None):
+                    divergencias.append((caso, k, esperado is not None, obtido is not None))
+                break
+            
+            objetivo_esperado = _objetivo(jogadores, sem_poda, esperado, estrategia)
+            objetivo_obtido = _objetivo(jogadores, com_poda, obtido, estrategia)
+            if not np.isclose(objetivo_esperado, objetivo_obtido, rtol=TOLERANCIA):
+                divergencias.append((caso, k, objetivo_esperado, objetivo_obtido))
+            alternativas += k > 0
+            cortes.append(obtido[0])
+    
+    return {
+        'casos': len(casos),
+        'alternativas': alternativas,
+        'divergencias': divergencias,
+        'fracao_removida_media': float(np.mean(removidos)),
+    }
+
+
+def medir_tempo(n_otimizacoes: int = 30) -> Dict[str, Any]:
+    """Latência média por otimização no pool de 800 jogadores"""
+    jogadores = TeamOptimizer._parse_previsoes(gerar_previsoes())
+    pedidos = _pedidos(n_otimizacoes)
+    resultado = {}
+    
+    for backend in ('cbc', 'highs'):
+        for podar in (False, True):
+            optimizer = TeamOptimizer(backend=backend, podar=podar)
+            _, candidatos = optimizer._modelo_para(jogadores)
+            
+            inicio = time.perf_counter()
+            for orcamento, esquema, estrategia in pedidos:
+                optimizer._escalar(jogadores, orcamento, TeamOptimizer.FORMACOES[esquema], estrategia)
+            total = time.perf_counter() - inicio
+            
+            resultado[f"{backend}{' + poda' if podar else ''}"] = {
+                'candidatos': len(candidatos),
+                'media_ms': total / n_otimizacoes * 1000,
+            }
+    
+    return resultado
+
+
+def run(n_casos: int = 200, tempo: bool = True) -> Dict[str, Any]:
+    return {
+        'propriedade': verificar_propriedade(n_casos),
+        'tempo': medir_tempo() if tempo else {},
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--casos', type=int, default=200, help='Casos aleatórios da propriedade')
+    parser.add_argument('--propriedade', action='store_true', help='Só a verificação da propriedade')
+    args = parser.parse_args()
+    
+    resultado = run(args.casos, tempo=not args.propriedade)
+    propriedade = resultado['propriedade']
+    print(f"Propriedade: {propriedade['casos']} casos, {propriedade['alternativas']} alternativas, "
+          f"{len(propriedade['divergencias'])} divergências, "
+          f"{propriedade['fracao_removida_media']:.0%} dos candidatos removidos em média")
+    for divergencia in propriedade['divergencias']:
+        print(f"  caso {divergencia[0]}, alternativa {divergencia[1]}: "
+              f"sem poda {divergencia[2]}, com poda {divergencia[3]}")
+    for cenario, metricas in resultado['tempo'].items():
+        print(f"  {cenario:>12}: {metricas['candidatos']} candidatos  "
+              f"média {metricas['media_ms']:.0f}ms")
+    if propriedade['divergencias']:
+        sys.exit(1)
@@ -0,0 +1,113 @@
+"""
+Benchmark de Database.save_predictions
+
+Mede linhas/segundo do upsert em `previsoes` para 1k, 10k e 100k previsões,
+comparando o loop antigo (um INSERT ... ON CONFLICT por previsão) com o
+caminho em lote.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_save_predictions
+"""
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import text
+
+from src.database import Database
+from .synthetic import bench_database_url, preparar_banco
+
+TAMANHOS = (1_000, 10_000, 100_000)
+
+# Upsert linha a linha usado antes do caminho em lote, mantido como referência
+LEGACY_QUERY = text("""
+    INSERT INTO previsoes (
+        id, jogador_id, rodada_id, pontos_esperados, desvio_padrao,
+        intervalo_inferior, intervalo_superior, modelo_versao, created_at, updated_at
+    ) VALUES (
+        gen_random_uuid(), :jogador_id, :rodada_id, :pontos_esperados,
+        :desvio_padrao, :intervalo_inferior, :intervalo_superior,
+        :modelo_versao, NOW(), NOW()
+    )
+    ON CONFLICT (jogador_id, rodada_id) DO UPDATE SET
+        pontos_esperados = EXCLUDED.pontos_esperados,
+        desvio_padrao = EXCLUDED.desvio_padrao,
+        intervalo_inferior = EXCLUDED.intervalo_inferior,
+        intervalo_superior = EXCLUDED.intervalo_superior,
+        modelo_versao = EXCLUDED.modelo_versao,
+        updated_at = NOW()
+""")
+
+
+def _legado(db: Database, rodada_id: str, predictions: List[Dict[str, Any]]) -> None:
+    with db.get_connection() as conn:
+        for pred in predictions:
+            conn.execute(LEGACY_QUERY, {
+                'jogador_id': pred['jogador_id'],
+                'rodada_id': rodada_id,
+                'pontos_esperados': pred['pontos_esperados'],
+                'desvio_padrao': pred['desvio_padrao'],
+                'intervalo_inferior': pred['intervalo_inferior'],
+                'intervalo_superior': pred['intervalo_superior'],
+                'modelo_versao': '1.0.0',
+            })
+        conn.commit()
+
+
+def _previsoes(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    pontos = rng.normal(3, 2, n).clip(0)
+    desvio = rng.uniform(0.5, 3, n)
+    return [
+        {
+            'jogador_id': f'jogador-{i:06d}',
+            'pontos_esperados': float(p),
+            'desvio_padrao': float(d),
+            'intervalo_inferior': float(max(0, p - 1.96 * d)),
+            'intervalo_superior': float(p + 1.96 * d),
+        }
+        for i, (p, d) in enumerate(zip(pontos, desvio))
+    ]
+
+
+def _limpar(db: Database) -> None:
+    with db.get_connection() as conn:
+        conn.execute(text('TRUNCATE previsoes'))
+        conn.commit()
+
+
+def run(tamanhos=TAMANHOS, batch_size: int = 1000) -> Dict[str, Any]:
+    url = bench_database_url()
+    engine = preparar_banco(url, n_rodadas=1)
+    db = Database(url)
+    
+    resultado = {}
+    for n in tamanhos:
+        predictions = _previsoes(n)
+        linha = {}
+        for nome, salvar in (
+            ('legado', lambda: _legado(db, 'rodada-bench', predictions)),
+            ('lote', lambda: db.save_predictions(
+                'rodada-bench', predictions, modelo_versao='bench', batch_size=batch_size
+            )),
+        ):
+            _limpar(db)
+            inicio = time.perf_counter()
+            salvar()
+            linha[f'{nome}_linhas_s'] = n / (time.perf_counter() - inicio)
+        resultado[n] = linha
+    
+    db.close()
+    engine.dispose()
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    for n, metricas in run().items():
+        print(
+            f"{n:>7} previsões: legado {metricas['legado_linhas_s']:>9.0f} linhas/s"
+            f"  lote {metricas['lote_linhas_s']:>9.0f} linhas/s"
+            f"  ({metricas['lote_linhas_s'] / metricas['legado_linhas_s']:.1f}x)"
+        )
@@ -0,0 +1,267 @@
+"""
+Benchmark das features de scouts e confronto
+
+Três medições:
+    calculo: `calcular_features` numa temporada (800×38 e 10k×38) vs. uma
+        referência em pandas com groupby/rolling por jogador e por clube,
+        conferindo que os valores são iguais, e que as linhas de cada rodada
+        não dependem das seguintes (scouts e placares de rodadas futuras e o
+        elo atual dos clubes alterados)
+    treino: `get_training_data` com as features calculadas, no banco
+    predicao: `get_jogadores_features` de 30 jogadores com o cache vazio
+        (passada sobre a temporada) e preenchido, e se as features de uma
+        rodada são as mesmas no treino e na predição
+
+Valores diferentes da referência ou dependência de rodadas futuras terminam
+com código de saída 1.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_scout_features
+"""
+
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.database import Database
+from src.scout_features import COLUNAS, ELO_INICIAL, ELO_K, PADROES, calcular_features
+from .synthetic import bench_database_url, gerar_dados, preparar_banco
+
+TEMPORADAS = {'800x38': 20, '10kx38': 250}
+
+# Diferença aceita entre implementações (ordem das operações em ponto flutuante)
+TOLERANCIA = 1e-9
+
+# Rodadas a partir das quais os dados são alterados na checagem de vazamento
+CORTES = (2, 10, 20, 38)
+
+
+def _cronometrar(fn):
+    inicio = time.perf_counter()
+    resultado = fn()
+    return resultado, time.perf_counter() - inicio
+
+
+def _janela(df: pd.DataFrame, grupo: str, coluna: str, k: int) -> pd.Series:
+    """Soma das `k` linhas anteriores dentro do grupo (df ordenado)"""
+    anterior = df.groupby(grupo)[coluna].shift(1).fillna(0)
+    return anterior.groupby(df[grupo]).rolling(k, min_periods=1).sum().reset_index(level=0, drop=True)
+
+
+def _elo_referencia(rodadas: pd.DataFrame, clubes: pd.DataFrame, jogos: pd.DataFrame) -> pd.DataFrame:
+    """Elo de cada clube no início de cada rodada, jogo a jogo"""
+    elo = {clube: ELO_INICIAL for clube in clubes['id']}
+    linhas = []
+    for rodada_id in rodadas['rodada_id']:
+        linhas.extend((clube, rodada_id, valor) for clube, valor in elo.items())
+        novo = dict(elo)
+        for jogo in jogos[jogos['rodada_id'] == rodada_id].itertuples():
+            if pd.isna(jogo.gols_mandante) or pd.isna(jogo.gols_visitante):
+                continue
+            mandante, visitante = jogo.clube_mandante_id, jogo.clube_visitante_id
+            esperado = 1 / (1 + 10 ** ((elo[visitante] - elo[mandante]) / 400))
+            resultado = 1.0 if jogo.gols_mandante > jogo.gols_visitante else (
+                0.5 if jogo.gols_mandante == jogo.gols_visitante else 0.0
+            )
+            novo[mandante] += ELO_K * (resultado - esperado)
+            novo[visitante] -= ELO_K * (resultado - esperado)
+        elo = novo
+    return pd.DataFrame(linhas, columns=['adversario', 'rodada_id', 'elo_adversario'])
+
+
+def referencia(dados: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """As mesmas features, linha a linha em pandas (groupby/rolling e merges)"""
+    rodadas = dados['rodadas'][['id', 'numero']].rename(columns={'id': 'rodada_id'})
+    rodadas['ordem'] = np.arange(len(rodadas))
+    
+    grade = dados['jogadores'][['id', 'clube_id']].rename(columns={'id': 'jogador_id'})
+    grade = grade.merge(rodadas, how='cross')
+    scouts = dados['scouts'].rename(columns={'clube_id': 'clube_scout'})
+    scouts['jogou'] = 1.0
+    scouts['ofensivo'] = scouts['gols'] + scouts['assistencias'] + scouts['finalizacoes']
+    scouts['defensivo'] = scouts['desarmes'] + scouts['defesas']
+    grade = grade.merge(
+        scouts[['jogador_id', 'rodada_id', 'clube_scout', 'jogou', 'gols', 'assistencias',
+                'ofensivo', 'defensivo']],
+        on=['jogador_id', 'rodada_id'], how='left'
+    ).sort_values(['jogador_id', 'ordem'], ignore_index=True)
+    grade['clube_id'] = grade['clube_scout'].fillna(grade['clube_id'])
+    for coluna in ('jogou', 'gols', 'assistencias', 'ofensivo', 'defensivo'):
+        grade[coluna] = grade[coluna].fillna(0)
+    
+    grade['gols_ultimas_3'] = _janela(grade, 'jogador_id', 'gols', 3)
+    grade['assistencias_ultimas_3'] = _janela(grade, 'jogador_id', 'assistencias', 3)
+    jogos_5 = _janela(grade, 'jogador_id', 'jogou', 5)
+    grade['scout_ofensivo'] = (_janela(grade, 'jogador_id', 'ofensivo', 5) / jogos_5).fillna(0)
+    grade['scout_defensivo'] = (_janela(grade, 'jogador_id', 'defensivo', 5) / jogos_5).fillna(0)
+    
+    # Um registro por clube em cada jogo, com o adversário e o placar
+    jogos = dados['jogos']
+    lados = pd.concat([
+        pd.DataFrame({
+            'rodada_id': jogos['rodada_id'], 'clube_id': jogos['clube_mandante_id'],
+            'adversario': jogos['clube_visitante_id'], 'mandante': 1,
+            'pro': jogos['gols_mandante'], 'contra': jogos['gols_visitante'],
+        }),
+        pd.DataFrame({
+            'rodada_id': jogos['rodada_id'], 'clube_id': jogos['clube_visitante_id'],
+            'adversario': jogos['clube_mandante_id'], 'mandante': 0,
+            'pro': jogos['gols_visitante'], 'contra': jogos['gols_mandante'],
+        }),
+    ])
+    clubes = dados['clubes'][['id']].rename(columns={'id': 'clube_id'}).merge(rodadas, how='cross')
+    clubes = clubes.merge(lados, on=['clube_id', 'rodada_id'], how='left')
+    clubes = clubes.sort_values(['clube_id', 'ordem'], ignore_index=True)
+    clubes['jogou'] = (clubes['pro'].notna() & clubes['contra'].notna()).astype(float)
+    clubes['pro'] = clubes['pro'].where(clubes['jogou'] > 0, 0)
+    clubes['contra'] = clubes['contra'].where(clubes['jogou'] > 0, 0)
+    jogos_clube = _janela(clubes, 'clube_id', 'jogou', 5).replace(0, np.nan)
+    clubes['marcados'] = _janela(clubes, 'clube_id', 'pro', 5) / jogos_clube
+    clubes['sofridos'] = _janela(clubes, 'clube_id', 'contra', 5) / jogos_clube
+    
+    grade = grade.merge(
+        clubes[['clube_id', 'rodada_id', 'adversario', 'mandante', 'marcados', 'sofridos']],
+        on=['clube_id', 'rodada_id'], how='left'
+    )
+    grade = grade.merge(
+        clubes[['clube_id', 'rodada_id', 'marcados', 'sofridos']].rename(columns={
+            'clube_id': 'adversario', 'marcados': 'adv_marcados', 'sofridos': 'adv_sofridos'
+        }),
+        on=['adversario', 'rodada_id'], how='left'
+    )
+    grade = grade.merge(
+        _elo_referencia(rodadas, dados['clubes'], jogos), on=['adversario', 'rodada_id'], how='left'
+    )
+    
+    grade['eh_mandante'] = grade['mandante'].fillna(0).astype(int)
+    grade['forca_adversario'] = grade['elo_adversario'].fillna(PADROES['forca_adversario'])
+    fazer = grade[['marcados', 'adv_sofridos']].mean(axis=1)
+    sofrer = grade[['sofridos', 'adv_marcados']].mean(axis=1)
+    grade['prob_fazer_gol'] = (1 - np.exp(-fazer)).fillna(PADROES['prob_fazer_gol'])
+    grade['prob_sofrer_gol'] = (1 - np.exp(-sofrer)).fillna(PADROES['prob_sofrer_gol'])
+    
+    grade = grade.rename(columns={'numero': 'rodada_numero'})
+    return grade[['jogador_id', 'rodada_id', 'rodada_numero'] + COLUNAS]
+
+
+def _diferenca(a: pd.DataFrame, b: pd.DataFrame, chaves: List[str]) -> float:
+    """Maior diferença entre as features de `a` e `b` (inf se faltam linhas em `b`)"""
+    comparado = a.merge(b, on=chaves, suffixes=('_a', '_b'))
+    if len(comparado) != len(a):
+        return float('inf')
+    return max(
+        float(np.abs(comparado[f'{c}_a'].astype(float) - comparado[f'{c}_b'].astype(float)).max())
+        for c in COLUNAS
+    )
+
+
+def _vazamento(entradas: Dict[str, pd.DataFrame], seed: int = 0) -> float:
+    """
+    Maior diferença nas linhas das rodadas até cada corte quando os dados
+    posteriores mudam: scouts e placares das rodadas a partir do corte
+    sorteados de novo e o elo atual dos clubes (estado do fim da temporada)
+    """
+    rng = np.random.default_rng(seed)
+    original = calcular_features(**entradas)
+    numero = dict(zip(entradas['rodadas']['id'], entradas['rodadas']['numero']))
+    diferenca = 0.0
+    
+    for corte in CORTES:
+        alterado = {tabela: df.copy() for tabela, df in entradas.items()}
+        scouts = alterado['scouts']
+        futuro = scouts['rodada_id'].map(numero).to_numpy() >= corte
+        for coluna in ('gols', 'assistencias', 'finalizacoes', 'desarmes', 'defesas'):
+            scouts.loc[futuro, coluna] = rng.poisson(2.0, int(futuro.sum()))
+        jogos = alterado['jogos']
+        futuro = jogos['rodada_id'].map(numero).to_numpy() >= corte
+        for coluna in ('gols_mandante', 'gols_visitante'):
+            jogos.loc[futuro, coluna] = rng.poisson(3.0, int(futuro.sum()))
+        clubes = alterado['clubes']
+        clubes['elo_geral'] = rng.normal(1500, 200, len(clubes))
+        
+        passado = original['rodada_numero'] <= corte
+        diferenca = max(diferenca, _diferenca(
+            original[passado], calcular_features(**alterado)[passado], ['jogador_id', 'rodada_id']
+        ))
+    
+    return diferenca
+
+
+def _calculo() -> Dict[str, Any]:
+    resultado = {}
+    for nome, n_clubes in TEMPORADAS.items():
+        dados = gerar_dados(n_clubes=n_clubes)
+        entradas = {
+            tabela: dados[tabela] for tabela in ('rodadas', 'clubes', 'jogadores', 'scouts', 'jogos')
+        }
+        features, t_vetorizado = _cronometrar(lambda: calcular_features(**entradas))
+        ref, t_referencia = _cronometrar(lambda: referencia(entradas))
+        resultado[nome] = {
+            'linhas': len(features),
+            'scouts': len(dados['scouts']),
+            'referencia_s': t_referencia,
+            'vetorizado_s': t_vetorizado,
+            'diferenca_maxima': _diferenca(features, ref, ['jogador_id', 'rodada_id']),
+            'vazamento': _vazamento(entradas),
+        }
+    return resultado
+
+
+def _banco() -> Dict[str, Any]:
+    url = bench_database_url()
+    engine = preparar_banco(url)
+    db = Database(url)
+    
+    treino, t_treino = _cronometrar(db.get_training_data)
+    
+    rodada = 20
+    rodada_id = f'rodada-{rodada:02d}'
+    ids = treino.loc[treino['rodada_numero'] == rodada, 'jogador_id'].tolist()
+    db.scout_features.invalidar()
+    _, t_frio = _cronometrar(lambda: db.get_jogadores_features(ids[:30], rodada_id))
+    tempos = []
+    for _ in range(50):
+        _, t = _cronometrar(lambda: db.get_jogadores_features(ids[:30], rodada_id))
+        tempos.append(t)
+    
+    predicao = db.get_jogadores_features(ids, rodada_id)
+    diferenca = _diferenca(
+        treino.loc[treino['rodada_numero'] == rodada], predicao, ['jogador_id']
+    )
+    
+    db.close()
+    engine.dispose()
+    
+    return {
+        'treino_linhas': len(treino),
+        'get_training_data_s': t_treino,
+        'predicao_cache_vazio_ms': t_frio * 1000,
+        'predicao_cache_ms': float(np.median(tempos)) * 1000,
+        'treino_vs_predicao_diferenca': diferenca,
+    }
+
+
+def run() -> Dict[str, Any]:
+    return {'calculo': _calculo(), 'banco': _banco()}
+
+
+if __name__ == '__main__':
+    resultado = run()
+    for nome, medidas in resultado['calculo'].items():
+        print(f"{nome}: {medidas['linhas']} linhas, {medidas['scouts']} scouts  "
+              f"referência {medidas['referencia_s']:.2f}s  vetorizado {medidas['vetorizado_s']:.3f}s  "
+              f"x{medidas['referencia_s'] / medidas['vetorizado_s']:.0f}  "
+              f"diferença máxima {medidas['diferenca_maxima']:.2e}  "
+              f"vazamento {medidas['vazamento']:.2e}")
+    for chave, valor in resultado['banco'].items():
+        print(f"{chave:>30}: {valor}")
+    
+    divergencias = [
+        medidas[chave] for medidas in resultado['calculo'].values()
+        for chave in ('diferenca_maxima', 'vazamento')
+    ] + [resultado['banco']['treino_vs_predicao_diferenca']]
+    if max(divergencias) > TOLERANCIA:
+        sys.exit(1)
@@ -0,0 +1,143 @@
+"""
+Benchmark da simulação Monte Carlo de escalações
+
+Três medições:
+    motor: 10 mil cenários x 50 escalações (sorteadas no pool de 800
+        jogadores, o pior caso de jogadores envolvidos), em um núcleo
+    exatidão: média e desvio simulados vs. os valores analíticos do modelo
+        (capitão em dobro, correlação por clube)
+    /optimize: latência com e sem `simular` por estratégia, a posição no
+        ILP da escalação escolhida e o p10/p90 da escalação do ILP vs. da
+        escolhida
+
+Uso:
+    OMP_NUM_THREADS=1 python -m benchmarks.bench_simulation
+"""
+
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.models.optimizer import TeamOptimizer, ESTRATEGIAS
+from src.models.simulation import LineupSimulator
+from .synthetic import gerar_previsoes
+
+
+def _escalacoes_aleatorias(n_jogadores: int, n: int, seed: int = 0) -> List[Tuple[np.ndarray, int]]:
+    rng = np.random.default_rng(seed)
+    escalacoes = []
+    for _ in range(n):
+        selecionados = rng.choice(n_jogadores, 12, replace=False)
+        escalacoes.append((selecionados, int(selecionados[0])))
+    return escalacoes
+
+
+def _analitico(simulador: LineupSimulator, clubes: np.ndarray, escalacao) -> Tuple[float, float]:
+    selecionados, capitao = escalacao
+    pesos = np.zeros(len(simulador.pontos))
+    pesos[selecionados] = 1
+    pesos[capitao] += 1
+    rho = simulador.correlacao_clube
+    sigma_pesos = pesos * simulador.desvio
+    por_clube = np.array([sigma_pesos[clubes == c].sum() for c in np.unique(clubes)])
+    variancia = rho * (por_clube ** 2).sum() + (1 - rho) * (sigma_pesos ** 2).sum()
+    return float(pesos @ simulador.pontos), float(np.sqrt(variancia))
+
+
+def _motor(previsoes, n_cenarios: int = 10_000, n_escalacoes: int = 50) -> Dict[str, Any]:
+    pontos = [p['pontosEsperados'] for p in previsoes]
+    desvio = [p['desvioPadrao'] for p in previsoes]
+    clubes = np.array([p['jogador']['clubeId'] for p in previsoes])
+    escalacoes = _escalacoes_aleatorias(len(previsoes), n_escalacoes)
+    
+    simulador = LineupSimulator(pontos, desvio, clubes, n_cenarios=n_cenarios)
+    simulador.evaluate(escalacoes)
+    tempos = []
+    for _ in range(5):
+        inicio = time.perf_counter()
+        avaliacoes = simulador.evaluate(escalacoes, alvo=60.0)
+        tempos.append(time.perf_counter() - inicio)
+    
+    erros_media, erros_desvio = [], []
+    for escalacao, avaliacao in zip(escalacoes, avaliacoes):
+        media, desvio_total = _analitico(simulador, clubes, escalacao)
+        erros_media.append(abs(avaliacao['media'] - media) / desvio_total)
+        erros_desvio.append(abs(avaliacao['desvio_padrao'] / desvio_total - 1))
+    
+    return {
+        'cenarios': n_cenarios,
+        'escalacoes': n_escalacoes,
+        'tempo_ms': min(tempos) * 1000,
+        # Erro da média em desvios padrão do total; do desvio, relativo
+        'erro_media_max': max(erros_media),
+        'erro_desvio_max': max(erros_desvio),
+    }
+
+
+def _optimize(previsoes, repeticoes: int = 3) -> Dict[str, Any]:
+    optimizer = TeamOptimizer()
+    resultado = {}
+    for estrategia in ESTRATEGIAS:
+        medidas = {}
+        for simular in (False, True):
+            optimizer.optimize(previsoes, 100.0, '4-3-3', estrategia, simular=simular)
+            melhor = float('inf')
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                saida = optimizer.optimize(previsoes, 100.0, '4-3-3', estrategia, simular=simular)
+                melhor = min(melhor, time.perf_counter() - inicio)
+            medidas['com simulacao' if simular else 'sem simulacao'] = melhor * 1000
+        
+        simulacao = saida['simulacao']
+        jogadores = optimizer._parse_previsoes(previsoes)
+        indice = {j.id: i for i, j in enumerate(jogadores)}
+        simulador = LineupSimulator(
+            [j.pontos_esperados for j in jogadores],
+            [j.desvio_padrao for j in jogadores],
+            [j.clube_id for j in jogadores],
+        )
+        
+        def avaliar(time_result):
+            selecionados = [indice[j['jogador']['id']] for j in time_result['jogadores']]
+            capitao = next(
+                indice[j['jogador']['id']] for j in time_result['jogadores']
+                if j['posicao_time'] == 'CAPITAO'
+            )
+            return simulador.evaluate([(selecionados, capitao)])[0]
+        
+        do_ilp = avaliar(optimizer.optimize(previsoes, 100.0, '4-3-3', estrategia)['time'])
+        escolhida = saida['time']['simulacao']
+        resultado[estrategia] = {
+            'latencia_ms': medidas,
+            'criterio': simulacao['criterio'],
+            'posicao_ilp': simulacao['posicao_ilp'],
+            'ilp': {c: do_ilp[c] for c in ('media', 'p10', 'p90')},
+            'escolhida': {c: escolhida[c] for c in ('media', 'p10', 'p90')},
+        }
+    
+    return resultado
+
+
+def run() -> Dict[str, Any]:
+    previsoes = gerar_previsoes()
+    return {
+        'motor': _motor(previsoes),
+        'optimize': _optimize(previsoes),
+    }
+
+
+if __name__ == '__main__':
+    resultado = run()
+    motor = resultado['motor']
+    print(f"motor: {motor['cenarios']} cenários x {motor['escalacoes']} escalações "
+          f"em {motor['tempo_ms']:.0f}ms")
+    print(f"exatidão: erro máximo da média {motor['erro_media_max']:.3f} desvios, "
+          f"do desvio {motor['erro_desvio_max']:.1%}")
+    for estrategia, m in resultado['optimize'].items():
+        print(f"{estrategia:>11}: sem simulação {m['latencia_ms']['sem simulacao']:.0f}ms  "
+              f"com {m['latencia_ms']['com simulacao']:.0f}ms  "
+              f"critério {m['criterio']}, escolhida na posição {m['posicao_ilp']} do ILP")
+        for nome in ('ilp', 'escolhida'):
+            v = m[nome]
+            print(f"{'':>13}{nome:>9}: média {v['media']:.1f}  p10 {v['p10']:.1f}  p90 {v['p90']:.1f}")
@@ -0,0 +1,131 @@
+"""
+Benchmark de Database.get_training_data
+
+Compara as subqueries correlacionadas originais com a feature store
+materializada (refresh completo, refresh incremental de uma rodada nova e
+leitura) em uma temporada sintética de 38 rodadas x 800 jogadores.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_training_data
+"""
+
+import time
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from src.database import Database
+from src.feature_store import FeatureStore
+from .synthetic import bench_database_url, preparar_banco
+
+# Query de get_training_data antes da feature store, mantida como referência
+LEGACY_QUERY = """
+    SELECT 
+        j.id as jogador_id,
+        r.numero as rodada_numero,
+        pt.pontos,
+        COALESCE(
+            (SELECT AVG(pt2.pontos) 
+             FROM pontuacoes pt2 
+             WHERE pt2.jogador_id = j.id 
+             AND pt2.rodada_id IN (
+                 SELECT id FROM rodadas 
+                 WHERE numero < r.numero 
+                 ORDER BY numero DESC 
+                 LIMIT 3
+             )), 
+            j.media_pontos
+        ) as media_3_rodadas,
+        COALESCE(
+            (SELECT AVG(pt2.pontos) 
+             FROM pontuacoes pt2 
+             WHERE pt2.jogador_id = j.id 
+             AND pt2.rodada_id IN (
+                 SELECT id FROM rodadas 
+                 WHERE numero < r.numero 
+                 ORDER BY numero DESC 
+                 LIMIT 5
+             )), 
+            j.media_pontos
+        ) as media_5_rodadas,
+        COALESCE(
+            (SELECT STDDEV(pt2.pontos) 
+             FROM pontuacoes pt2 
+             WHERE pt2.jogador_id = j.id 
+             AND pt2.rodada_id IN (
+                 SELECT id FROM rodadas 
+                 WHERE numero < r.numero 
+                 ORDER BY numero DESC 
+                 LIMIT 5
+             )), 
+            2.0
+        ) as desvio_padrao
+    FROM pontuacoes pt
+    JOIN jogadores j ON pt.jogador_id = j.id
+    JOIN clubes c ON j.clube_id = c.id
+    JOIN rodadas r ON pt.rodada_id = r.id
+    WHERE pt.pontos IS NOT NULL
+    ORDER BY r.numero ASC
+"""
+
+FEATURES = ['media_3_rodadas', 'media_5_rodadas', 'desvio_padrao']
+
+
+def _cronometrar(fn):
+    inicio = time.perf_counter()
+    resultado = fn()
+    return resultado, time.perf_counter() - inicio
+
+
+def run(n_rodadas: int = 38, n_clubes: int = 20) -> Dict[str, Any]:
+    url = bench_database_url()
+    engine = preparar_banco(url, n_rodadas=n_rodadas, n_clubes=n_clubes)
+    db = Database(url)
+    
+    with engine.connect() as conn:
+        legado, t_legado = _cronometrar(lambda: pd.read_sql(text(LEGACY_QUERY), conn))
+    
+    _, t_refresh_full = _cronometrar(lambda: db.feature_store.refresh(full=True))
+    
+    # Simula o fechamento de uma rodada nova removendo a última da store
+    with engine.connect() as conn:
+        conn.execute(text(
+            f"DELETE FROM {FeatureStore.TABLE} WHERE rodada_numero = :n"
+        ), {'n': n_rodadas})
+        conn.commit()
+    _, t_refresh_inc = _cronometrar(db.feature_store.refresh)
+    
+    novo, t_leitura = _cronometrar(db.get_training_data)
+    
+    comparado = legado.merge(
+        novo[['jogador_id', 'rodada_numero'] + FEATURES],
+        on=['jogador_id', 'rodada_numero'],
+        suffixes=('_legado', '_store')
+    )
+    diferenca = max(
+        float(np.abs(comparado[f'{c}_legado'] - comparado[f'{c}_store']).max())
+        for c in FEATURES
+    )
+    
+    db.close()
+    engine.dispose()
+    
+    return {
+        'linhas': len(novo),
+        'linhas_iguais': len(comparado) == len(legado) == len(novo),
+        'diferenca_maxima': diferenca,
+        'legado_s': t_legado,
+        'refresh_completo_s': t_refresh_full,
+        'refresh_incremental_s': t_refresh_inc,
+        'leitura_s': t_leitura,
+    }
+
+
+if __name__ == '__main__':
+    resultado = run()
+    for chave, valor in resultado.items():
+        print(f"{chave:>24}: {valor}")
+    print(f"{'speedup (legado/leitura)':>24}: "
+          f"{resultado['legado_s'] / resultado['leitura_s']:.1f}x")
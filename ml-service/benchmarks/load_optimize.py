@@ -0,0 +1,202 @@
+"""
+Teste de carga do /optimize
+
+Dispara N requisições /optimize concorrentes (pool de 800 jogadores,
+orçamentos, esquemas e estratégias variados) e, em paralelo, sonda o
+/health para medir quanto o event loop fica bloqueado. Reporta latência,
+throughput, respostas 429/504 e as métricas do pool (/optimize/metrics),
+que separam espera na fila e tempo de resolução.
+
+Cenários (servidor local, uvicorn em subprocesso):
+    antes: otimização síncrona dentro do handler, como era antes do pool
+    pool: OptimizationPool com os parâmetros de --workers e --max-fila
+
+Com --url, roda só a carga contra um serviço já no ar.
+
+Uso:
+    python -m benchmarks.load_optimize
+    python -m benchmarks.load_optimize --requisicoes 200 --concorrencia 32
+    python -m benchmarks.load_optimize --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from .bench_optimizer import _pedidos
+from .bench_predict_latency import _aguardar_servico
+from .synthetic import gerar_previsoes
+
+PORTA = 8766
+
+
+class _OtimizacaoSincrona:
+    """Reproduz o comportamento antigo: solver rodando no event loop"""
+    
+    def __init__(self):
+        from src.models.optimizer import TeamOptimizer
+        self.optimizer = TeamOptimizer()
+    
+    async def optimize(self, **params) -> Dict[str, Any]:
+        return self.optimizer.optimize(**params)
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {}
+
+
+def _servir(modo: str, porta: int, workers: Optional[int], max_fila: Optional[int]) -> None:
+    import uvicorn
+    from src import main
+    from src.optimization_cache import OptimizationCache
+    from src.optimization_pool import OptimizationPool
+    
+    # Sem cache de resultados: a carga mede o solver
+    main.optimization_cache = OptimizationCache(max_itens=0)
+    if modo == 'antes':
+        main.optimization_pool = _OtimizacaoSincrona()
+    else:
+        main.optimization_pool = OptimizationPool(workers=workers, max_fila=max_fila)
+        main.optimization_pool.warmup()
+    
+    uvicorn.run(main.app, host='127.0.0.1', port=porta, lifespan='off', log_level='warning')
+
+
+def _percentis(amostras: List[float]) -> Dict[str, Optional[float]]:
+    if not amostras:
+        return {'p50_ms': None, 'p99_ms': None}
+    ms = np.array(amostras) * 1000
+    return {'p50_ms': float(np.percentile(ms, 50)), 'p99_ms': float(np.percentile(ms, 99))}
+
+
+async def _carga(
+    base_url: str,
+    n_requisicoes: int,
+    concorrencia: int,
+    n_alternativas: int
+) -> Dict[str, Any]:
+    previsoes = gerar_previsoes()
+    payloads = [
+        {
+            'orcamento': orcamento,
+            'esquema': esquema,
+            'estrategia': estrategia,
+            'previsoes': previsoes,
+            'n_alternativas': n_alternativas,
+        }
+        for orcamento, esquema, estrategia in _pedidos(n_requisicoes)
+    ]
+    
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias, health = [], []
+    status: Dict[int, int] = {}
+    terminou = asyncio.Event()
+    limits = httpx.Limits(max_connections=concorrencia + 1)
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def requisicao(payload):
+            async with semaforo:
+                inicio = time.perf_counter()
+                response = await client.post('/optimize', json=payload)
+                status[response.status_code] = status.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    latencias.append(time.perf_counter() - inicio)
+        
+        async def sondar_health():
+            while not terminou.is_set():
+                inicio = time.perf_counter()
+                await client.get('/health')
+                health.append(time.perf_counter() - inicio)
+                await asyncio.sleep(0.05)
+        
+        sonda = asyncio.create_task(sondar_health())
+        inicio = time.perf_counter()
+        await asyncio.gather(*(requisicao(p) for p in payloads))
+        total = time.perf_counter() - inicio
+        terminou.set()
+        await sonda
+        
+        metricas_pool = (await client.get('/optimize/metrics')).json()
+    
+    return {
+        'status': status,
+        'throughput_rps': status.get(200, 0) / total,
+        'optimize': _percentis(latencias),
+        'health': _percentis(health),
+        'pool': metricas_pool,
+    }
+
+
+def run(
+    n_requisicoes: int = 60,
+    concorrencia: int = 16,
+    n_alternativas: int = 2,
+    workers: Optional[int] = None,
+    max_fila: Optional[int] = None,
+    url: Optional[str] = None
+) -> Dict[str, Any]:
+    if url:
+        return {'remoto': asyncio.run(_carga(url, n_requisicoes, concorrencia, n_alternativas))}
+    
+    base_url = f'http://127.0.0.1:{PORTA}'
+    resultado = {}
+    
+    for modo in ('antes', 'pool'):
+        comando = [
+            sys.executable, '-m', 'benchmarks.load_optimize',
+            '--servir', modo, '--porta', str(PORTA),
+        ]
+        if workers:
+            comando += ['--workers', str(workers)]
+        if max_fila is not None:
+            comando += ['--max-fila', str(max_fila)]
+        
+        servidor = subprocess.Popen(comando)
+        try:
+            _aguardar_servico(base_url, timeout=60)
+            resultado[modo] = asyncio.run(
+                _carga(base_url, n_requisicoes, concorrencia, n_alternativas)
+            )
+        finally:
+            servidor.terminate()
+            servidor.wait()
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--servir', choices=['antes', 'pool'])
+    parser.add_argument('--porta', type=int, default=PORTA)
+    parser.add_argument('--url')
+    parser.add_argument('--requisicoes', type=int, default=60)
+    parser.add_argument('--concorrencia', type=int, default=16)
+    parser.add_argument('--alternativas', type=int, default=2)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--max-fila', type=int)
+    args = parser.parse_args()
+    
+    if args.servir:
+        _servir(args.servir, args.porta, args.workers, args.max_fila)
+    else:
+        resultado = run(
+            args.requisicoes, args.concorrencia, args.alternativas,
+            args.workers, args.max_fila, args.url
+        )
+        for nome, metricas in resultado.items():
+            def fmt(p):
+                return '  '.join(f"{k}={v:.0f}" if v is not None else f"{k}=-" for k, v in p.items())
+            
+            print(f"{nome}: status {metricas['status']}  {metricas['throughput_rps']:.1f} req/s")
+            print(f"  /optimize {fmt(metricas['optimize'])}")
+            print(f"  /health   {fmt(metricas['health'])}")
+            pool = metricas['pool']
+            if pool:
+                print(f"  fila      {fmt(pool['espera_fila'])}  "
+                      f"(recusadas={pool['recusadas']} timeouts={pool['timeouts']})")
+                print(f"  resolução {fmt(pool['resolucao'])}")
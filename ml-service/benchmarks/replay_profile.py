@@ -0,0 +1,116 @@
+"""
+Reproduz offline um pedido perfilado em produção
+
+Lê as entradas gravadas com o perfil (X-Profile-Token no /optimize ou no
+/train) e executa de novo a mesma chamada ao TeamOptimizer ou ao
+CartolaPredictor, com a mesma configuração, medindo cada repetição. A
+primeira otimização compila o modelo (worker frio); as seguintes
+reaproveitam o modelo compilado, como um worker aquecido.
+
+Com --perfil, mais uma execução roda sob o profiler e o novo perfil é
+gravado em <diretório do perfil>/replay/.
+
+Uso:
+    python -m benchmarks.replay_profile /app/profiles/<id>
+    python -m benchmarks.replay_profile /app/profiles/<id> --repeticoes 5 --perfil deterministico
+    python -m benchmarks.replay_profile /app/profiles/<id> --model-path /app/models
+"""
+
+import os
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+from src import profiling
+from src.models.optimizer import TeamOptimizer
+from src.models.predictor import CartolaPredictor
+from src.models.registry import ModelRegistry
+
+
+def _optimize(entradas: Dict[str, Any], model_path: Optional[str]) -> Callable[[], Any]:
+    optimizer = TeamOptimizer(**entradas['optimizer'])
+    return lambda: optimizer.optimize(**entradas['params'])
+
+
+def _train(entradas: Dict[str, Any], model_path: Optional[str]) -> Callable[[], Any]:
+    base = entradas['base']
+    if base and not model_path:
+        raise ValueError(
+            f"Treino incremental a partir de {base}: informe --model-path com o registro"
+        )
+    
+    def treinar():
+        # Cada repetição parte do mesmo estado: o treino altera o predictor
+        predictor = ModelRegistry(model_path).load(base) if base else CartolaPredictor()
+        return predictor.train(entradas['training_data'], **entradas['opcoes'])
+    
+    return treinar
+
+
+REPLAYS = {
+    'optimize': _optimize,
+    'train': _train,
+}
+
+
+def run(
+    diretorio: str,
+    repeticoes: int = 3,
+    modo_perfil: Optional[str] = None,
+    model_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Returns:
+        Meta do perfil original, tempos das repetições e, com `modo_perfil`,
+        o meta do novo perfil
+    """
+    with open(os.path.join(diretorio, profiling.ARQUIVO_META)) as f:
+        meta = json.load(f)
+    entradas = profiling.carregar_entradas(diretorio)
+    executar = REPLAYS[meta['endpoint']](entradas, model_path)
+    
+    tempos: List[float] = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+    
+    resultado = {'original': meta, 'tempos_s': tempos, 'replay': None}
+    if modo_perfil:
+        perfil = {
+            'id': f"{meta['id']}-replay",
+            'endpoint': meta['endpoint'],
+            'diretorio': os.path.join(diretorio, 'replay'),
+            'modo': modo_perfil,
+            'intervalo_s': meta['intervalo_s'],
+        }
+        profiling.perfilar(perfil, entradas, executar)
+        with open(os.path.join(perfil['diretorio'], profiling.ARQUIVO_META)) as f:
+            resultado['replay'] = json.load(f)
+    
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('diretorio', help='Diretório do perfil (PROFILING_DIR/<id>)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--perfil', choices=profiling.MODOS,
+                        help='Perfila mais uma execução com este modo')
+    parser.add_argument('--model-path', help='Registro de modelos (treino incremental)')
+    args = parser.parse_args()
+    
+    resultado = run(args.diretorio, args.repeticoes, args.perfil, args.model_path)
+    original = resultado['original']
+    print(f"{original['id']}: {original['endpoint']} em {original['duracao_s']:.3f}s "
+          f"no pid {original['pid']} ({original['modo']})")
+    for k, tempo in enumerate(resultado['tempos_s'], 1):
+        print(f"  replay {k}: {tempo:.3f}s")
+    
+    replay = resultado['replay']
+    if replay:
+        print(f"perfil do replay em {replay['diretorio']}/{replay['arquivo']}")
+        for funcao in replay['funcoes'][:10]:
+            print(f"  próprio {funcao['proprio_s']:8.3f}s  inclusivo {funcao['inclusivo_s']:8.3f}s  "
+                  f"{funcao['funcao']}")
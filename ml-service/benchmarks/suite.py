@@ -0,0 +1,287 @@
+"""
+Suíte de benchmarks dos caminhos críticos do ML Service
+
+Mede, sobre a temporada sintética (20 clubes, 800 jogadores, 38 rodadas de
+pontuações e scouts), os pontos em que uma regressão apareceria primeiro:
+
+    training_data: `Database.get_training_data` da temporada
+    treino: `CartolaPredictor.train` com os dados da temporada
+    predict: `predict_columnar` em lotes de 1, 30, 800 e 10 mil jogadores
+    optimize: `TeamOptimizer.optimize` por tamanho do pool e formação
+    save_predictions: upsert de 800 e 10 mil previsões
+
+Cada caso é repetido e guarda mínimo, mediana e máximo; a saída em JSON
+traz o commit e o ambiente e pode ser comparada com a de outro commit.
+Os casos que usam banco precisam de BENCH_DATABASE_URL e ficam de fora sem
+ela (o treino usa então `gerar_features` no lugar do banco).
+
+Uso:
+    python -m benchmarks.suite --saida resultados.json
+    python -m benchmarks.suite --casos predict optimize --repeticoes 10
+    python -m benchmarks.suite --comparar base.json [nova.json] [--limite 1.1]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from src.database import Database
+from src.models.optimizer import TeamOptimizer
+from src.models.predictor import CartolaPredictor
+from .synthetic import gerar_features, gerar_previsoes, preparar_banco
+
+# Tamanho das linhas de treino sem banco: 800 jogadores x 38 rodadas x 85%
+LINHAS_TEMPORADA = 25_840
+
+LOTES_PREDICT = (1, 30, 800, 10_000)
+CLUBES_OPTIMIZE = (5, 10, 20)
+LOTES_SAVE = (800, 10_000)
+
+# Razão da mediana (nova / base) acima da qual um caso é uma regressão
+LIMITE_REGRESSAO = 1.10
+
+
+def _cronometrar(fn: Callable[[], Any], repeticoes: int, linhas: Optional[int] = None) -> Dict[str, Any]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - inicio)
+    
+    medida = {
+        'min_s': min(tempos),
+        'mediana_s': float(np.median(tempos)),
+        'max_s': max(tempos),
+        'repeticoes': repeticoes,
+    }
+    if linhas:
+        medida['linhas'] = linhas
+        medida['linhas_por_s'] = linhas / medida['mediana_s']
+    return medida
+
+
+def _caso_training_data(contexto: Dict[str, Any], repeticoes: int) -> Dict[str, Any]:
+    database = contexto['database']
+    return {
+        'training_data/temporada': _cronometrar(
+            database.get_training_data, repeticoes, len(contexto['treino'])
+        ),
+    }
+
+
+def _caso_treino(contexto: Dict[str, Any], repeticoes: int) -> Dict[str, Any]:
+    treino = contexto['treino']
+    return {
+        'treino/temporada': _cronometrar(
+            lambda: CartolaPredictor().train(treino), max(1, repeticoes // 2), len(treino)
+        ),
+    }
+
+
+def _caso_predict(contexto: Dict[str, Any], repeticoes: int) -> Dict[str, Any]:
+    predictor = contexto['predictor']
+    resultado = {}
+    for n in LOTES_PREDICT:
+        data = gerar_features(n, seed=n)
+        predictor.predict_columnar(data)
+        resultado[f'predict/lote={n}'] = _cronometrar(
+            lambda: predictor.predict_columnar(data), repeticoes, n
+        )
+    return resultado
+
+
+def _caso_optimize(contexto: Dict[str, Any], repeticoes: int) -> Dict[str, Any]:
+    resultado = {}
+    for n_clubes in CLUBES_OPTIMIZE:
+        previsoes = gerar_previsoes(n_clubes=n_clubes)
+        # Pool já compilado: mede a resolução, como num worker aquecido
+        optimizer = TeamOptimizer()
+        for esquema in TeamOptimizer.FORMACOES:
+            params = dict(
+                previsoes=previsoes, orcamento=100.0, esquema=esquema, n_alternativas=0
+            )
+            optimizer.optimize(**params)
+            resultado[f'optimize/jogadores={len(previsoes)}/{esquema}'] = _cronometrar(
+                lambda: optimizer.optimize(**params), repeticoes
+            )
+    return resultado
+
+
+def _caso_save_predictions(contexto: Dict[str, Any], repeticoes: int) -> Dict[str, Any]:
+    database = contexto['database']
+    resultado = {}
+    for n in LOTES_SAVE:
+        rng = np.random.default_rng(n)
+        predictions = [
+            {
+                'jogador_id': f'jogador-{i:06d}',
+                'pontos_esperados': float(p),
+                'desvio_padrao': 2.0,
+                'intervalo_inferior': float(max(0.0, p - 3.92)),
+                'intervalo_superior': float(p + 3.92),
+            }
+            for i, p in enumerate(rng.normal(3, 2, n).clip(0))
+        ]
+        with database.get_connection() as conn:
+            conn.execute(text('TRUNCATE previsoes'))
+            conn.commit()
+        # Primeira gravação insere; as medidas são do upsert de linhas existentes
+        database.save_predictions('rodada-suite', predictions)
+        resultado[f'save_predictions/linhas={n}'] = _cronometrar(
+            lambda: database.save_predictions('rodada-suite', predictions), repeticoes, n
+        )
+    return resultado
+
+
+# Casos na ordem de execução: (função, precisa do banco)
+CASOS = {
+    'training_data': (_caso_training_data, True),
+    'treino': (_caso_treino, False),
+    'predict': (_caso_predict, False),
+    'optimize': (_caso_optimize, False),
+    'save_predictions': (_caso_save_predictions, True),
+}
+
+
+def _meta() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    import xgboost
+    
+    return {
+        'commit': commit,
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'numpy': np.__version__,
+        'xgboost': xgboost.__version__,
+    }
+
+
+def run(casos: Optional[List[str]] = None, repeticoes: int = 5) -> Dict[str, Any]:
+    """
+    Executa os casos pedidos (todos se None)
+    
+    Returns:
+        {'meta': ambiente e commit, 'casos': nome -> medida,
+         'ignorados': casos que precisavam do banco}
+    """
+    casos = casos or list(CASOS)
+    desconhecidos = set(casos) - set(CASOS)
+    if desconhecidos:
+        raise ValueError(f"Casos desconhecidos: {sorted(desconhecidos)}. Opções: {list(CASOS)}")
+    
+    url = os.getenv('BENCH_DATABASE_URL')
+    contexto: Dict[str, Any] = {}
+    engine = None
+    if url:
+        engine = preparar_banco(url)
+        contexto['database'] = Database(url)
+        contexto['treino'] = contexto['database'].get_training_data()
+    else:
+        contexto['treino'] = gerar_features(LINHAS_TEMPORADA)
+    
+    if 'predict' in casos:
+        contexto['predictor'] = CartolaPredictor()
+        contexto['predictor'].train(contexto['treino'])
+    
+    resultado = {'meta': _meta(), 'casos': {}, 'ignorados': []}
+    try:
+        for nome in casos:
+            caso, precisa_banco = CASOS[nome]
+            if precisa_banco and 'database' not in contexto:
+                resultado['ignorados'].append(nome)
+                continue
+            resultado['casos'].update(caso(contexto, repeticoes))
+    finally:
+        if 'database' in contexto:
+            contexto['database'].close()
+        if engine is not None:
+            engine.dispose()
+    
+    return resultado
+
+
+def comparar(
+    base: Dict[str, Any],
+    nova: Dict[str, Any],
+    limite: float = LIMITE_REGRESSAO
+) -> List[Dict[str, Any]]:
+    """
+    Razão das medianas (nova / base) dos casos presentes nas duas execuções
+    
+    Returns:
+        Um item por caso, com 'regressao' quando a razão passa de `limite`
+    """
+    linhas = []
+    for nome in base['casos']:
+        if nome not in nova['casos']:
+            continue
+        antes = base['casos'][nome]['mediana_s']
+        depois = nova['casos'][nome]['mediana_s']
+        razao = depois / antes
+        linhas.append({
+            'caso': nome,
+            'base_s': antes,
+            'nova_s': depois,
+            'razao': razao,
+            'regressao': razao > limite,
+        })
+    return linhas
+
+
+def _ler(caminho: str) -> Dict[str, Any]:
+    with open(caminho) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS))
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--saida', help='Arquivo JSON com os resultados')
+    parser.add_argument('--comparar', nargs='+', metavar='JSON',
+                        help='Base (e, opcionalmente, nova execução já salva)')
+    parser.add_argument('--limite', type=float, default=LIMITE_REGRESSAO)
+    args = parser.parse_args()
+    
+    if args.comparar and len(args.comparar) > 1:
+        nova = _ler(args.comparar[1])
+    else:
+        nova = run(args.casos, args.repeticoes)
+        if args.saida:
+            with open(args.saida, 'w') as f:
+                json.dump(nova, f, indent=2)
+    
+    if args.comparar:
+        base = _ler(args.comparar[0])
+        linhas = comparar(base, nova, args.limite)
+        print(f"base {base['meta']['commit']} -> nova {nova['meta']['commit']}")
+        for linha in linhas:
+            marca = '  REGRESSÃO' if linha['regressao'] else ''
+            print(f"{linha['caso']:<42} {linha['base_s'] * 1000:9.2f}ms -> "
+                  f"{linha['nova_s'] * 1000:9.2f}ms  x{linha['razao']:.2f}{marca}")
+        sys.exit(1 if any(linha['regressao'] for linha in linhas) else 0)
+    
+    for nome, medida in nova['casos'].items():
+        vazao = f"  {medida['linhas_por_s']:.0f} linhas/s" if 'linhas_por_s' in medida else ''
+        print(f"{nome:<42} mediana {medida['mediana_s'] * 1000:9.2f}ms  "
+              f"min {medida['min_s'] * 1000:9.2f}ms{vazao}")
+    if nova['ignorados']:
+        print(f"sem BENCH_DATABASE_URL, ignorados: {', '.join(nova['ignorados'])}")
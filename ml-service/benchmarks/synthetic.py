@@ -0,0 +1,394 @@
+"""
+Gerador de dados sintéticos do Cartola FC para os benchmarks
+
+Cria as tabelas usadas pelo ML Service (com os mesmos nomes de colunas que
+`src/database.py` consulta) em um banco descartável e popula com clubes,
+jogadores, rodadas, jogos, pontuações e scouts via COPY.
+"""
+
+import io
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+# Elenco de cada clube por posição (40 por clube -> 800 jogadores em 20 clubes)
+ELENCO = {
+    'GOLEIRO': 3,
+    'ZAGUEIRO': 8,
+    'LATERAL': 6,
+    'MEIA': 12,
+    'ATACANTE': 9,
+    'TECNICO': 2,
+}
+
+# Pontuação média de referência por posição
+MEDIA_POSICAO = {
+    'GOLEIRO': 3.5,
+    'ZAGUEIRO': 2.5,
+    'LATERAL': 2.8,
+    'MEIA': 3.0,
+    'ATACANTE': 3.4,
+    'TECNICO': 3.2,
+}
+
+SCHEMA = [
+    'DROP TABLE IF EXISTS previsoes, scouts, pontuacoes, jogos, jogadores, rodadas, clubes, '
+    'jogador_rodada_features CASCADE',
+    """
+    CREATE TABLE clubes (
+        id TEXT PRIMARY KEY,
+        nome TEXT NOT NULL,
+        abreviacao TEXT NOT NULL,
+        elo_ofensivo DOUBLE PRECISION NOT NULL DEFAULT 1500,
+        elo_defensivo DOUBLE PRECISION NOT NULL DEFAULT 1500,
+        elo_geral DOUBLE PRECISION NOT NULL DEFAULT 1500
+    )
+    """,
+    """
+    CREATE TABLE jogadores (
+        id TEXT PRIMARY KEY,
+        nome TEXT NOT NULL,
+        apelido TEXT NOT NULL,
+        posicao TEXT NOT NULL,
+        clube_id TEXT NOT NULL REFERENCES clubes (id),
+        preco DOUBLE PRECISION NOT NULL,
+        preco_variacao DOUBLE PRECISION NOT NULL DEFAULT 0,
+        media_pontos DOUBLE PRECISION NOT NULL DEFAULT 0,
+        jogos INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'PROVAVEL'
+    )
+    """,
+    """
+    CREATE TABLE rodadas (
+        id TEXT PRIMARY KEY,
+        numero INTEGER NOT NULL UNIQUE,
+        status TEXT NOT NULL DEFAULT 'ENCERRADA'
+    )
+    """,
+    """
+    CREATE TABLE jogos (
+        id TEXT PRIMARY KEY,
+        rodada_id TEXT NOT NULL REFERENCES rodadas (id),
+        clube_mandante_id TEXT NOT NULL REFERENCES clubes (id),
+        clube_visitante_id TEXT NOT NULL REFERENCES clubes (id),
+        gols_mandante INTEGER,
+        gols_visitante INTEGER
+    )
+    """,
+    """
+    CREATE TABLE pontuacoes (
+        id TEXT PRIMARY KEY,
+        jogador_id TEXT NOT NULL REFERENCES jogadores (id),
+        rodada_id TEXT NOT NULL REFERENCES rodadas (id),
+        pontos DOUBLE PRECISION NOT NULL,
+        preco DOUBLE PRECISION NOT NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        UNIQUE (jogador_id, rodada_id)
+    )
+    """,
+    """
+    CREATE TABLE scouts (
+        id TEXT PRIMARY KEY,
+        jogador_id TEXT NOT NULL REFERENCES jogadores (id),
+        rodada_id TEXT NOT NULL REFERENCES rodadas (id),
+        clube_id TEXT NOT NULL REFERENCES clubes (id),
+        gols INTEGER NOT NULL DEFAULT 0,
+        assistencias INTEGER NOT NULL DEFAULT 0,
+        finalizacoes INTEGER NOT NULL DEFAULT 0,
+        desarmes INTEGER NOT NULL DEFAULT 0,
+        defesas INTEGER NOT NULL DEFAULT 0,
+        gols_sofridos INTEGER NOT NULL DEFAULT 0,
+        cartoes_amarelos INTEGER NOT NULL DEFAULT 0,
+        pontos DOUBLE PRECISION NOT NULL DEFAULT 0,
+        UNIQUE (jogador_id, rodada_id)
+    )
+    """,
+    """
+    CREATE TABLE previsoes (
+        id TEXT PRIMARY KEY,
+        jogador_id TEXT NOT NULL,
+        rodada_id TEXT NOT NULL,
+        pontos_esperados DOUBLE PRECISION NOT NULL,
+        desvio_padrao DOUBLE PRECISION NOT NULL,
+        intervalo_inferior DOUBLE PRECISION,
+        intervalo_superior DOUBLE PRECISION,
+        media_3_rodadas DOUBLE PRECISION,
+        media_5_rodadas DOUBLE PRECISION,
+        eh_mandante BOOLEAN,
+        forca_adversario DOUBLE PRECISION,
+        prob_sofrer_gol DOUBLE PRECISION,
+        prob_fazer_gol DOUBLE PRECISION,
+        modelo_versao TEXT NOT NULL DEFAULT '1.0.0',
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        UNIQUE (jogador_id, rodada_id)
+    )
+    """,
+]
+
+
+def bench_database_url() -> str:
+    """
+    URL do banco de benchmark
+    
+    Usa uma variável própria para nunca apontar os benchmarks (que apagam e
+    recriam tabelas) para o banco da aplicação por engano.
+    """
+    url = os.getenv('BENCH_DATABASE_URL')
+    if not url:
+        raise RuntimeError(
+            "Defina BENCH_DATABASE_URL com um banco PostgreSQL descartável"
+        )
+    return url
+
+
+def gerar_dados(
+    n_clubes: int = 20,
+    n_rodadas: int = 38,
+    prob_jogar: float = 0.85,
+    seed: int = 42
+) -> Dict[str, pd.DataFrame]:
+    """
+    Gera uma temporada sintética
+    
+    Returns:
+        Dicionário tabela -> DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    
+    clubes = pd.DataFrame({
+        'id': [f'clube-{i:02d}' for i in range(n_clubes)],
+        'nome': [f'Clube {i}' for i in range(n_clubes)],
+        'abreviacao': [f'C{i:02d}' for i in range(n_clubes)],
+        'elo_ofensivo': rng.normal(1500, 80, n_clubes).round(1),
+        'elo_defensivo': rng.normal(1500, 80, n_clubes).round(1),
+    })
+    clubes['elo_geral'] = ((clubes['elo_ofensivo'] + clubes['elo_defensivo']) / 2).round(1)
+    
+    posicoes = [p for p, n in ELENCO.items() for _ in range(n)] * n_clubes
+    clube_ids = np.repeat(clubes['id'].values, sum(ELENCO.values()))
+    n_jogadores = len(posicoes)
+    
+    habilidade = np.array([MEDIA_POSICAO[p] for p in posicoes]) + rng.normal(0, 1.5, n_jogadores)
+    jogadores = pd.DataFrame({
+        'id': [f'jogador-{i:05d}' for i in range(n_jogadores)],
+        'nome': [f'Jogador {i}' for i in range(n_jogadores)],
+        'apelido': [f'J{i}' for i in range(n_jogadores)],
+        'posicao': posicoes,
+        'clube_id': clube_ids,
+        'preco': np.clip(habilidade * 2.5 + rng.normal(0, 1.5, n_jogadores), 1.0, 30.0).round(2),
+        'preco_variacao': rng.normal(0, 0.5, n_jogadores).round(2),
+        'status': 'PROVAVEL',
+    })
+    
+    rodadas = pd.DataFrame({
+        'id': [f'rodada-{n:02d}' for n in range(1, n_rodadas + 1)],
+        'numero': np.arange(1, n_rodadas + 1),
+        'status': 'ENCERRADA',
+    })
+    
+    jogou = rng.random((n_rodadas, n_jogadores)) < prob_jogar
+    pontos = habilidade[None, :] + rng.normal(0, 3.5, (n_rodadas, n_jogadores))
+    r_idx, j_idx = np.nonzero(jogou)
+    pontuacoes = pd.DataFrame({
+        'id': [f'pt-{r}-{j}' for r, j in zip(r_idx, j_idx)],
+        'jogador_id': jogadores['id'].values[j_idx],
+        'rodada_id': rodadas['id'].values[r_idx],
+        'pontos': pontos[r_idx, j_idx].round(1),
+        'preco': jogadores['preco'].values[j_idx],
+    })
+    
+    # Gerador próprio: os scouts não mudam os dados das outras tabelas
+    rng_scouts = np.random.default_rng(seed + 1)
+    n_jogos = len(pontuacoes)
+    posicao_jogo = np.asarray(posicoes)[j_idx]
+    acima = np.clip(pontos[r_idx, j_idx], 0, None) / 10
+    ofensivo = np.isin(posicao_jogo, ['MEIA', 'ATACANTE']).astype(float)
+    defensivo = np.isin(posicao_jogo, ['ZAGUEIRO', 'LATERAL']).astype(float)
+    goleiro = (posicao_jogo == 'GOLEIRO').astype(float)
+    scouts = pd.DataFrame({
+        'id': [f'sc-{r}-{j}' for r, j in zip(r_idx, j_idx)],
+        'jogador_id': pontuacoes['jogador_id'].values,
+        'rodada_id': pontuacoes['rodada_id'].values,
+        'clube_id': clube_ids[j_idx],
+        'gols': rng_scouts.poisson(acima * (0.05 + 0.4 * ofensivo)),
+        'assistencias': rng_scouts.poisson(acima * (0.05 + 0.3 * ofensivo)),
+        'finalizacoes': rng_scouts.poisson(0.3 + 1.5 * ofensivo, n_jogos),
+        'desarmes': rng_scouts.poisson(0.5 + 1.5 * defensivo, n_jogos),
+        'defesas': rng_scouts.poisson(3.0 * goleiro),
+        'gols_sofridos': rng_scouts.poisson((1.2 - acima).clip(0.1) * (goleiro + defensivo)),
+        'cartoes_amarelos': rng_scouts.poisson(0.15, n_jogos),
+        'pontos': pontuacoes['pontos'].values,
+    })
+    
+    # Jogos: pareamento aleatório dos clubes em cada rodada (com número
+    # ímpar de clubes, um fica de fora), gols conforme os elos
+    rng_jogos = np.random.default_rng(seed + 2)
+    n_pares = n_clubes // 2
+    pares = np.argsort(rng_jogos.random((n_rodadas, n_clubes)), axis=1)[:, :2 * n_pares]
+    mandante, visitante = pares[:, 0::2].ravel(), pares[:, 1::2].ravel()
+    ataque = clubes['elo_ofensivo'].to_numpy()
+    defesa = clubes['elo_defensivo'].to_numpy()
+    jogos = pd.DataFrame({
+        'id': [f'jogo-{r}-{k}' for r in range(n_rodadas) for k in range(n_pares)],
+        'rodada_id': np.repeat(rodadas['id'].values, n_pares),
+        'clube_mandante_id': clubes['id'].values[mandante],
+        'clube_visitante_id': clubes['id'].values[visitante],
+        'gols_mandante': rng_jogos.poisson(
+            np.clip(1.5 + (ataque[mandante] - defesa[visitante]) / 200, 0.2, None)
+        ),
+        'gols_visitante': rng_jogos.poisson(
+            np.clip(1.1 + (ataque[visitante] - defesa[mandante]) / 200, 0.2, None)
+        ),
+    })
+    
+    medias = pontuacoes.groupby('jogador_id')['pontos'].agg(['mean', 'count'])
+    jogadores['media_pontos'] = jogadores['id'].map(medias['mean']).fillna(0).round(2)
+    jogadores['jogos'] = jogadores['id'].map(medias['count']).fillna(0).astype(int)
+    
+    return {
+        'clubes': clubes,
+        'jogadores': jogadores,
+        'rodadas': rodadas,
+        'jogos': jogos,
+        'pontuacoes': pontuacoes,
+        'scouts': scouts,
+    }
+
+
+def gerar_features(
+    n: int,
+    n_rodadas: int = 38,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Gera um DataFrame no formato de get_training_data / get_jogadores_features,
+    sem passar pelo banco (para benchmarks do modelo)
+    
+    Args:
+        n: Número de linhas
+        n_rodadas: Rodadas distribuídas entre as linhas (em ordem)
+    """
+    rng = np.random.default_rng(seed)
+    posicoes = np.array(list(ELENCO.keys()))[rng.integers(0, len(ELENCO), n)]
+    habilidade = np.array([MEDIA_POSICAO[p] for p in posicoes]) + rng.normal(0, 1.5, n)
+    media_3 = habilidade + rng.normal(0, 1.5, n)
+    media_5 = habilidade + rng.normal(0, 1.0, n)
+    
+    return pd.DataFrame({
+        'jogador_id': [f'jogador-{i:06d}' for i in range(n)],
+        'nome': [f'Jogador {i}' for i in range(n)],
+        'apelido': [f'J{i}' for i in range(n)],
+        'posicao': posicoes,
+        'status': 'PROVAVEL',
+        'clube_id': [f'clube-{i:02d}' for i in rng.integers(0, 20, n)],
+        'preco': np.clip(habilidade * 2.5 + rng.normal(0, 1.5, n), 1.0, 30.0),
+        'variacao_preco': rng.normal(0, 0.5, n),
+        'media_geral': habilidade + rng.normal(0, 0.5, n),
+        'jogos': rng.integers(0, 38, n),
+        'elo_ofensivo': rng.normal(1500, 80, n),
+        'elo_defensivo': rng.normal(1500, 80, n),
+        'rodada_numero': np.sort(rng.integers(1, n_rodadas + 1, n)),
+        'pontos': habilidade + rng.normal(0, 3.5, n),
+        'media_3_rodadas': media_3,
+        'media_5_rodadas': media_5,
+        'desvio_padrao': rng.uniform(1.0, 5.0, n),
+        'eh_mandante': rng.integers(0, 2, n),
+        'forca_adversario': rng.normal(1500, 80, n),
+        'prob_sofrer_gol': rng.uniform(0.2, 0.8, n),
+        'prob_fazer_gol': rng.uniform(0.2, 0.8, n),
+        'gols_ultimas_3': rng.poisson(0.3, n),
+        'assistencias_ultimas_3': rng.poisson(0.2, n),
+        'scout_ofensivo': rng.poisson(2.0, n),
+        'scout_defensivo': rng.poisson(2.0, n),
+    })
+
+
+def gerar_previsoes(
+    n_clubes: int = 20,
+    status_provavel: float = 1.0,
+    seed: int = 42
+) -> List[Dict[str, Any]]:
+    """
+    Gera o pool de previsões no formato recebido pelo /optimize
+    
+    Args:
+        n_clubes: Clubes do pool (40 jogadores cada)
+        status_provavel: Fração dos jogadores com status PROVAVEL
+    """
+    rng = np.random.default_rng(seed)
+    jogadores = gerar_dados(n_clubes=n_clubes, n_rodadas=1, seed=seed)['jogadores']
+    n = len(jogadores)
+    
+    pontos = np.array([MEDIA_POSICAO[p] for p in jogadores['posicao']]) + rng.normal(0, 1.5, n)
+    desvio = rng.uniform(1.0, 5.0, n)
+    provavel = rng.random(n) < status_provavel
+    
+    return [
+        {
+            'jogador': {
+                'id': j.id,
+                'nome': j.nome,
+                'apelido': j.apelido,
+                'posicao': j.posicao,
+                'clubeId': j.clube_id,
+                'preco': float(j.preco),
+                'status': 'PROVAVEL' if provavel[i] else 'DUVIDA',
+            },
+            'pontosEsperados': float(max(pontos[i], 0)),
+            'desvioPadrao': float(desvio[i]),
+        }
+        for i, j in enumerate(jogadores.itertuples())
+    ]
+
+
+def copiar(engine: Engine, tabela: str, df: pd.DataFrame) -> None:
+    """Carrega um DataFrame em uma tabela usando COPY"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {tabela} ({', '.join(df.columns)}) FROM STDIN WITH CSV",
+                buffer
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def preparar_banco(
+    url: Optional[str] = None,
+    dados: Optional[Dict[str, pd.DataFrame]] = None,
+    **kwargs
+) -> Engine:
+    """
+    Recria o schema e carrega uma temporada sintética no banco de benchmark
+    
+    Args:
+        url: URL do banco (padrão: BENCH_DATABASE_URL)
+        dados: Dados já gerados; se None, usa gerar_dados(**kwargs)
+    """
+    engine = create_engine(url or bench_database_url())
+    dados = dados if dados is not None else gerar_dados(**kwargs)
+    
+    with engine.connect() as conn:
+        for ddl in SCHEMA:
+            conn.execute(text(ddl))
+        conn.commit()
+    
+    for tabela in ('clubes', 'jogadores', 'rodadas', 'jogos', 'pontuacoes', 'scouts'):
+        copiar(engine, tabela, dados[tabela])
+    
+    with engine.connect() as conn:
+        conn.execute(text('ANALYZE'))
+        conn.commit()
+    
+    return engine
@@ -0,0 +1,325 @@
+"""
+Predição em lote de uma ou várias rodadas em pipeline
+
+Três etapas em paralelo, ligadas por filas limitadas: uma thread lê as
+features em blocos (cursor no servidor), a thread chamadora roda o modelo e
+outra thread grava as previsões. Enquanto um bloco é gravado o seguinte já
+está sendo lido e previsto, e a memória fica limitada a poucos blocos
+qualquer que seja o número de jogadores.
+
+Várias rodadas (backfill depois de um retreino) saem de uma única consulta:
+os blocos atravessam as fronteiras entre rodadas, então cada chamada do
+modelo e cada upsert cobrem até `chunk_size` linhas de qualquer rodada.
+Esses backfills rodam como jobs em segundo plano, com o progresso em linhas.
+"""
+
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, List
+
+import numpy as np
+
+from . import instrumentation
+from .database import Database
+from .models.predictor import CartolaPredictor, colunas_para_registros
+
+logger = logging.getLogger(__name__)
+
+# Blocos aguardando em cada fila (leitura -> modelo -> gravação)
+BLOCOS_EM_FILA = 2
+
+# Jobs finalizados mantidos para consulta de status
+MAX_JOBS_HISTORICO = 20
+
+STATUS_FINAIS = ('COMPLETADO', 'ERRO')
+
+_FIM = object()
+
+
+class _Interrompido(Exception):
+    """Outra etapa do pipeline falhou"""
+
+
+def _colocar(fila: queue.Queue, item: Any, parar: threading.Event) -> None:
+    while True:
+        if parar.is_set():
+            raise _Interrompido()
+        try:
+            fila.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _retirar(fila: queue.Queue, parar: threading.Event) -> Any:
+    while True:
+        if parar.is_set():
+            raise _Interrompido()
+        try:
+            return fila.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+
+def prever_rodada(
+    database: Database,
+    predictor: CartolaPredictor,
+    rodada_id: str,
+    chunk_size: Optional[int] = None,
+    ao_salvar: Optional[Callable[[Dict[str, np.ndarray]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Prevê e grava as previsões de todos os jogadores prováveis da rodada
+    
+    Cada bloco é gravado na sua própria transação.
+    
+    Args:
+        database: Banco de leitura das features e gravação das previsões
+        predictor: Modelo usado em todos os blocos
+        rodada_id: Rodada prevista
+        chunk_size: Jogadores por bloco (padrão: PREDICTIONS_CHUNK_SIZE)
+        ao_salvar: Chamado com as colunas de cada bloco já gravado
+    
+    Returns:
+        Total de previsões, blocos e tempo gasto em cada etapa
+    """
+    return prever_rodadas(database, predictor, [rodada_id], chunk_size, ao_salvar)
+
+
+def prever_rodadas(
+    database: Database,
+    predictor: CartolaPredictor,
+    rodada_ids: List[str],
+    chunk_size: Optional[int] = None,
+    ao_salvar: Optional[Callable[[Dict[str, np.ndarray]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Prevê e grava as previsões de várias rodadas numa única passada
+    
+    Mesmo pipeline de `prever_rodada`; as colunas passadas a `ao_salvar`
+    trazem também 'rodada_id', linha a linha.
+    """
+    lidos: queue.Queue = queue.Queue(maxsize=BLOCOS_EM_FILA)
+    previstos: queue.Queue = queue.Queue(maxsize=BLOCOS_EM_FILA)
+    parar = threading.Event()
+    erros = []
+    tempos = {'leitura_s': 0.0, 'inferencia_s': 0.0, 'gravacao_s': 0.0}
+    
+    def ler():
+        blocos = database.iter_features_rodadas(rodada_ids, chunk_size)
+        try:
+            inicio = time.perf_counter()
+            for features in blocos:
+                leitura = time.perf_counter() - inicio
+                tempos['leitura_s'] += leitura
+                instrumentation.observar_etapa('batch.leitura', leitura)
+                instrumentation.observar_linhas('batch.leitura', len(features))
+                _colocar(lidos, features, parar)
+                inicio = time.perf_counter()
+            _colocar(lidos, _FIM, parar)
+        except _Interrompido:
+            pass
+        except Exception as e:
+            erros.append(e)
+            parar.set()
+        finally:
+            # Devolve a conexão do cursor mesmo se o pipeline parar no meio
+            blocos.close()
+    
+    def gravar():
+        try:
+            while True:
+                item = _retirar(previstos, parar)
+                if item is _FIM:
+                    return
+                columns, predictions = item
+                inicio = time.perf_counter()
+                database.save_predictions(None, predictions, modelo_versao=predictor.versao)
+                tempos['gravacao_s'] += time.perf_counter() - inicio
+                if ao_salvar:
+                    ao_salvar(columns)
+        except _Interrompido:
+            pass
+        except Exception as e:
+            erros.append(e)
+            parar.set()
+    
+    leitor = threading.Thread(target=ler, name='batch-leitura', daemon=True)
+    gravador = threading.Thread(target=gravar, name='batch-gravacao', daemon=True)
+    leitor.start()
+    gravador.start()
+    
+    inicio_total = time.perf_counter()
+    total = 0
+    blocos = 0
+    try:
+        while True:
+            features = _retirar(lidos, parar)
+            if features is _FIM:
+                break
+            
+            inicio = time.perf_counter()
+            columns = predictor.predict_columnar(features)
+            columns['rodada_id'] = features['rodada_id'].astype(str).to_numpy()
+            predictions = colunas_para_registros(columns)
+            tempos['inferencia_s'] += time.perf_counter() - inicio
+            
+            _colocar(previstos, (columns, predictions), parar)
+            total += len(predictions)
+            blocos += 1
+        
+        _colocar(previstos, _FIM, parar)
+    except _Interrompido:
+        pass
+    except Exception as e:
+        erros.append(e)
+        parar.set()
+    finally:
+        leitor.join()
+        gravador.join()
+    
+    if erros:
+        raise erros[0]
+    
+    logger.info(f"Rodadas {', '.join(rodada_ids)}: {total} previsões em {blocos} blocos")
+    
+    return {
+        'total_predictions': total,
+        'blocos': blocos,
+        'total_s': time.perf_counter() - inicio_total,
+        **tempos,
+    }
+
+
+@dataclass
+class BatchPredictionJob:
+    id: str
+    rodada_ids: List[str]
+    status: str = 'PENDENTE'  # PENDENTE, PROCESSANDO, COMPLETADO, ERRO
+    linhas_processadas: int = 0
+    total_linhas: Optional[int] = None
+    rodadas_concluidas: List[str] = field(default_factory=list)
+    iniciado_em: float = field(default_factory=time.time)
+    finalizado_em: Optional[float] = None
+    resultado: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    
+    @property
+    def finalizado(self) -> bool:
+        return self.status in STATUS_FINAIS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        decorrido = (self.finalizado_em or time.time()) - self.iniciado_em
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'rodada_ids': self.rodada_ids,
+            'rodadas_concluidas': self.rodadas_concluidas,
+            'linhas_processadas': self.linhas_processadas,
+            'total_linhas': self.total_linhas,
+            'progresso': (
+                self.linhas_processadas / self.total_linhas if self.total_linhas else None
+            ),
+            'linhas_por_s': round(self.linhas_processadas / decorrido, 1) if decorrido > 0 else None,
+            'tempo_decorrido_s': round(decorrido, 2),
+            'resultado': self.resultado,
+            'error': self.error,
+        }
+
+
+class BatchPredictionJobManager:
+    """
+    Dispara e acompanha predições de várias rodadas em segundo plano (uma por vez)
+    
+    Args:
+        database: Banco de leitura das features e gravação das previsões
+    """
+    
+    def __init__(self, database: Database):
+        self.database = database
+        self.jobs: 'OrderedDict[str, BatchPredictionJob]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def em_andamento(self) -> Optional[BatchPredictionJob]:
+        """Job ainda não finalizado, se houver"""
+        return next((j for j in self.jobs.values() if not j.finalizado), None)
+    
+    def get(self, job_id: str) -> Optional[BatchPredictionJob]:
+        return self.jobs.get(job_id)
+    
+    def submit(
+        self,
+        predictor: CartolaPredictor,
+        rodada_ids: List[str],
+        ao_concluir: Optional[Callable[[BatchPredictionJob], None]] = None
+    ) -> BatchPredictionJob:
+        """
+        Inicia a predição das rodadas e retorna o job imediatamente
+        
+        Args:
+            predictor: Modelo usado em todas as rodadas
+            rodada_ids: Rodadas previstas
+            ao_concluir: Chamado na thread do job quando ele termina com sucesso
+        """
+        with self._lock:
+            if self.em_andamento():
+                raise RuntimeError("Já existe uma predição em lote em andamento")
+            
+            job = BatchPredictionJob(
+                id=uuid.uuid4().hex[:12], rodada_ids=list(dict.fromkeys(rodada_ids))
+            )
+            self.jobs[job.id] = job
+            while len(self.jobs) > MAX_JOBS_HISTORICO:
+                self.jobs.popitem(last=False)
+        
+        threading.Thread(
+            target=self._executar,
+            args=(job, predictor, ao_concluir),
+            name=f'batch-{job.id}',
+            daemon=True,
+        ).start()
+        
+        logger.info(f"Predição em lote {job.id} iniciada: {len(job.rodada_ids)} rodadas")
+        
+        return job
+    
+    def _executar(
+        self,
+        job: BatchPredictionJob,
+        predictor: CartolaPredictor,
+        ao_concluir: Optional[Callable[[BatchPredictionJob], None]]
+    ) -> None:
+        job.status = 'PROCESSANDO'
+        
+        def ao_salvar(columns: Dict[str, np.ndarray]) -> None:
+            job.linhas_processadas += len(columns['jogador_id'])
+            # Os blocos chegam em ordem de rodada: as rodadas antes da
+            # última do bloco já foram gravadas por inteiro
+            ultima = columns['rodada_id'][-1]
+            for rodada_id in dict.fromkeys(columns['rodada_id'].tolist()):
+                if rodada_id != ultima and rodada_id not in job.rodadas_concluidas:
+                    job.rodadas_concluidas.append(rodada_id)
+        
+        try:
+            job.total_linhas = self.database.count_jogadores_provaveis() * len(job.rodada_ids)
+            job.resultado = prever_rodadas(
+                self.database, predictor, job.rodada_ids, ao_salvar=ao_salvar
+            )
+            job.rodadas_concluidas = list(job.rodada_ids)
+            if ao_concluir:
+                ao_concluir(job)
+            job.status = 'COMPLETADO'
+        
+        except Exception as e:
+            logger.error(f"Erro na predição em lote {job.id}: {e}")
+            job.error = str(e)
+            job.status = 'ERRO'
+        
+        finally:
+            job.finalizado_em = time.time()
+            logger.info(f"Predição em lote {job.id} finalizada: {job.status}")
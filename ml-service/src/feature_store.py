@@ -0,0 +1,162 @@
+"""
+Feature store de jogadores por rodada
+
+Materializa em `jogador_rodada_features` as features históricas usadas no
+treinamento, calculadas com window functions em uma única passada sobre
+`pontuacoes` e atualizadas de forma incremental a cada rodada encerrada.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Chave do advisory lock que serializa os refreshes concorrentes
+_REFRESH_LOCK_KEY = 727001
+
+# Quantidade de rodadas anteriores que as janelas consultam
+_JANELA_MAXIMA = 5
+
+
+class FeatureStore:
+    """
+    Tabela materializada de features por (jogador, rodada)
+    
+    As médias e o desvio usam janelas sobre a ordem das rodadas (e não sobre
+    os jogos do jogador), reproduzindo exatamente a semântica das antigas
+    subqueries correlacionadas: "pontuações do jogador nas N rodadas
+    anteriores". Valores sem histórico ficam NULL e recebem o fallback na
+    leitura, pois dependem de `jogadores.media_pontos`, que muda no tempo.
+    """
+    
+    TABLE = 'jogador_rodada_features'
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._schema_ok = False
+    
+    def ensure_schema(self) -> None:
+        """Cria a tabela de features caso não exista"""
+        if self._schema_ok:
+            return
+        
+        with self.engine.connect() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    jogador_id TEXT NOT NULL,
+                    rodada_id TEXT NOT NULL,
+                    rodada_numero INTEGER NOT NULL,
+                    pontos DOUBLE PRECISION,
+                    media_3_rodadas DOUBLE PRECISION,
+                    media_5_rodadas DOUBLE PRECISION,
+                    desvio_padrao DOUBLE PRECISION,
+                    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (jogador_id, rodada_id)
+                )
+            """))
+            conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS {self.TABLE}_rodada_numero_idx
+                ON {self.TABLE} (rodada_numero)
+            """))
+            conn.commit()
+        
+        self._schema_ok = True
+    
+    def _primeira_rodada_pendente(self, conn) -> Optional[int]:
+        """
+        Retorna a ordem da primeira rodada com pontuações novas ou alteradas
+        desde o último refresh (None se a tabela está em dia)
+        """
+        query = text(f"""
+            SELECT MIN(r.ordem)
+            FROM pontuacoes pt
+            JOIN (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY numero) AS ordem
+                FROM rodadas
+            ) r ON pt.rodada_id = r.id
+            LEFT JOIN {self.TABLE} f
+                ON f.jogador_id = pt.jogador_id AND f.rodada_id = pt.rodada_id
+            WHERE pt.pontos IS NOT NULL
+            AND (f.jogador_id IS NULL OR pt.updated_at > f.updated_at)
+        """)
+        return conn.execute(query).scalar()
+    
+    def refresh(self, full: bool = False) -> int:
+        """
+        Atualiza a tabela de features
+        
+        Args:
+            full: Se True, recalcula todas as rodadas; caso contrário apenas
+                as rodadas com pontuações ainda não materializadas
+        
+        Returns:
+            Número de linhas inseridas ou atualizadas
+        """
+        self.ensure_schema()
+        
+        with self.engine.connect() as conn:
+            conn.execute(
+                text('SELECT pg_advisory_xact_lock(:key)'),
+                {'key': _REFRESH_LOCK_KEY}
+            )
+            
+            desde = 1 if full else self._primeira_rodada_pendente(conn)
+            if desde is None:
+                conn.commit()
+                return 0
+            
+            # As janelas precisam das rodadas anteriores como histórico,
+            # mas só as rodadas pendentes são (re)escritas
+            query = text(f"""
+                INSERT INTO {self.TABLE} (
+                    jogador_id, rodada_id, rodada_numero, pontos,
+                    media_3_rodadas, media_5_rodadas, desvio_padrao, updated_at
+                )
+                SELECT
+                    jogador_id, rodada_id, rodada_numero, pontos,
+                    media_3_rodadas, media_5_rodadas, desvio_padrao, NOW()
+                FROM (
+                    SELECT
+                        pt.jogador_id,
+                        pt.rodada_id,
+                        r.numero AS rodada_numero,
+                        r.ordem,
+                        pt.pontos,
+                        AVG(pt.pontos) OVER w3 AS media_3_rodadas,
+                        AVG(pt.pontos) OVER w5 AS media_5_rodadas,
+                        STDDEV(pt.pontos) OVER w5 AS desvio_padrao
+                    FROM pontuacoes pt
+                    JOIN (
+                        SELECT id, numero, ROW_NUMBER() OVER (ORDER BY numero) AS ordem
+                        FROM rodadas
+                    ) r ON pt.rodada_id = r.id
+                    WHERE r.ordem >= :desde - {_JANELA_MAXIMA}
+                    WINDOW
+                        w3 AS (PARTITION BY pt.jogador_id ORDER BY r.ordem
+                               RANGE BETWEEN 3 PRECEDING AND 1 PRECEDING),
+                        w5 AS (PARTITION BY pt.jogador_id ORDER BY r.ordem
+                               RANGE BETWEEN 5 PRECEDING AND 1 PRECEDING)
+                ) janelas
+                WHERE ordem >= :desde
+                AND pontos IS NOT NULL
+                ON CONFLICT (jogador_id, rodada_id) DO UPDATE SET
+                    rodada_numero = EXCLUDED.rodada_numero,
+                    pontos = EXCLUDED.pontos,
+                    media_3_rodadas = EXCLUDED.media_3_rodadas,
+                    media_5_rodadas = EXCLUDED.media_5_rodadas,
+                    desvio_padrao = EXCLUDED.desvio_padrao,
+                    updated_at = EXCLUDED.updated_at
+            """)
+            
+            result = conn.execute(query, {'desde': desde})
+            conn.commit()
+        
+        logger.info(
+            f"Feature store atualizada a partir da {desde}ª rodada: "
+            f"{result.rowcount} linhas"
+        )
+        
+        return result.rowcount
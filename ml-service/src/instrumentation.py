@@ -0,0 +1,245 @@
+"""
+Métricas de latência por etapa no formato do Prometheus
+
+Cada etapa dos caminhos críticos (cache, consultas ao banco,
+preprocessamento, inferência, compilação e resolução do ILP...) é medida com
+`etapa(nome)` e vai para um histograma rotulado pela etapa; as etapas que
+processam linhas registram também quantas. O estado dos pools (otimização e
+conexões) é lido só na coleta, e o GET /metrics/prometheus exporta tudo.
+
+Com METRICS_ENABLED=false (ou sem o prometheus_client instalado) as funções
+retornam de imediato e `etapa` devolve sempre o mesmo contexto vazio: o
+custo fica em uma verificação por chamada.
+
+Os processos do pool de otimização não são coletados diretamente: neles as
+observações ficam num buffer que volta junto com o resultado de cada pedido
+e é registrado no processo principal.
+"""
+
+import os
+import time
+import logging
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:
+    CollectorRegistry = None
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+PREFIXO = 'mitabot'
+
+# Limites dos histogramas: segundos de 0.5ms a 30s e linhas de 1 a 100 mil
+BUCKETS_SEGUNDOS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+BUCKETS_LINHAS = (1, 10, 30, 100, 300, 1000, 3000, 10_000, 30_000, 100_000)
+
+_NULO = nullcontext()
+
+_ativo = False
+_registry = None
+_segundos = None
+_linhas = None
+_solver = None
+_pools: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+# Observações guardadas em vez de registradas (processos do pool)
+_buffer: Optional[List[Tuple[str, Tuple[str, ...], float]]] = None
+
+
+class _ColetorPools:
+    """Lê o estado de cada pool monitorado no momento da coleta"""
+    
+    def collect(self):
+        em_uso = GaugeMetricFamily(
+            f'{PREFIXO}_pool_em_uso', 'Itens do pool em uso', labels=['pool']
+        )
+        capacidade = GaugeMetricFamily(
+            f'{PREFIXO}_pool_capacidade', 'Capacidade do pool', labels=['pool']
+        )
+        na_fila = GaugeMetricFamily(
+            f'{PREFIXO}_pool_na_fila', 'Pedidos aguardando um item livre', labels=['pool']
+        )
+        pedidos = CounterMetricFamily(
+            f'{PREFIXO}_pool_pedidos', 'Pedidos ao pool por resultado',
+            labels=['pool', 'resultado']
+        )
+        
+        for nome, ler in list(_pools.items()):
+            try:
+                estado = ler()
+            except Exception as e:
+                logger.warning(f"Falha ao ler o estado do pool {nome}: {e}")
+                continue
+            if 'em_uso' in estado:
+                em_uso.add_metric([nome], estado['em_uso'])
+            if 'capacidade' in estado:
+                capacidade.add_metric([nome], estado['capacidade'])
+            if 'na_fila' in estado:
+                na_fila.add_metric([nome], estado['na_fila'])
+            for resultado, total in estado.get('pedidos', {}).items():
+                pedidos.add_metric([nome, resultado], total)
+        
+        return [em_uso, capacidade, na_fila, pedidos]
+
+
+def configurar(ativo: Optional[bool] = None) -> bool:
+    """
+    Liga ou desliga a coleta (padrão: METRICS_ENABLED, ligada)
+    
+    Religar recria o registro, zerando as séries.
+    
+    Returns:
+        Se a coleta ficou ligada
+    """
+    global _ativo, _registry, _segundos, _linhas, _solver
+    
+    if ativo is None:
+        ativo = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    if ativo and CollectorRegistry is None:
+        logger.warning("prometheus_client não instalado; métricas desligadas")
+        ativo = False
+    
+    _ativo = ativo
+    if not ativo:
+        _registry = _segundos = _linhas = _solver = None
+        return False
+    
+    _registry = CollectorRegistry()
+    _segundos = Histogram(
+        f'{PREFIXO}_etapa_segundos', 'Duração de cada etapa',
+        ['etapa'], buckets=BUCKETS_SEGUNDOS, registry=_registry
+    )
+    _linhas = Histogram(
+        f'{PREFIXO}_etapa_linhas', 'Linhas processadas por execução da etapa',
+        ['etapa'], buckets=BUCKETS_LINHAS, registry=_registry
+    )
+    _solver = Counter(
+        f'{PREFIXO}_solver_status', 'Resoluções do ILP por status final',
+        ['backend', 'status'], registry=_registry
+    )
+    _registry.register(_ColetorPools())
+    
+    return True
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+class _Etapa:
+    __slots__ = ('nome', 'inicio')
+    
+    def __init__(self, nome: str):
+        self.nome = nome
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        observar_etapa(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+def etapa(nome: str):
+    """
+    Context manager que mede a duração de uma etapa
+    
+    Exemplo:
+        with instrumentation.etapa('predict.inferencia'):
+            predictions = model.predict(X)
+    """
+    if not _ativo:
+        return _NULO
+    return _Etapa(nome)
+
+
+def observar_etapa(nome: str, segundos: float) -> None:
+    """Registra a duração de uma etapa medida fora de `etapa`"""
+    if not _ativo:
+        return
+    if _buffer is not None:
+        _buffer.append(('etapa', (nome,), segundos))
+    else:
+        _segundos.labels(nome).observe(segundos)
+
+
+def observar_linhas(nome: str, n: int) -> None:
+    """Registra as linhas processadas por uma execução da etapa"""
+    if not _ativo:
+        return
+    if _buffer is not None:
+        _buffer.append(('linhas', (nome,), n))
+    else:
+        _linhas.labels(nome).observe(n)
+
+
+def contar_solver(backend: str, status: str) -> None:
+    """Conta uma resolução do ILP pelo status final"""
+    if not _ativo:
+        return
+    if _buffer is not None:
+        _buffer.append(('solver', (backend, status), 1))
+    else:
+        _solver.labels(backend, status).inc()
+
+
+def monitorar_pool(nome: str, ler: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Exporta o estado de um pool, lido a cada coleta
+    
+    Args:
+        nome: Rótulo `pool` das séries
+        ler: Retorna um dicionário com 'em_uso', 'capacidade', 'na_fila'
+            e/ou 'pedidos' (resultado -> total acumulado)
+    """
+    _pools[nome] = ler
+
+
+def coletar_em_buffer() -> None:
+    """Passa a guardar as observações deste processo para `drenar`"""
+    global _buffer
+    _buffer = []
+
+
+def drenar() -> List[Tuple[str, Tuple[str, ...], float]]:
+    """Retorna e limpa as observações guardadas no buffer"""
+    global _buffer
+    if not _buffer:
+        return []
+    observacoes, _buffer = _buffer, []
+    return observacoes
+
+
+def registrar(observacoes: List[Tuple[str, Tuple[str, ...], float]]) -> None:
+    """Registra observações drenadas de outro processo"""
+    for tipo, rotulos, valor in observacoes or ():
+        if tipo == 'etapa':
+            observar_etapa(*rotulos, valor)
+        elif tipo == 'linhas':
+            observar_linhas(*rotulos, valor)
+        elif tipo == 'solver':
+            contar_solver(*rotulos)
+
+
+def exportar() -> Tuple[bytes, str]:
+    """
+    Séries no formato texto do Prometheus
+    
+    Returns:
+        (conteúdo, content type); vazio com a coleta desligada
+    """
+    if not _ativo:
+        return b'', CONTENT_TYPE_LATEST
+    return generate_latest(_registry), CONTENT_TYPE_LATEST
+
+
+configurar()
@@ -3,17 +3,28 @@ MitaBot ML Service - Microserviço de Machine Learning para o Cartola FC
 """
 
 import os
+import json
+import asyncio
 import logging
+import time
+import threading
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
-from .models.predictor import CartolaPredictor
-from .models.optimizer import TeamOptimizer
-from .database import Database
+from . import instrumentation, profiling
+from .models.predictor import CartolaPredictor, colunas_para_registros
+from .models.registry import ModelRegistry
+from .database import Database, AsyncDatabase
+from .training_jobs import TrainingJobManager
+from .optimization_pool import OptimizationPool, PoolSaturado
+from .optimization_cache import OptimizationCache, chave_pedido
+from .prediction_cache import PredictionCache, juntar_colunas
+from .batch_prediction import prever_rodada, BatchPredictionJobManager
 
 # Configuração de logging
 logging.basicConfig(
@@ -24,33 +35,97 @@ logger = logging.getLogger(__name__)
 
 # Instâncias globais
 predictor: Optional[CartolaPredictor] = None
-optimizer: Optional[TeamOptimizer] = None
-db: Optional[Database] = None
+optimization_pool: Optional[OptimizationPool] = None
+optimization_cache: Optional[OptimizationCache] = None
+prediction_cache: Optional[PredictionCache] = None
+db: Optional[AsyncDatabase] = None
+training_jobs: Optional[TrainingJobManager] = None
+batch_jobs: Optional[BatchPredictionJobManager] = None
+registry: Optional[ModelRegistry] = None
+
+# Serializa ativações vindas de treinos e de chamadas à API
+_ativacao_lock = threading.Lock()
+
+
+def _ativar_modelo(versao: Optional[str], rollback: bool = False) -> str:
+    """
+    Troca o modelo servido por uma versão do registro
+    
+    O novo predictor é carregado por completo antes da troca (boosters
+    inclusive: um artefato corrompido falha aqui e o modelo anterior segue
+    ativo), que é uma única atribuição: requisições em andamento terminam
+    com o modelo anterior e as seguintes já usam o novo.
+    
+    Returns:
+        Versão ativada
+    """
+    global predictor
+    
+    with _ativacao_lock:
+        if rollback:
+            versao = registry.previous_version()
+            if not versao:
+                raise ValueError("Não há versão anterior para rollback")
+        
+        novo = registry.load(versao, lazy=False)
+        if rollback:
+            registry.rollback()
+        else:
+            registry.activate(versao)
+        predictor = novo
+        if prediction_cache:
+            prediction_cache.invalidar()
+    
+    logger.info(f"Modelo {versao} ativado")
+    
+    return versao
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vida da aplicação"""
-    global predictor, optimizer, db
+    global predictor, optimization_pool, optimization_cache, prediction_cache
+    global db, training_jobs, batch_jobs, registry
     
     logger.info("Iniciando ML Service...")
     
     # Inicializar conexão com banco de dados
-    db = Database(os.getenv('DATABASE_URL'))
+    db = AsyncDatabase(Database(os.getenv('DATABASE_URL')))
+    batch_jobs = BatchPredictionJobManager(db.database)
     
-    # Inicializar predictor
-    predictor = CartolaPredictor()
+    prediction_cache = PredictionCache()
     
-    # Tentar carregar modelo existente
+    # Registro de versões do modelo
     model_path = os.getenv('MODEL_PATH', '/app/models')
-    if os.path.exists(f'{model_path}/cartola_model.pkl'):
-        logger.info("Carregando modelo existente...")
-        predictor.load_model(f'{model_path}/cartola_model.pkl')
+    registry = ModelRegistry(model_path)
+    registry.import_legacy()
+    
+    # Carregar a versão ativa, se houver
+    versao_ativa = registry.active_version()
+    if versao_ativa:
+        logger.info(f"Carregando modelo {versao_ativa}...")
+        # Só na partida os boosters ficam para o primeiro uso: nada a manter
+        # ativo se o artefato falhar
+        predictor = registry.load(versao_ativa)
     else:
+        predictor = CartolaPredictor()
         logger.info("Nenhum modelo encontrado. Treinamento necessário.")
     
-    # Inicializar optimizer
-    optimizer = TeamOptimizer()
+    # Otimizações rodam em um pool de processos
+    optimization_pool = OptimizationPool()
+    optimization_pool.warmup()
+    optimization_cache = OptimizationCache()
+    
+    # Estado dos pools lido a cada coleta do /metrics/prometheus
+    instrumentation.monitorar_pool('otimizacao', optimization_pool.pool_status)
+    instrumentation.monitorar_pool('banco', db.database.pool_status)
+    
+    # Treinamentos rodam em processo separado
+    training_jobs = TrainingJobManager(
+        os.getenv('DATABASE_URL'),
+        model_path,
+        on_model_ready=_ativar_modelo
+    )
     
     logger.info("ML Service iniciado com sucesso!")
     
@@ -58,6 +133,14 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("Encerrando ML Service...")
+    if training_jobs:
+        training_jobs.shutdown()
+    if optimization_pool:
+        optimization_pool.shutdown()
+    if optimization_cache:
+        await optimization_cache.close()
+    if prediction_cache:
+        await prediction_cache.close()
     if db:
         db.close()
 
@@ -95,25 +178,92 @@ class PredictionResponse(BaseModel):
 
 class OptimizationRequest(BaseModel):
     orcamento: float
+    # Esquema tático ou "AUTO" para resolver todos e devolver o melhor
     esquema: str
     previsoes: List[Dict[str, Any]]
     estrategia: str = "EQUILIBRADO"
+    # Rodada das previsões: os resultados em cache são invalidados com ela
+    rodada_id: Optional[str] = None
+    clubes_excluidos: List[str] = []
+    n_alternativas: int = Field(2, ge=0, le=10)
+    # Jogadores diferentes exigidos entre duas escalações do resultado
+    distancia_minima: int = Field(2, ge=1, le=12)
+    # Reordena as melhores escalações por simulação Monte Carlo (risco)
+    simular: bool = False
+    # Pontuação alvo: a simulação estima a probabilidade de superá-la
+    alvo: Optional[float] = None
 
 
 class OptimizationResponse(BaseModel):
     time: Dict[str, Any]
     alternativas: List[Dict[str, Any]]
+    candidatos: Optional[Dict[str, int]] = None
+    formacoes: Optional[List[Dict[str, Any]]] = None
+    simulacao: Optional[Dict[str, Any]] = None
 
 
 class TrainingRequest(BaseModel):
     rodadas: Optional[List[int]] = None
     retrain: bool = False
+    folds_paralelos: Optional[int] = None
+    threads_por_fold: Optional[int] = None
+    early_stopping_rounds: Optional[int] = 20
 
 
 class TrainingResponse(BaseModel):
     success: bool
     message: str
-    metrics: Optional[Dict[str, float]] = None
+    metrics: Optional[Dict[str, Any]] = None
+    job_id: Optional[str] = None
+
+
+class TrainingJobResponse(BaseModel):
+    job_id: str
+    status: str
+    fase: Optional[str]
+    folds_concluidos: int
+    total_folds: int
+    tempo_decorrido_s: float
+    metrics: Optional[Dict[str, Any]]
+    message: Optional[str]
+    error: Optional[str]
+
+
+class BatchPredictRodadasRequest(BaseModel):
+    rodada_ids: Optional[List[str]] = None
+    # Intervalo de números de rodada (inclusivo), alternativa a rodada_ids
+    rodada_inicio: Optional[int] = None
+    rodada_fim: Optional[int] = None
+
+
+class BatchPredictionJobResponse(BaseModel):
+    job_id: str
+    status: str
+    rodada_ids: List[str]
+    rodadas_concluidas: List[str]
+    linhas_processadas: int
+    total_linhas: Optional[int]
+    progresso: Optional[float]
+    linhas_por_s: Optional[float]
+    tempo_decorrido_s: float
+    resultado: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+
+class ModelVersionResponse(BaseModel):
+    versao: str
+    created_at: str
+    base: Optional[str]
+    metrics: Dict[str, Any]
+    feature_columns: List[str]
+    rodadas: List[Optional[int]]
+    ativa: bool
+
+
+class ModelActivationResponse(BaseModel):
+    success: bool
+    versao: str
+    message: str
 
 
 class MetricsResponse(BaseModel):
@@ -128,6 +278,26 @@ class MetricsResponse(BaseModel):
     total_amostras: int
 
 
+def _perfil_pedido(token: Optional[str], endpoint: str) -> Optional[Dict[str, Any]]:
+    """
+    Configuração do perfil pedido pelo cabeçalho X-Profile-Token
+    
+    Returns:
+        None sem o cabeçalho
+    
+    Raises:
+        HTTPException 403: Perfis desligados ou token inválido
+    """
+    if token is None:
+        return None
+    if not profiling.autorizar(token):
+        raise HTTPException(status_code=403, detail="Perfil não autorizado")
+    try:
+        return profiling.novo_perfil(endpoint)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Endpoints
 @app.get("/health")
 async def health_check():
@@ -139,93 +309,267 @@ async def health_check():
     }
 
 
+def _colunar_response(columns: Dict[str, Any]) -> Response:
+    """Serializa predições colunares em JSON compacto, sem validação por linha"""
+    payload = {
+        key: (values.astype(float).round(4) if values.dtype.kind == 'f' else values).tolist()
+        for key, values in columns.items()
+    }
+    return Response(
+        content=json.dumps(payload, separators=(',', ':')),
+        media_type='application/json'
+    )
+
+
 @app.post("/predict", response_model=List[PredictionResponse])
-async def predict(request: PredictionRequest):
+async def predict(request: PredictionRequest, formato: str = "registros"):
     """
     Prediz a pontuação esperada para uma lista de jogadores
+    
+    Com `formato=colunar` retorna um objeto campo -> lista de valores,
+    serializado diretamente a partir dos arrays do modelo.
+    
+    Previsões já calculadas para a rodada com o modelo atual (pelo
+    batch-predict ou por requisições anteriores) vêm do cache; features e
+    modelo só rodam para os jogadores que faltarem.
     """
-    if not predictor or not predictor.is_fitted:
+    # Referência local: um treino concluído pode trocar o modelo global
+    modelo = predictor
+    if not modelo or not modelo.is_fitted:
         raise HTTPException(
             status_code=503,
             detail="Modelo não está treinado. Execute o treinamento primeiro."
         )
     
     try:
-        # Buscar features dos jogadores
-        features = db.get_jogadores_features(request.jogadores, request.rodada_id)
+        inicio = time.perf_counter()
+        with instrumentation.etapa('predict.cache'):
+            em_cache, faltantes = await prediction_cache.buscar(
+                modelo.versao, request.rodada_id, request.jogadores
+            )
+        partes = [em_cache]
+        instrumentation.observar_linhas('predict.jogadores', len(request.jogadores))
         
-        if not features:
+        if faltantes:
+            # Buscar features dos jogadores fora do cache
+            features = await db.get_jogadores_features(faltantes, request.rodada_id)
+            
+            if not features.empty:
+                # Inferência é CPU: fora do event loop, como no /batch-predict
+                calculadas = await run_in_threadpool(modelo.predict_columnar, features)
+                await prediction_cache.guardar(modelo.versao, request.rodada_id, calculadas)
+                partes.append(calculadas)
+        
+        columns = juntar_colunas(partes)
+        if len(columns['jogador_id']) == 0:
             raise HTTPException(
                 status_code=404,
                 detail="Nenhum jogador encontrado com os IDs fornecidos"
             )
+        prediction_cache.registrar_latencia(time.perf_counter() - inicio, bool(faltantes))
         
-        # Fazer predições
-        predictions = predictor.predict(features)
-        
-        return predictions
+        with instrumentation.etapa('predict.serializacao'):
+            if formato == "colunar":
+                resposta = _colunar_response(columns)
+            else:
+                resposta = colunas_para_registros(columns)
+        instrumentation.observar_etapa('predict.total', time.perf_counter() - inicio)
         
+        return resposta
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro na predição: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/predict/cache")
+async def get_predict_cache():
+    """
+    Taxa de hit do cache de previsões e tempo economizado estimado
+    """
+    return prediction_cache.stats()
+
+
 @app.post("/optimize", response_model=OptimizationResponse)
-async def optimize(request: OptimizationRequest):
+async def optimize(
+    request: OptimizationRequest,
+    response: Response,
+    x_profile_token: Optional[str] = Header(None)
+):
     """
     Otimiza a escalação do time respeitando restrições
+    
+    Pedidos repetidos são respondidos pelo cache; os demais são resolvidos
+    no pool de processos. Com a fila cheia responde 429 e, passado o tempo
+    limite, 504.
+    
+    Com X-Profile-Token, o pedido ignora o cache e roda sob o profiler; o id
+    do perfil volta no cabeçalho X-Profile-Id.
     """
+    perfil = _perfil_pedido(x_profile_token, 'optimize')
+    params = dict(
+        previsoes=request.previsoes,
+        orcamento=request.orcamento,
+        esquema=request.esquema,
+        estrategia=request.estrategia,
+        n_alternativas=request.n_alternativas,
+        distancia_minima=request.distancia_minima,
+        clubes_excluidos=request.clubes_excluidos,
+        simular=request.simular,
+        alvo=request.alvo
+    )
+    
     try:
-        result = optimizer.optimize(
-            previsoes=request.previsoes,
-            orcamento=request.orcamento,
-            esquema=request.esquema,
-            estrategia=request.estrategia
-        )
+        with instrumentation.etapa('optimize.total'):
+            if perfil:
+                response.headers['X-Profile-Id'] = perfil['id']
+                result = await optimization_pool.optimize(perfil=perfil, **params)
+            else:
+                chave = chave_pedido(**params)
+                result = await optimization_cache.get_or_compute(
+                    chave,
+                    request.rodada_id,
+                    lambda: optimization_pool.optimize(**params)
+                )
         
         return result
-        
+    
+    except PoolSaturado as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except (asyncio.TimeoutError, TimeoutError):
+        raise HTTPException(status_code=504, detail="Tempo limite da otimização excedido")
     except Exception as e:
         logger.error(f"Erro na otimização: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/train", response_model=TrainingResponse)
-async def train(request: TrainingRequest):
+@app.get("/optimize/metrics")
+async def get_optimize_metrics():
     """
-    Treina o modelo com dados históricos
+    Ocupação do pool de otimização e tempos de espera na fila vs. resolução
     """
-    try:
-        # Buscar dados de treinamento
-        training_data = db.get_training_data(request.rodadas)
-        
-        if len(training_data) < 100:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Dados insuficientes para treinamento. Encontrados: {len(training_data)}"
-            )
-        
-        # Treinar modelo
-        metrics = predictor.train(
-            training_data,
-            retrain=request.retrain
+    return optimization_pool.metrics()
+
+
+@app.get("/optimize/cache")
+async def get_optimize_cache():
+    """
+    Hits, misses e ocupação do cache de resultados do /optimize
+    """
+    return optimization_cache.stats()
+
+
+@app.post("/train", response_model=TrainingResponse, status_code=202)
+async def train(
+    request: TrainingRequest,
+    response: Response,
+    x_profile_token: Optional[str] = Header(None)
+):
+    """
+    Inicia o treinamento do modelo com dados históricos em segundo plano
+    
+    Retorna o id do job imediatamente; o andamento é consultado em
+    GET /train/{job_id}. O modelo atual continua servindo as predições até
+    o novo ser ativado ao fim do treino.
+    
+    Com X-Profile-Token, o treino roda sob o profiler; o id do perfil volta
+    no cabeçalho X-Profile-Id e ele fica disponível ao fim do treino.
+    """
+    perfil = _perfil_pedido(x_profile_token, 'train')
+    em_andamento = training_jobs.em_andamento()
+    if em_andamento:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Treinamento {em_andamento.id} já está em andamento"
         )
-        
-        # Salvar modelo
-        model_path = os.getenv('MODEL_PATH', '/app/models')
-        predictor.save_model(f'{model_path}/cartola_model.pkl')
+    
+    try:
+        job = training_jobs.submit({**request.model_dump(), 'perfil': perfil})
+        if perfil:
+            response.headers['X-Profile-Id'] = perfil['id']
         
         return TrainingResponse(
             success=True,
-            message="Modelo treinado com sucesso",
-            metrics=metrics
+            message="Treinamento iniciado",
+            job_id=job.id
         )
-        
+    
     except Exception as e:
         logger.error(f"Erro no treinamento: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/train/{job_id}", response_model=TrainingJobResponse)
+async def get_training_job(job_id: str):
+    """
+    Retorna fase, progresso dos folds, tempo decorrido e métricas de um treino
+    """
+    job = training_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de treinamento não encontrado")
+    
+    return job.to_dict()
+
+
+@app.delete("/train/{job_id}", response_model=TrainingJobResponse)
+async def cancel_training_job(job_id: str):
+    """
+    Cancela um treinamento em andamento (o modelo atual é mantido)
+    """
+    job = training_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de treinamento não encontrado")
+    
+    if not training_jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job já finalizado: {job.status}")
+    
+    return job.to_dict()
+
+
+@app.get("/models", response_model=List[ModelVersionResponse])
+async def list_models():
+    """
+    Lista as versões registradas do modelo, da mais recente para a mais antiga
+    """
+    return registry.list_versions()
+
+
+@app.post("/models/rollback", response_model=ModelActivationResponse)
+async def rollback_model():
+    """
+    Volta a servir a versão ativada antes da atual
+    """
+    try:
+        versao = await run_in_threadpool(_ativar_modelo, None, True)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return ModelActivationResponse(
+        success=True,
+        versao=versao,
+        message="Rollback concluído"
+    )
+
+
+@app.post("/models/{versao}/activate", response_model=ModelActivationResponse)
+async def activate_model(versao: str):
+    """
+    Ativa uma versão registrada sem interromper as predições em andamento
+    """
+    if not registry.exists(versao):
+        raise HTTPException(status_code=404, detail=f"Versão não encontrada: {versao}")
+    
+    await run_in_threadpool(_ativar_modelo, versao)
+    
+    return ModelActivationResponse(
+        success=True,
+        versao=versao,
+        message="Modelo ativado"
+    )
+
+
 @app.get("/metrics", response_model=MetricsResponse)
 async def get_metrics():
     """
@@ -237,56 +581,153 @@ async def get_metrics():
     try:
         metrics = predictor.get_metrics()
         return MetricsResponse(**metrics)
-        
+    
     except Exception as e:
         logger.error(f"Erro ao obter métricas: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/profiles/{perfil_id}")
+async def get_profile(perfil_id: str, x_profile_token: Optional[str] = Header(None)):
+    """
+    Resumo de um perfil gravado: configuração, duração, erro e as funções
+    com mais tempo; perfil e entradas ficam em PROFILING_DIR/{perfil_id}
+    """
+    if not profiling.autorizar(x_profile_token):
+        raise HTTPException(status_code=403, detail="Perfil não autorizado")
+    
+    meta = profiling.carregar_meta(perfil_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado (ou ainda em execução)")
+    
+    return meta
+
+
+@app.get("/metrics/prometheus")
+async def get_prometheus_metrics():
+    """
+    Latência por etapa, linhas processadas, status do solver e ocupação dos
+    pools no formato texto do Prometheus (vazio com METRICS_ENABLED=false)
+    """
+    conteudo, content_type = instrumentation.exportar()
+    return Response(content=conteudo, headers={'Content-Type': content_type})
+
+
 @app.post("/batch-predict")
 async def batch_predict(rodada_id: str):
     """
     Gera previsões para todos os jogadores de uma rodada
     """
-    if not predictor or not predictor.is_fitted:
+    modelo = predictor
+    if not modelo or not modelo.is_fitted:
         raise HTTPException(
             status_code=503,
             detail="Modelo não está treinado"
         )
     
+    loop = asyncio.get_running_loop()
+    
+    def ao_salvar(columns):
+        # O cache pertence ao event loop; o pipeline roda em threads
+        asyncio.run_coroutine_threadsafe(
+            prediction_cache.guardar(modelo.versao, rodada_id, columns), loop
+        ).result()
+    
     try:
-        # Buscar todos os jogadores da rodada
-        jogadores = db.get_jogadores_rodada(rodada_id)
+        # Lê, prevê e grava em blocos, com as etapas sobrepostas
+        resultado = await run_in_threadpool(
+            prever_rodada, db.database, modelo, rodada_id, None, ao_salvar
+        )
         
-        if not jogadores:
+        if resultado['total_predictions'] == 0:
             raise HTTPException(
                 status_code=404,
                 detail="Nenhum jogador encontrado para esta rodada"
             )
         
-        # Buscar features
-        features = db.get_jogadores_features(
-            [j['id'] for j in jogadores],
-            rodada_id
-        )
-        
-        # Fazer predições
-        predictions = predictor.predict(features)
-        
-        # Salvar previsões no banco
-        db.save_predictions(rodada_id, predictions)
+        # Otimizações calculadas com as previsões anteriores não servem mais
+        await optimization_cache.invalidar_rodada(rodada_id)
         
         return {
             "success": True,
-            "total_predictions": len(predictions),
-            "rodada_id": rodada_id
+            "rodada_id": rodada_id,
+            **resultado
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro no batch predict: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/batch-predict/rodadas", response_model=BatchPredictionJobResponse, status_code=202)
+async def batch_predict_rodadas(request: BatchPredictRodadasRequest):
+    """
+    Gera previsões para várias rodadas em segundo plano (ex.: após um retreino)
+    
+    As rodadas vêm de `rodada_ids` ou do intervalo rodada_inicio..rodada_fim.
+    Features de todas elas são lidas numa única consulta e previstas e
+    gravadas em blocos; o andamento é consultado em
+    GET /batch-predict/jobs/{job_id}.
+    """
+    modelo = predictor
+    if not modelo or not modelo.is_fitted:
+        raise HTTPException(
+            status_code=503,
+            detail="Modelo não está treinado"
+        )
+    
+    if request.rodada_ids:
+        rodada_ids = request.rodada_ids
+    elif request.rodada_inicio is not None and request.rodada_fim is not None:
+        rodada_ids = await run_in_threadpool(
+            db.database.get_rodadas_intervalo, request.rodada_inicio, request.rodada_fim
+        )
+        if not rodada_ids:
+            raise HTTPException(status_code=404, detail="Nenhuma rodada no intervalo")
+    else:
+        raise HTTPException(
+            status_code=422,
+            detail="Informe rodada_ids ou rodada_inicio e rodada_fim"
+        )
+    
+    em_andamento = batch_jobs.em_andamento()
+    if em_andamento:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Predição em lote {em_andamento.id} já está em andamento"
+        )
+    
+    loop = asyncio.get_running_loop()
+    
+    def ao_concluir(job):
+        # Otimizações calculadas com as previsões anteriores não servem mais
+        for rodada_id in job.rodada_ids:
+            asyncio.run_coroutine_threadsafe(
+                optimization_cache.invalidar_rodada(rodada_id), loop
+            ).result()
+    
+    try:
+        job = batch_jobs.submit(modelo, rodada_ids, ao_concluir)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return job.to_dict()
+
+
+@app.get("/batch-predict/jobs/{job_id}", response_model=BatchPredictionJobResponse)
+async def get_batch_prediction_job(job_id: str):
+    """
+    Retorna o progresso (linhas e rodadas concluídas) de uma predição em lote
+    """
+    job = batch_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de predição em lote não encontrado")
+    
+    return job.to_dict()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
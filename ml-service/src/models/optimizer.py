@@ -2,18 +2,63 @@
 Otimizador de escalação do Cartola FC usando Programação Linear Inteira
 """
 
+import os
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict, defaultdict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 import numpy as np
+from scipy.optimize import milp, Bounds, LinearConstraint
+from scipy.sparse import coo_matrix, csr_matrix, vstack
 from pulp import (
-    LpProblem, LpVariable, LpMaximize, LpBinary, LpContinuous,
-    lpSum, LpStatusOptimal, value, PULP_CBC_CMD
+    LpProblem, LpVariable, LpMaximize, LpBinary, LpAffineExpression,
+    lpSum, LpStatusOptimal, LpStatusNotSolved, PULP_CBC_CMD
 )
 
+from .. import instrumentation
+from .simulation import LineupSimulator
+
 logger = logging.getLogger(__name__)
 
+POSICOES = ('GOLEIRO', 'ZAGUEIRO', 'LATERAL', 'MEIA', 'ATACANTE', 'TECNICO')
+
+ESTRATEGIAS = ('SEGURO', 'EQUILIBRADO', 'OUSADO')
+
+# Esquema que resolve todas as formações e devolve a melhor
+ESQUEMA_AUTO = 'AUTO'
+
+# Modelos compilados mantidos em memória (até dois por pool de jogadores:
+# com e sem poda)
+MAX_MODELOS_CACHE = 16
+
+# Escalações avaliadas pela simulação quando ela reordena o resultado
+# (a ótima do ILP e as seguintes)
+CANDIDATOS_SIMULACAO = 8
+
+# Métrica da simulação que ordena as escalações, por estratégia
+CRITERIO_SIMULACAO = {
+    'SEGURO': 'p10',
+    'EQUILIBRADO': 'media',
+    'OUSADO': 'p90',
+}
+
+# Cortes de diversidade tolerados pelo modelo podado: cada corte pode
+# bloquear até uma vaga da posição em dominadores, e a poda exige essa folga
+# por corte. Com mais cortes, as escalações saem do modelo sem poda.
+MARGEM_PODA = 2
+
+# Status final de cada resolução, como exportado nas métricas
+STATUS_HIGHS = {0: 'otimo', 1: 'limite', 2: 'inviavel', 3: 'ilimitado', 4: 'erro'}
+STATUS_CBC = {1: 'otimo', 0: 'limite', -1: 'inviavel', -2: 'ilimitado', -3: 'erro'}
+
+# Escalação ótima: índices dos jogadores escalados e do capitão
+Escalacao = Tuple[List[int], int]
+
+# Corte de diversidade: no máximo `maximo` dos jogadores `indices` escalados
+Corte = Tuple[np.ndarray, int]
+
 
 @dataclass
 class JogadorPrevisao:
@@ -28,6 +73,237 @@ class JogadorPrevisao:
     status: str
 
 
+class LineupModel:
+    """
+    Modelo ILP de escalação compilado para um pool de jogadores
+    
+    As restrições (posição, clube, capitão) são montadas uma única vez a
+    partir de índices agrupados por posição e clube. Entre resoluções mudam
+    apenas os coeficientes do objetivo, o orçamento, o lado direito das
+    restrições de formação e os jogadores excluídos.
+    
+    Variáveis: x_i (jogador i escalado) e c_i (jogador i capitão).
+    
+    Args:
+        jogadores: Pool de candidatos
+        max_por_clube: Limite de jogadores de um mesmo clube
+        tempo_limite: Tempo máximo de cada resolução em segundos (None =
+            sem limite); ao estourar, fica a melhor escalação encontrada
+        threads: Threads do solver (só o CBC usa)
+    """
+    
+    def __init__(
+        self,
+        jogadores: Sequence[JogadorPrevisao],
+        max_por_clube: int,
+        tempo_limite: Optional[float] = None,
+        threads: Optional[int] = None
+    ):
+        self.n = len(jogadores)
+        self.max_por_clube = max_por_clube
+        self.tempo_limite = tempo_limite
+        self.threads = threads
+        self.precos = np.array([j.preco for j in jogadores], dtype=float)
+        
+        indices_posicao: Dict[str, List[int]] = {p: [] for p in POSICOES}
+        indices_clube: Dict[str, List[int]] = defaultdict(list)
+        for i, j in enumerate(jogadores):
+            indices_posicao.setdefault(j.posicao, []).append(i)
+            indices_clube[j.clube_id].append(i)
+        
+        self.indices_posicao = {p: np.array(idx, dtype=int) for p, idx in indices_posicao.items()}
+        self.indices_clube = {c: np.array(idx, dtype=int) for c, idx in indices_clube.items()}
+        self._lock = threading.Lock()
+    
+    def solve(
+        self,
+        coef_escalado: np.ndarray,
+        coef_capitao: np.ndarray,
+        orcamento: float,
+        formacao: Dict[str, int],
+        cortes: Sequence[Corte] = ()
+    ) -> Optional[Escalacao]:
+        """
+        Resolve a escalação ótima
+        
+        Args:
+            coef_escalado: Peso de cada jogador no objetivo quando escalado
+            coef_capitao: Peso extra de cada jogador quando capitão
+            orcamento: Orçamento máximo (C$)
+            formacao: Quantidade de jogadores por posição
+            cortes: Cortes de diversidade em relação a escalações anteriores
+        
+        Returns:
+            Índices dos escalados e do capitão, ou None se não há escalação viável
+        
+        Raises:
+            TimeoutError: Tempo limite atingido antes de qualquer escalação viável
+        """
+        with self._lock, instrumentation.etapa('optimize.resolver'):
+            return self._solve(coef_escalado, coef_capitao, orcamento, formacao, cortes)
+    
+    def _solve(self, coef_escalado, coef_capitao, orcamento, formacao, cortes):
+        raise NotImplementedError
+
+
+class HighsLineupModel(LineupModel):
+    """
+    Backend em processo: HiGHS via scipy.optimize.milp
+    
+    A matriz de restrições esparsa é montada uma vez; cada resolução só
+    troca o vetor de custos e os limites.
+    """
+    
+    def __init__(self, jogadores: Sequence[JogadorPrevisao], max_por_clube: int, **kwargs):
+        super().__init__(jogadores, max_por_clube, **kwargs)
+        n = self.n
+        
+        linhas, colunas, valores = [], [], []
+        lb, ub = [], []
+        
+        def linha(indices: np.ndarray, coefs, inferior: float, superior: float) -> int:
+            numero = len(lb)
+            linhas.append(np.full(len(indices), numero))
+            colunas.append(indices)
+            valores.append(np.broadcast_to(coefs, len(indices)))
+            lb.append(inferior)
+            ub.append(superior)
+            return numero
+        
+        todos = np.arange(n)
+        
+        # Orçamento, formação e total têm o lado direito definido a cada resolução
+        self._linha_orcamento = linha(todos, self.precos, -np.inf, np.inf)
+        self._linhas_posicao = {
+            p: linha(idx, 1.0, 0, 0) for p, idx in self.indices_posicao.items()
+        }
+        self._linha_total = linha(todos, 1.0, 0, 0)
+        
+        # Um capitão, que precisa estar escalado
+        linha(n + todos, 1.0, 1, 1)
+        for i in range(n):
+            linha(np.array([n + i, i]), np.array([1.0, -1.0]), -np.inf, 0)
+        
+        for idx in self.indices_clube.values():
+            linha(idx, 1.0, -np.inf, max_por_clube)
+        
+        self._A = coo_matrix(
+            (np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+            shape=(len(lb), 2 * n)
+        ).tocsr()
+        self._lb = np.array(lb, dtype=float)
+        self._ub = np.array(ub, dtype=float)
+        self._integrality = np.ones(2 * n)
+    
+    def _solve(self, coef_escalado, coef_capitao, orcamento, formacao, cortes):
+        n = self.n
+        A = self._A
+        lb = self._lb.copy()
+        ub = self._ub.copy()
+        
+        ub[self._linha_orcamento] = orcamento
+        for posicao, linha in self._linhas_posicao.items():
+            lb[linha] = ub[linha] = formacao.get(posicao, 0)
+        lb[self._linha_total] = ub[self._linha_total] = sum(formacao.values())
+        
+        if cortes:
+            colunas = np.concatenate([indices for indices, _ in cortes])
+            linhas = np.repeat(np.arange(len(cortes)), [len(indices) for indices, _ in cortes])
+            A = vstack([A, csr_matrix(
+                (np.ones(len(colunas)), (linhas, colunas)), shape=(len(cortes), 2 * n)
+            )])
+            lb = np.concatenate([lb, np.full(len(cortes), -np.inf)])
+            ub = np.concatenate([ub, [maximo for _, maximo in cortes]])
+        
+        resultado = milp(
+            c=-np.concatenate([coef_escalado, coef_capitao]),
+            integrality=self._integrality,
+            bounds=Bounds(0, 1),
+            constraints=LinearConstraint(A, lb, ub),
+            options={'time_limit': self.tempo_limite} if self.tempo_limite else None,
+        )
+        instrumentation.contar_solver('highs', STATUS_HIGHS.get(resultado.status, 'erro'))
+        
+        if resultado.status != 0:
+            logger.warning(f"Solução não ótima encontrada. Status: {resultado.message}")
+            if resultado.x is None:
+                if resultado.status == 1:
+                    raise TimeoutError("Tempo limite do solver atingido sem escalação viável")
+                return None
+        
+        valores = resultado.x
+        selecionados = np.flatnonzero(valores[:n] > 0.5).tolist()
+        capitao = int(np.argmax(valores[n:]))
+        
+        return selecionados, capitao
+
+
+class CbcLineupModel(LineupModel):
+    """
+    Backend CBC via PuLP
+    
+    O LpProblem é montado uma vez; cada resolução atualiza o objetivo e as
+    constantes das restrições nomeadas, e os cortes de diversidade entram
+    só durante a chamada ao CBC (que continua rodando como subprocesso).
+    """
+    
+    def __init__(self, jogadores: Sequence[JogadorPrevisao], max_por_clube: int, **kwargs):
+        super().__init__(jogadores, max_por_clube, **kwargs)
+        
+        self._x = [LpVariable(f"x_{i}", cat=LpBinary) for i in range(self.n)]
+        self._c = [LpVariable(f"c_{i}", cat=LpBinary) for i in range(self.n)]
+        
+        prob = LpProblem("Cartola_Optimization", LpMaximize)
+        
+        prob += LpAffineExpression(list(zip(self._x, self.precos.tolist()))) <= 0, 'orcamento'
+        for posicao, idx in self.indices_posicao.items():
+            prob += lpSum(self._x[i] for i in idx) == 0, f'posicao_{posicao}'
+        prob += lpSum(self._x) == 0, 'total'
+        
+        prob += lpSum(self._c) == 1, 'capitao'
+        for i in range(self.n):
+            prob += self._c[i] <= self._x[i], f'capitao_escalado_{i}'
+        
+        for k, idx in enumerate(self.indices_clube.values()):
+            prob += lpSum(self._x[i] for i in idx) <= max_por_clube, f'clube_{k}'
+        
+        self._prob = prob
+    
+    def _solve(self, coef_escalado, coef_capitao, orcamento, formacao, cortes):
+        prob = self._prob
+        
+        prob.setObjective(LpAffineExpression(
+            list(zip(self._x, coef_escalado.tolist())) + list(zip(self._c, coef_capitao.tolist()))
+        ))
+        
+        # PuLP guarda a restrição como `expressão + constante (sentido) 0`
+        prob.constraints['orcamento'].constant = -orcamento
+        for posicao in self.indices_posicao:
+            prob.constraints[f'posicao_{posicao}'].constant = -formacao.get(posicao, 0)
+        prob.constraints['total'].constant = -sum(formacao.values())
+        
+        nomes_cortes = [f'corte_{k}' for k in range(len(cortes))]
+        for nome, (indices, maximo) in zip(nomes_cortes, cortes):
+            prob += lpSum(self._x[i] for i in indices) <= maximo, nome
+        try:
+            prob.solve(PULP_CBC_CMD(msg=0, timeLimit=self.tempo_limite, threads=self.threads))
+        finally:
+            for nome in nomes_cortes:
+                del prob.constraints[nome]
+        instrumentation.contar_solver('cbc', STATUS_CBC.get(prob.status, 'erro'))
+        
+        if prob.status != LpStatusOptimal:
+            logger.warning(f"Solução não ótima encontrada. Status: {prob.status}")
+            if prob.status == LpStatusNotSolved:
+                raise TimeoutError("Tempo limite do solver atingido sem escalação viável")
+            return None
+        
+        selecionados = [i for i, v in enumerate(self._x) if v.varValue > 0.5]
+        capitao = next(i for i, v in enumerate(self._c) if v.varValue > 0.5)
+        
+        return selecionados, capitao
+
+
 class TeamOptimizer:
     """
     Otimizador de time do Cartola FC usando PuLP (ILP)
@@ -43,35 +319,214 @@ class TeamOptimizer:
         '5-3-2': {'GOLEIRO': 1, 'ZAGUEIRO': 3, 'LATERAL': 2, 'MEIA': 3, 'ATACANTE': 2, 'TECNICO': 1},
     }
     
-    def __init__(self):
+    # Backends de resolução disponíveis
+    BACKENDS = {
+        'highs': HighsLineupModel,
+        'cbc': CbcLineupModel,
+    }
+    
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        podar: bool = True,
+        margem_poda: Optional[int] = None,
+        tempo_limite: Optional[float] = None,
+        threads: Optional[int] = None
+    ):
         self.max_jogadores_por_clube = 3
+        self.backend = backend or os.getenv('OPTIMIZER_BACKEND', 'highs')
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Backend inválido. Opções: {list(self.BACKENDS.keys())}")
+        self.podar = podar
+        self.margem_poda = (
+            margem_poda if margem_poda is not None
+            else int(os.getenv('OPTIMIZER_PRUNING_MARGIN', MARGEM_PODA))
+        )
+        self.tempo_limite = tempo_limite
+        self.threads = threads
+        self._modelos: 'OrderedDict[Tuple[int, bool], Tuple[LineupModel, np.ndarray]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def optimize(
+    def _modelo_para(
         self,
-        previsoes: List[Dict[str, Any]],
-        orcamento: float,
-        esquema: str,
-        estrategia: str = "EQUILIBRADO"
-    ) -> Dict[str, Any]:
+        jogadores: List[JogadorPrevisao],
+        podar: Optional[bool] = None
+    ) -> Tuple[LineupModel, np.ndarray]:
         """
-        Otimiza a escalação do time
+        Modelo compilado do pool, reaproveitado enquanto o pool não muda
         
         Args:
-            previsoes: Lista de previsões de jogadores
-            orcamento: Orçamento máximo (C$)
-            esquema: Esquema tático (ex: '4-3-3')
-            estrategia: 'SEGURO', 'EQUILIBRADO' ou 'OUSADO'
+            podar: Modelo com ou sem a poda por dominância (padrão:
+                `self.podar`)
         
         Returns:
-            Dicionário com time otimizado e alternativas
+            Modelo sobre os candidatos que sobraram da poda e os índices
+            desses candidatos no pool
         """
-        # Validar esquema
-        if esquema not in self.FORMACOES:
-            raise ValueError(f"Esquema inválido. Opções: {list(self.FORMACOES.keys())}")
+        podar = self.podar if podar is None else podar
+        chave = (hash(tuple(
+            (j.id, j.posicao, j.clube_id, j.preco, j.pontos_esperados, j.desvio_padrao)
+            for j in jogadores
+        )), podar)
         
-        formacao = self.FORMACOES[esquema]
+        with self._cache_lock:
+            compilado = self._modelos.get(chave)
+            if compilado is not None:
+                self._modelos.move_to_end(chave)
+                return compilado
+        
+        if podar:
+            with instrumentation.etapa('optimize.poda'):
+                candidatos = self._podar_dominados(jogadores)
+            logger.info(
+                f"Poda por dominância: {len(jogadores) - len(candidatos)} de "
+                f"{len(jogadores)} jogadores removidos"
+            )
+        else:
+            candidatos = np.arange(len(jogadores))
+        
+        with instrumentation.etapa('optimize.compilar'):
+            modelo = self.BACKENDS[self.backend](
+                [jogadores[i] for i in candidatos], self.max_jogadores_por_clube,
+                tempo_limite=self.tempo_limite, threads=self.threads
+            )
+        instrumentation.observar_linhas('optimize.compilar', len(candidatos))
+        compilado = (modelo, candidatos)
+        
+        with self._cache_lock:
+            self._modelos[chave] = compilado
+            while len(self._modelos) > MAX_MODELOS_CACHE:
+                self._modelos.popitem(last=False)
+        
+        return compilado
+    
+    def _podar_dominados(self, jogadores: List[JogadorPrevisao]) -> np.ndarray:
+        """
+        Remove jogadores que nunca entram numa escalação ótima
+        
+        O jogador j é dominado por i (mesma posição) quando i custa no
+        máximo o mesmo e tem peso pelo menos igual em todas as estratégias e
+        como capitão (empates exatos são desfeitos pelo índice). Se j está
+        numa escalação e algum dominador pode entrar no lugar dele, a troca
+        não piora o objetivo. Um dominador fica bloqueado se já foi escalado
+        (no máximo vagas - 1 deles), se o clube dele está cheio (no máximo
+        (total - 1) // limite clubes) ou se está numa escalação anterior que
+        j não está, com o corte de diversidade dela justo (no máximo vagas
+        por corte). Com dominadores em mais clubes distintos do que isso
+        pode bloquear, j é podado.
+        
+        Invariante: com até `margem_poda` cortes de diversidade, o ótimo do
+        modelo podado é igual ao do modelo sem poda. Com mais cortes,
+        `_escalar` usa o modelo sem poda.
+        
+        Returns:
+            Índices (no pool) dos candidatos mantidos, em ordem crescente
+        """
+        n = len(jogadores)
+        precos = np.array([j.preco for j in jogadores], dtype=float)
+        posicoes = np.array([j.posicao for j in jogadores])
+        _, clubes = np.unique([j.clube_id for j in jogadores], return_inverse=True)
+        n_clubes = clubes.max() + 1 if n else 0
+        
+        # Pesos a maximizar: escalado em cada estratégia e bônus de capitão
+        pesos = [self._coeficientes(jogadores, e)[0] for e in ESTRATEGIAS]
+        pesos.append(self._coeficientes(jogadores, ESTRATEGIAS[0])[1])
+        pesos = np.vstack(pesos + [-precos])
+        
+        vagas = {
+            p: max(f.get(p, 0) for f in self.FORMACOES.values()) for p in POSICOES
+        }
+        total = max(sum(f.values()) for f in self.FORMACOES.values())
+        clubes_bloqueados = (total - 1) // self.max_jogadores_por_clube
+        
+        manter = np.ones(n, dtype=bool)
+        for posicao, n_vagas in vagas.items():
+            idx = np.flatnonzero(posicoes == posicao)
+            if len(idx) == 0:
+                continue
+            
+            # dom[a, b]: idx[a] domina idx[b]
+            p = pesos[:, idx]
+            maior_igual = (p[:, :, None] >= p[:, None, :]).all(axis=0)
+            maior = (p[:, :, None] > p[:, None, :]).any(axis=0)
+            desempate = idx[:, None] < idx[None, :]
+            dom = maior_igual & (maior | desempate)
+            
+            um_hot = np.zeros((len(idx), n_clubes), dtype=int)
+            um_hot[np.arange(len(idx)), clubes[idx]] = 1
+            clubes_dominadores = ((dom.T.astype(int) @ um_hot) > 0).sum(axis=1)
+            
+            exigido = n_vagas * (1 + self.margem_poda) + clubes_bloqueados
+            manter[idx[clubes_dominadores >= exigido]] = False
+        
+        return np.flatnonzero(manter)
+    
+    @staticmethod
+    def _coeficientes(
+        jogadores: List[JogadorPrevisao],
+        estrategia: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pesos do objetivo por estratégia: (escalado, capitão)
+        """
+        pontos = np.array([j.pontos_esperados for j in jogadores], dtype=float)
+        desvio = np.array([j.desvio_padrao for j in jogadores], dtype=float)
+        
+        if estrategia == 'SEGURO':
+            # Penalizar jogadores com alta variância
+            escalado = pontos * (1 - desvio / 10)
+        elif estrategia == 'OUSADO':
+            # Priorizar jogadores com alto potencial (mesmo com variância)
+            escalado = pontos + desvio * 0.3
+        else:  # EQUILIBRADO
+            escalado = pontos
+        
+        # Capitão tem peso extra
+        return escalado, pontos * 0.5
+    
+    def _escalar(
+        self,
+        jogadores: List[JogadorPrevisao],
+        orcamento: float,
+        formacao: Dict[str, int],
+        estrategia: str,
+        cortes: Sequence[Sequence[int]] = (),
+        distancia_minima: int = 1
+    ) -> Optional[Escalacao]:
+        # A poda só preserva o ótimo com até `margem_poda` cortes
+        modelo, candidatos = self._modelo_para(
+            jogadores, self.podar and len(cortes) <= self.margem_poda
+        )
+        coef_escalado, coef_capitao = self._coeficientes(jogadores, estrategia)
+        
+        # Índices do pool -> índices no modelo podado
+        posicao_modelo = np.full(len(jogadores), -1)
+        posicao_modelo[candidatos] = np.arange(len(candidatos))
         
-        # Converter previsões para objetos
+        # Pelo menos `distancia_minima` jogadores fora de cada escalação
+        # anterior: sum(x_i, i em S) <= |S| - distância. Jogadores podados
+        # já estão fora, e o corte fica só com os que estão no modelo.
+        cortes_modelo = []
+        for escalacao_anterior in cortes:
+            indices = posicao_modelo[np.asarray(escalacao_anterior, dtype=int)]
+            presentes = indices[indices >= 0]
+            maximo = len(escalacao_anterior) - distancia_minima
+            if maximo < len(presentes):
+                cortes_modelo.append((presentes, maximo))
+        
+        escalacao = modelo.solve(
+            coef_escalado[candidatos], coef_capitao[candidatos],
+            orcamento, formacao, cortes_modelo
+        )
+        if escalacao is None:
+            return None
+        
+        selecionados, capitao = escalacao
+        return candidatos[selecionados].tolist(), int(candidatos[capitao])
+    
+    @staticmethod
+    def _parse_previsoes(previsoes: List[Dict[str, Any]]) -> List[JogadorPrevisao]:
+        """Converte as previsões em jogadores, mantendo apenas os prováveis"""
         jogadores = []
         for p in previsoes:
             jogador = p.get('jogador', {})
@@ -87,100 +542,169 @@ class TeamOptimizer:
                 status=jogador.get('status', 'PROVAVEL'),
             ))
         
-        # Filtrar apenas jogadores prováveis
-        jogadores = [j for j in jogadores if j.status == 'PROVAVEL']
-        
-        if len(jogadores) < 11:
-            raise ValueError(f"Jogadores insuficientes: {len(jogadores)}")
+        return [j for j in jogadores if j.status == 'PROVAVEL']
+    
+    def optimize(
+        self,
+        previsoes: List[Dict[str, Any]],
+        orcamento: float,
+        esquema: str,
+        estrategia: str = "EQUILIBRADO",
+        n_alternativas: int = 2,
+        distancia_minima: int = 2,
+        clubes_excluidos: Optional[List[str]] = None,
+        simular: bool = False,
+        alvo: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Otimiza a escalação do time
         
-        # Criar problema de otimização
-        prob = LpProblem("Cartola_Optimization", LpMaximize)
+        Args:
+            previsoes: Lista de previsões de jogadores
+            orcamento: Orçamento máximo (C$)
+            esquema: Esquema tático (ex: '4-3-3') ou 'AUTO' para escolher a
+                melhor formação
+            estrategia: 'SEGURO', 'EQUILIBRADO' ou 'OUSADO'
+            n_alternativas: Quantidade de escalações alternativas
+            distancia_minima: Jogadores diferentes entre duas escalações
+                quaisquer do resultado
+            clubes_excluidos: Clubes cujos jogadores não podem ser escalados
+            simular: Reordena as melhores escalações do ILP por simulação
+                Monte Carlo (SEGURO pelo p10, OUSADO pelo p90 ou, com
+                `alvo`, pela probabilidade de superá-lo)
+            alvo: Pontuação cuja probabilidade de superação é estimada
         
-        # Variáveis de decisão (binárias: 0 ou 1)
-        x = {j.id: LpVariable(f"x_{j.id}", cat=LpBinary) for j in jogadores}
+        Returns:
+            Dicionário com time otimizado e alternativas (e, no modo AUTO, o
+            resultado de cada formação)
+        """
+        # Validar esquema
+        if esquema != ESQUEMA_AUTO and esquema not in self.FORMACOES:
+            raise ValueError(
+                f"Esquema inválido. Opções: {list(self.FORMACOES.keys()) + [ESQUEMA_AUTO]}"
+            )
         
-        # Variável para capitão
-        c = {j.id: LpVariable(f"c_{j.id}", cat=LpBinary) for j in jogadores}
+        jogadores = self._parse_previsoes(previsoes)
+        if clubes_excluidos:
+            excluidos = set(clubes_excluidos)
+            jogadores = [j for j in jogadores if j.clube_id not in excluidos]
         
-        # Função objetivo: maximizar pontos esperados
-        # Aplicar peso da estratégia
-        if estrategia == 'SEGURO':
-            # Penalizar jogadores com alta variância
-            objetivo = lpSum([
-                x[j.id] * j.pontos_esperados * (1 - j.desvio_padrao / 10)
-                for j in jogadores
-            ]) + lpSum([
-                c[j.id] * j.pontos_esperados * 0.5  # Capitão tem peso extra
-                for j in jogadores
-            ])
-        elif estrategia == 'OUSADO':
-            # Priorizar jogadores com alto potencial (mesmo com variância)
-            objetivo = lpSum([
-                x[j.id] * (j.pontos_esperados + j.desvio_padrao * 0.3)
-                for j in jogadores
-            ]) + lpSum([
-                c[j.id] * j.pontos_esperados * 0.5
-                for j in jogadores
-            ])
-        else:  # EQUILIBRADO
-            objetivo = lpSum([
-                x[j.id] * j.pontos_esperados
-                for j in jogadores
-            ]) + lpSum([
-                c[j.id] * j.pontos_esperados * 0.5
-                for j in jogadores
-            ])
+        if len(jogadores) < 11:
+            raise ValueError(f"Jogadores insuficientes: {len(jogadores)}")
         
-        prob += objetivo
+        formacoes = None
+        if esquema == ESQUEMA_AUTO:
+            esquema, escalacao, formacoes = self._melhor_formacao(jogadores, orcamento, estrategia)
+        else:
+            escalacao = self._escalar(jogadores, orcamento, self.FORMACOES[esquema], estrategia)
         
-        # Restrições
+        if escalacao is None:
+            raise ValueError("Nenhuma escalação viável para o orçamento e esquema informados")
         
-        # 1. Orçamento
-        prob += lpSum([x[j.id] * j.preco for j in jogadores]) <= orcamento
+        simulacao = None
+        if simular:
+            escalacoes, avaliacoes, simulacao = self._simular(
+                jogadores, orcamento, esquema, estrategia, escalacao,
+                n_alternativas, distancia_minima, alvo
+            )
+            times = [
+                {
+                    **self._montar_time(jogadores, e, orcamento, esquema, estrategia),
+                    'simulacao': avaliacao,
+                }
+                for e, avaliacao in zip(escalacoes, avaliacoes)
+            ]
+            time_result = times[0]
+            alternativas = times[1:n_alternativas + 1]
+            for i, alt in enumerate(alternativas):
+                alt['id'] = f'alt_{i}'
+        else:
+            time_result = self._montar_time(jogadores, escalacao, orcamento, esquema, estrategia)
+            alternativas = self._gerar_alternativas(
+                jogadores, orcamento, esquema, estrategia, escalacao[0],
+                n_alternativas, distancia_minima
+            )
         
-        # 2. Número de jogadores por posição
-        for posicao, quantidade in formacao.items():
-            if quantidade > 0:
-                prob += lpSum([
-                    x[j.id] for j in jogadores if j.posicao == posicao
-                ]) == quantidade
+        _, candidatos = self._modelo_para(jogadores)
         
-        # 3. Total de jogadores (11 titulares)
-        prob += lpSum([x[j.id] for j in jogadores]) == 11
+        resultado = {
+            'time': time_result,
+            'alternativas': alternativas,
+            'candidatos': {
+                'total': len(jogadores),
+                'podados': len(jogadores) - len(candidatos),
+            }
+        }
+        if formacoes is not None:
+            resultado['formacoes'] = formacoes
+        if simulacao is not None:
+            resultado['simulacao'] = simulacao
         
-        # 4. Um capitão
-        prob += lpSum([c[j.id] for j in jogadores]) == 1
+        return resultado
+    
+    def _melhor_formacao(
+        self,
+        jogadores: List[JogadorPrevisao],
+        orcamento: float,
+        estrategia: str
+    ) -> Tuple[str, Optional[Escalacao], List[Dict[str, Any]]]:
+        """
+        Resolve todas as formações e escolhe a de maior objetivo
         
-        # 5. Capitão deve estar no time
-        for j in jogadores:
-            prob += c[j.id] <= x[j.id]
+        A poda não depende da formação, então as seis resoluções usam o
+        mesmo modelo compilado, mudando só o lado direito das restrições de
+        posição.
         
-        # 6. Máximo de jogadores por clube
-        clubes = set(j.clube_id for j in jogadores)
-        for clube in clubes:
-            prob += lpSum([
-                x[j.id] for j in jogadores if j.clube_id == clube
-            ]) <= self.max_jogadores_por_clube
+        Returns:
+            Melhor esquema, sua escalação e o resumo de cada formação
+            (ordenado do melhor para o pior; inviáveis no fim)
+        """
+        coef_escalado, coef_capitao = self._coeficientes(jogadores, estrategia)
         
-        # Resolver
-        prob.solve(PULP_CBC_CMD(msg=0))
+        resumos = []
+        melhor = (None, None, -np.inf)
+        for esquema, formacao in self.FORMACOES.items():
+            escalacao = self._escalar(jogadores, orcamento, formacao, estrategia)
+            if escalacao is None:
+                resumos.append({'esquema': esquema, 'viavel': False})
+                continue
+            
+            selecionados, capitao = escalacao
+            objetivo = float(coef_escalado[selecionados].sum() + coef_capitao[capitao])
+            resumos.append({
+                'esquema': esquema,
+                'viavel': True,
+                'objetivo': objetivo,
+                'pontos_previstos': sum(jogadores[i].pontos_esperados for i in selecionados) +
+                                    jogadores[capitao].pontos_esperados,
+                'custo_total': sum(jogadores[i].preco for i in selecionados),
+            })
+            if objetivo > melhor[2]:
+                melhor = (esquema, escalacao, objetivo)
         
-        # Verificar solução
-        if prob.status != LpStatusOptimal:
-            logger.warning(f"Solução não ótima encontrada. Status: {prob.status}")
+        resumos.sort(key=lambda r: r.get('objetivo', -np.inf), reverse=True)
         
-        # Extrair time selecionado
-        time_selecionado = [j for j in jogadores if value(x[j.id]) > 0.5]
-        capitao = next((j for j in jogadores if value(c[j.id]) > 0.5), None)
+        return melhor[0], melhor[1], resumos
+    
+    def _montar_time(
+        self,
+        jogadores: List[JogadorPrevisao],
+        escalacao: Escalacao,
+        orcamento: float,
+        esquema: str,
+        estrategia: str
+    ) -> Dict[str, Any]:
+        selecionados, indice_capitao = escalacao
+        time_selecionado = [jogadores[i] for i in selecionados]
+        capitao = jogadores[indice_capitao]
         
-        # Montar resultado
-        time_result = {
+        return {
             'id': 'temp',
             'esquema': esquema,
             'orcamento': orcamento,
             'custo_total': sum(j.preco for j in time_selecionado),
-            'pontos_previstos': sum(j.pontos_esperados for j in time_selecionado) + 
-                               (capitao.pontos_esperados if capitao else 0),
+            'pontos_previstos': sum(j.pontos_esperados for j in time_selecionado) +
+                               capitao.pontos_esperados,
             'estrategia': estrategia,
             'jogadores': [
                 {
@@ -192,7 +716,7 @@ class TeamOptimizer:
                         'clube': {'id': j.clube_id},
                         'preco': j.preco,
                     },
-                    'posicao_time': 'CAPITAO' if capitao and j.id == capitao.id else 'TITULAR',
+                    'posicao_time': 'CAPITAO' if j.id == capitao.id else 'TITULAR',
                     'preco_na_hora': j.preco,
                     'pontos_previstos': j.pontos_esperados,
                     'previsao': {
@@ -203,67 +727,122 @@ class TeamOptimizer:
                 for j in time_selecionado
             ]
         }
-        
-        # Gerar alternativas (simplificado)
-        alternativas = self._gerar_alternativas(
-            jogadores, orcamento, esquema, time_selecionado
-        )
-        
-        return {
-            'time': time_result,
-            'alternativas': alternativas
-        }
     
     def _gerar_alternativas(
         self,
         jogadores: List[JogadorPrevisao],
         orcamento: float,
         esquema: str,
-        time_principal: List[JogadorPrevisao],
-        n_alternativas: int = 2
+        estrategia: str,
+        time_principal: List[int],
+        n_alternativas: int = 2,
+        distancia_minima: int = 2
     ) -> List[Dict[str, Any]]:
         """
-        Gera alternativas de time variando alguns jogadores
+        Gera as melhores escalações seguintes à principal (top-K)
+        
+        Cada alternativa é uma nova resolução do mesmo modelo compilado com
+        um corte de diversidade por escalação já encontrada, exigindo pelo
+        menos `distancia_minima` jogadores diferentes de cada uma. As
+        primeiras `margem_poda` alternativas saem do modelo podado; as
+        seguintes, do modelo sem poda, compilado uma vez por pool.
         """
         alternativas = []
-        ids_principal = {j.id for j in time_principal}
+        escalacoes = self._proximas_escalacoes(
+            jogadores, orcamento, esquema, estrategia, time_principal,
+            n_alternativas, distancia_minima
+        )
+        for i, escalacao in enumerate(escalacoes):
+            alt = self._montar_time(jogadores, escalacao, orcamento, esquema, estrategia)
+            alt['id'] = f'alt_{i}'
+            alternativas.append(alt)
         
-        # Estratégias diferentes para alternativas
-        estrategias_alt = ['SEGURO', 'OUSADO']
+        return alternativas
+    
+    def _proximas_escalacoes(
+        self,
+        jogadores: List[JogadorPrevisao],
+        orcamento: float,
+        esquema: str,
+        estrategia: str,
+        time_principal: List[int],
+        n: int,
+        distancia_minima: int
+    ) -> List[Escalacao]:
+        """Até `n` escalações seguintes à principal, com cortes de diversidade"""
+        escalacoes = []
+        formacao = self.FORMACOES[esquema]
+        cortes = [time_principal]
         
-        for i, estrategia in enumerate(estrategias_alt[:n_alternativas]):
+        for i in range(n):
             try:
-                # Excluir alguns jogadores do time principal para forçar variação
-                jogadores_excluidos = list(ids_principal)[i*2:(i+1)*2]
-                jogadores_disponiveis = [
-                    j for j in jogadores 
-                    if j.id not in jogadores_excluidos
-                ]
-                
-                # Criar nova otimização
-                result = self.optimize(
-                    [{'jogador': {
-                        'id': j.id,
-                        'nome': j.nome,
-                        'apelido': j.apelido,
-                        'posicao': j.posicao,
-                        'clubeId': j.clube_id,
-                        'preco': j.preco,
-                        'status': j.status,
-                    },
-                    'pontosEsperados': j.pontos_esperados,
-                    'desvioPadrao': j.desvio_padrao} for j in jogadores_disponiveis],
-                    orcamento,
-                    esquema,
-                    estrategia
+                escalacao = self._escalar(
+                    jogadores, orcamento, formacao, estrategia, cortes, distancia_minima
                 )
-                
-                alt = result['time']
-                alt['id'] = f'alt_{i}'
-                alternativas.append(alt)
-                
-            except Exception as e:
-                logger.warning(f"Erro ao gerar alternativa {i}: {e}")
-                continue
+            except TimeoutError:
+                logger.warning(f"Tempo limite ao gerar a alternativa {i}")
+                break
+            if escalacao is None:
+                logger.info(f"Sem alternativa viável além de {len(escalacoes)}")
+                break
+            
+            escalacoes.append(escalacao)
+            cortes.append(escalacao[0])
         
-        return alternativas
+        return escalacoes
+    
+    def _simular(
+        self,
+        jogadores: List[JogadorPrevisao],
+        orcamento: float,
+        esquema: str,
+        estrategia: str,
+        escalacao: Escalacao,
+        n_alternativas: int,
+        distancia_minima: int,
+        alvo: Optional[float]
+    ) -> Tuple[List[Escalacao], List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Reordena as melhores escalações do ILP pela simulação Monte Carlo
+        
+        O ILP gera as candidatas (a ótima e as seguintes, duas a duas a pelo
+        menos `distancia_minima` jogadores de distância) e a simulação as
+        ordena pelo critério da estratégia: o p10 no SEGURO, a média no
+        EQUILIBRADO e, no OUSADO, a probabilidade de superar `alvo` ou o p90.
+        
+        Returns:
+            Escalações e avaliações em ordem, e o resumo da simulação
+        """
+        n_candidatos = max(
+            int(os.getenv('SIMULATION_CANDIDATES', CANDIDATOS_SIMULACAO)), n_alternativas + 1
+        )
+        escalacoes = [escalacao] + self._proximas_escalacoes(
+            jogadores, orcamento, esquema, estrategia, escalacao[0],
+            n_candidatos - 1, distancia_minima
+        )
+        
+        simulador = LineupSimulator(
+            [j.pontos_esperados for j in jogadores],
+            [j.desvio_padrao for j in jogadores],
+            [j.clube_id for j in jogadores],
+        )
+        with instrumentation.etapa('optimize.simulacao'):
+            avaliacoes = simulador.evaluate(escalacoes, alvo)
+        
+        criterio = CRITERIO_SIMULACAO.get(estrategia, 'media')
+        if estrategia == 'OUSADO' and alvo is not None:
+            criterio = 'prob_alvo'
+        # Ordenação estável: empates mantêm a ordem do ILP
+        ordem = sorted(range(len(escalacoes)), key=lambda k: -avaliacoes[k][criterio])
+        
+        resumo = {
+            'criterio': criterio,
+            'alvo': alvo,
+            'n_cenarios': simulador.n_cenarios,
+            'correlacao_clube': simulador.correlacao_clube,
+            'candidatas_avaliadas': len(escalacoes),
+            # Posição da escalação escolhida na ordem do ILP (0 = ótima)
+            'posicao_ilp': ordem[0],
+        }
+        
+        return [escalacoes[k] for k in ordem], [avaliacoes[k] for k in ordem], resumo
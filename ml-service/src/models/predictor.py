@@ -2,20 +2,97 @@
 Modelo de predição de pontuação do Cartola FC usando XGBoost
 """
 
+import os
+import json
+import time
 import logging
 import pickle
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import xgboost as xgb
 
+from .. import instrumentation
+
 logger = logging.getLogger(__name__)
 
+# Quantis previstos pelo modelo de incerteza: p2.5/p97.5 delimitam o
+# intervalo de 95% e p10/p90 dão o desvio padrão
+QUANTIS = (0.025, 0.1, 0.9, 0.975)
+Q_INFERIOR, Q_P10, Q_P90, Q_SUPERIOR = range(len(QUANTIS))
+
+# Escore z do quantil 0.9: (p90 - p10) / (2 * Z_P90) estima o desvio padrão
+Z_P90 = 1.2816
+
+# Parâmetros dos modelos da validação temporal
+FOLD_PARAMS = {
+    'max_depth': 6,
+    'learning_rate': 0.1,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'seed': 42,
+    'objective': 'reg:squarederror',
+    'tree_method': 'hist',
+}
+FOLD_ROUNDS = 100
+N_SPLITS = 5
+
+# Callback de progresso do treinamento: (fase, detalhes)
+Progresso = Callable[[str, Dict[str, Any]], None]
+
+# Árvores adicionadas a cada atualização incremental (e sua taxa de aprendizado)
+INCREMENTAL_ESTIMATORS = 30
+INCREMENTAL_LEARNING_RATE = 0.03
+
+# Artefato nativo: diretório com os boosters em UBJSON, os parâmetros do
+# scaler em .npz e um meta.json com métricas e hiperparâmetros
+FORMATO_ARTEFATO = 1
+ARTEFATO_META = 'meta.json'
+ARTEFATO_SCALER = 'scaler.npz'
+ARTEFATO_MODELOS = {
+    'model': 'model.ubj',
+    'quantile_model': 'quantile_model.ubj',
+}
+
+
+def _params_json(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Hiperparâmetros do XGBRegressor em formato serializável"""
+    serializaveis = {}
+    for chave, valor in params.items():
+        if valor is None or callable(valor):
+            continue
+        if isinstance(valor, float) and np.isnan(valor):
+            continue
+        if isinstance(valor, np.ndarray):
+            valor = valor.tolist()
+        serializaveis[chave] = valor
+    return serializaveis
+
+
+def colunas_para_registros(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Converte o resultado de `predict_columnar` em uma lista de dicionários"""
+    # tolist converte para tipos Python de uma vez
+    keys = list(columns.keys())
+    return [
+        dict(zip(keys, row))
+        for row in zip(*(columns[k].tolist() for k in keys))
+    ]
+
+
+def _codificar(serie: pd.Series, mapa: Dict[str, int]) -> np.ndarray:
+    """Códigos de uma coluna categórica; valores fora do mapa viram 0"""
+    codigos = pd.Categorical(serie, categories=list(mapa)).codes
+    valores = np.append(np.fromiter(mapa.values(), dtype=np.float64, count=len(mapa)), 0)
+    # Código -1 (ausente ou desconhecido) indexa o 0 do final
+    return valores[codigos]
+
 
 class CartolaPredictor:
     """
@@ -23,7 +100,11 @@ class CartolaPredictor:
     """
     
     def __init__(self):
-        self.model: Optional[xgb.XGBRegressor] = None
+        self._model: Optional[xgb.XGBRegressor] = None
+        self._quantile_model: Optional[xgb.XGBRegressor] = None
+        # Boosters ainda não lidos do artefato: nome -> (arquivo, parâmetros)
+        self._pendentes: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._carga_lock = threading.Lock()
         self.scaler = StandardScaler()
         self.is_fitted = False
         self.metrics: Dict[str, Any] = {}
@@ -61,48 +142,158 @@ class CartolaPredictor:
             'NULO': 4,
         }
     
+    @property
+    def model(self) -> Optional[xgb.XGBRegressor]:
+        return self._booster('model')
+    
+    @model.setter
+    def model(self, valor: Optional[xgb.XGBRegressor]) -> None:
+        self._pendentes.pop('model', None)
+        self._model = valor
+    
+    @property
+    def quantile_model(self) -> Optional[xgb.XGBRegressor]:
+        return self._booster('quantile_model')
+    
+    @quantile_model.setter
+    def quantile_model(self, valor: Optional[xgb.XGBRegressor]) -> None:
+        self._pendentes.pop('quantile_model', None)
+        self._quantile_model = valor
+    
+    def _booster(self, nome: str) -> Optional[xgb.XGBRegressor]:
+        """Lê o booster do artefato no primeiro uso"""
+        if nome in self._pendentes:
+            with self._carga_lock:
+                if nome in self._pendentes:
+                    arquivo, params = self._pendentes[nome]
+                    modelo = xgb.XGBRegressor(**params)
+                    modelo.load_model(arquivo)
+                    setattr(self, f'_{nome}', modelo)
+                    del self._pendentes[nome]
+        return getattr(self, f'_{nome}')
+    
     def _preprocess_features(self, df: pd.DataFrame, fit: bool = False) -> np.ndarray:
         """
         Preprocessa as features para o modelo
-        """
-        # Criar cópia para não modificar original
-        data = df.copy()
         
-        # Mapear categorias
-        data['posicao'] = data['posicao'].map(self.posicao_map).fillna(0)
-        data['status'] = data['status'].map(self.status_map).fillna(0)
+        Lê só as colunas usadas, uma a uma, e grava cada coluna já
+        padronizada numa matriz float32 contígua, o tipo com que o XGBoost
+        trabalha. A padronização é feita em float64, como no
+        `StandardScaler.transform`, então a matriz é a mesma que a conversão
+        do XGBoost produziria a partir da saída do scaler.
+        """
+        colunas = self.feature_columns + self.categorical_columns
         
-        # Garantir que todas as colunas existam
-        for col in self.feature_columns:
-            if col not in data.columns:
-                data[col] = 0
+        if fit:
+            # O treino ajusta o scaler na matriz completa antes da passada
+            self.scaler.fit(np.column_stack([self._coluna(df, col) for col in colunas]))
         
-        # Selecionar features
-        features = data[self.feature_columns + self.categorical_columns].values
+        media = self.scaler.mean_
+        escala = self.scaler.scale_
         
-        # Normalizar
-        if fit:
-            features = self.scaler.fit_transform(features)
-        else:
-            features = self.scaler.transform(features)
+        features = np.empty((len(df), len(colunas)), dtype=np.float32)
+        coluna = np.empty(len(df), dtype=np.float64)
+        for i, col in enumerate(colunas):
+            coluna[:] = self._coluna(df, col)
+            coluna -= media[i]
+            coluna /= escala[i]
+            features[:, i] = coluna
         
         return features
     
+    def _coluna(self, df: pd.DataFrame, col: str) -> np.ndarray:
+        """Valores numéricos de uma feature (0 se a coluna não existir)"""
+        if col == 'posicao':
+            return _codificar(df[col], self.posicao_map)
+        if col == 'status':
+            return _codificar(df[col], self.status_map)
+        if col not in df.columns:
+            return np.zeros(len(df))
+        return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    @staticmethod
+    def _train_fold(
+        fold: int,
+        X: np.ndarray,
+        y: np.ndarray,
+        train_idx: np.ndarray,
+        val_idx: np.ndarray,
+        referencia: xgb.QuantileDMatrix,
+        nthread: int,
+        early_stopping_rounds: Optional[int],
+        progresso: Optional[Progresso] = None
+    ) -> Dict[str, float]:
+        """Treina e avalia um fold da validação temporal"""
+        inicio = time.perf_counter()
+        
+        # Os folds reaproveitam os cortes de histograma da matriz de referência
+        dtrain = xgb.QuantileDMatrix(X[train_idx], y[train_idx], ref=referencia, nthread=nthread)
+        dval = xgb.QuantileDMatrix(X[val_idx], y[val_idx], ref=referencia, nthread=nthread)
+        
+        booster = xgb.train(
+            {**FOLD_PARAMS, 'nthread': nthread},
+            dtrain,
+            num_boost_round=FOLD_ROUNDS,
+            evals=[(dval, 'val')],
+            early_stopping_rounds=early_stopping_rounds,
+            verbose_eval=False,
+        )
+        
+        # Avaliar
+        melhor_iteracao = getattr(booster, 'best_iteration', FOLD_ROUNDS - 1)
+        y_val = y[val_idx]
+        y_pred = booster.predict(dval, iteration_range=(0, melhor_iteracao + 1))
+        
+        resultado = {
+            'mae': mean_absolute_error(y_val, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y_val, y_pred)),
+            'melhor_iteracao': melhor_iteracao,
+            'tempo_s': time.perf_counter() - inicio,
+        }
+        
+        logger.info(
+            f"Fold {fold}: MAE {resultado['mae']:.4f}, "
+            f"{melhor_iteracao + 1} árvores, {resultado['tempo_s']:.2f}s"
+        )
+        if progresso:
+            progresso('fold', {'fold': fold, **resultado})
+        
+        return resultado
+    
     def train(
         self,
         data: pd.DataFrame,
-        retrain: bool = False
+        retrain: bool = False,
+        folds_paralelos: Optional[int] = None,
+        threads_por_fold: Optional[int] = None,
+        early_stopping_rounds: Optional[int] = 20,
+        progresso: Optional[Progresso] = None
     ) -> Dict[str, float]:
         """
         Treina o modelo com dados históricos
         
+        Sem `retrain`, um modelo já treinado é atualizado de forma
+        incremental apenas com as rodadas posteriores à última vista; o
+        treino completo (validação temporal + modelo final) fica para
+        `retrain=True` ou quando ainda não há modelo.
+        
         Args:
             data: DataFrame com features e target (pontos)
             retrain: Se True, ignora modelo anterior e treina do zero
+            folds_paralelos: Folds da validação treinados ao mesmo tempo
+                (padrão: min(5, núcleos))
+            threads_por_fold: Threads do XGBoost por fold (padrão: núcleos
+                divididos entre os folds paralelos)
+            early_stopping_rounds: Rodadas sem melhora no fold de validação
+                até parar (None desativa)
+            progresso: Callback chamado a cada fase (e a cada fold concluído)
         
         Returns:
             Dicionário com métricas de treinamento
         """
+        if not retrain and self.is_fitted and self.ultima_rodada is not None:
+            return self._train_incremental(data, progresso)
+        
         logger.info(f"Iniciando treinamento com {len(data)} amostras...")
         
         if len(data) < 100:
@@ -115,40 +306,33 @@ class CartolaPredictor:
         X = self._preprocess_features(data, fit=True)
         y = data['pontos'].values
         
-        # Validação temporal (Time Series Split)
-        tscv = TimeSeriesSplit(n_splits=5)
-        
-        mae_scores = []
-        rmse_scores = []
-        
-        for train_idx, val_idx in tscv.split(X):
-            X_train, X_val = X[train_idx], X[val_idx]
-            y_train, y_val = y[train_idx], y[val_idx]
-            
-            # Criar modelo
-            model = xgb.XGBRegressor(
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                random_state=42,
-                objective='reg:squarederror',
-            )
-            
-            # Treinar
-            model.fit(
-                X_train, y_train,
-                eval_set=[(X_val, y_val)],
-                verbose=False
+        # Orçamento de threads: folds paralelos x threads por fold = núcleos
+        nucleos = os.cpu_count() or 1
+        folds_paralelos = folds_paralelos or min(N_SPLITS, nucleos)
+        threads_por_fold = threads_por_fold or max(1, nucleos // folds_paralelos)
+        
+        # Validação temporal (Time Series Split), folds em paralelo. O
+        # XGBoost libera o GIL durante o treino, então threads bastam e
+        # compartilham a matriz de referência sem cópia
+        tscv = TimeSeriesSplit(n_splits=N_SPLITS)
+        referencia = xgb.QuantileDMatrix(X, nthread=nucleos)
+        if progresso:
+            progresso('validacao', {'total_folds': N_SPLITS})
+        
+        folds = Parallel(n_jobs=folds_paralelos, prefer='threads')(
+            delayed(self._train_fold)(
+                fold, X, y, train_idx, val_idx, referencia,
+                threads_por_fold, early_stopping_rounds, progresso
             )
-            
-            # Avaliar
-            y_pred = model.predict(X_val)
-            mae_scores.append(mean_absolute_error(y_val, y_pred))
-            rmse_scores.append(np.sqrt(mean_squared_error(y_val, y_pred)))
+            for fold, (train_idx, val_idx) in enumerate(tscv.split(X))
+        )
+        
+        mae_scores = [f['mae'] for f in folds]
+        rmse_scores = [f['rmse'] for f in folds]
         
         # Treinar modelo final com todos os dados
+        if progresso:
+            progresso('modelo_final', {})
         self.model = xgb.XGBRegressor(
             n_estimators=200,
             max_depth=8,
@@ -157,21 +341,52 @@ class CartolaPredictor:
             colsample_bytree=0.9,
             random_state=42,
             objective='reg:squarederror',
+            tree_method='hist',
+            n_jobs=nucleos,
         )
         
         self.model.fit(X, y, verbose=False)
+        
+        # Modelo de quantis para a incerteza das previsões
+        if progresso:
+            progresso('modelo_quantis', {})
+        self.quantile_model = xgb.XGBRegressor(
+            n_estimators=200,
+            max_depth=6,
+            learning_rate=0.05,
+            subsample=0.9,
+            colsample_bytree=0.9,
+            random_state=42,
+            objective='reg:quantileerror',
+            quantile_alpha=np.array(QUANTIS),
+            tree_method='hist',
+            n_jobs=nucleos,
+        )
+        self.quantile_model.fit(X, y, verbose=False)
         self.is_fitted = True
         
         # Calcular métricas finais
         y_pred_final = self.model.predict(X)
+        quantis = np.sort(self.quantile_model.predict(X), axis=1)
         
         self.metrics = {
             'mae': float(np.mean(mae_scores)),
             'rmse': float(np.mean(rmse_scores)),
             'mae_final': float(mean_absolute_error(y, y_pred_final)),
             'rmse_final': float(np.sqrt(mean_squared_error(y, y_pred_final))),
-            'versao': datetime.now().isoformat(),
+            'cobertura_p10_p90': float(np.mean(
+                (y >= quantis[:, Q_P10]) & (y <= quantis[:, Q_P90])
+            )),
+            'cobertura_intervalo': float(np.mean(
+                (y >= quantis[:, Q_INFERIOR]) & (y <= quantis[:, Q_SUPERIOR])
+            )),
+            'treinado_em': datetime.now().isoformat(),
             'total_amostras': len(data),
+            'primeira_rodada': int(data['rodada_numero'].min()),
+            'ultima_rodada': int(data['rodada_numero'].max()),
+            'treinos_incrementais': 0,
+            'tempo_folds_s': [float(f['tempo_s']) for f in folds],
+            'arvores_folds': [int(f['melhor_iteracao']) + 1 for f in folds],
         }
         
         # Importância das features
@@ -185,73 +400,235 @@ class CartolaPredictor:
         
         return self.metrics
     
-    def predict(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _train_incremental(
+        self,
+        data: pd.DataFrame,
+        progresso: Optional[Progresso] = None
+    ) -> Dict[str, float]:
         """
-        Faz predições para uma lista de jogadores
+        Continua o boosting dos modelos atuais com as rodadas novas
+        
+        O scaler não é reajustado: os limiares das árvores existentes estão
+        na escala em que foram treinadas, e mudá-la invalidaria o modelo.
+        """
+        novos = data[data['rodada_numero'] > self.ultima_rodada].sort_values('rodada_numero')
+        
+        if novos.empty:
+            logger.info(f"Nenhuma rodada após a {self.ultima_rodada}; modelo mantido")
+            return self.metrics
+        
+        logger.info(
+            f"Treinamento incremental com {len(novos)} amostras "
+            f"(rodadas {novos['rodada_numero'].min()}-{novos['rodada_numero'].max()})..."
+        )
+        
+        if progresso:
+            progresso('incremental', {'amostras': len(novos)})
+        
+        X = self._preprocess_features(novos, fit=False)
+        y = novos['pontos'].values
+        
+        # Erro nas rodadas novas antes de vê-las (validação fora da amostra)
+        y_pred = self.model.predict(X)
+        
+        def continuar(model: xgb.XGBRegressor) -> xgb.XGBRegressor:
+            params = model.get_params()
+            params.update(
+                n_estimators=INCREMENTAL_ESTIMATORS,
+                learning_rate=INCREMENTAL_LEARNING_RATE,
+            )
+            novo = xgb.XGBRegressor(**params)
+            novo.fit(X, y, xgb_model=model.get_booster(), verbose=False)
+            return novo
+        
+        self.model = continuar(self.model)
+        if self.quantile_model is not None:
+            self.quantile_model = continuar(self.quantile_model)
+        
+        self.metrics.update({
+            'mae_rodadas_novas': float(mean_absolute_error(y, y_pred)),
+            'rmse_rodadas_novas': float(np.sqrt(mean_squared_error(y, y_pred))),
+            'treinado_em': datetime.now().isoformat(),
+            'total_amostras': self.metrics.get('total_amostras', 0) + len(novos),
+            'ultima_rodada': int(novos['rodada_numero'].max()),
+            'treinos_incrementais': self.metrics.get('treinos_incrementais', 0) + 1,
+        })
+        
+        logger.info(
+            f"Treinamento incremental concluído! "
+            f"MAE nas rodadas novas: {self.metrics['mae_rodadas_novas']:.4f}"
+        )
+        
+        return self.metrics
+    
+    def predict_columnar(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Faz predições retornando um array por campo
         
         Args:
             data: DataFrame com features dos jogadores
         
         Returns:
-            Lista de dicionários com predições
+            Dicionário campo -> array, alinhado com as linhas de `data`
         """
         if not self.is_fitted or self.model is None:
             raise RuntimeError("Modelo não está treinado")
         
+        instrumentation.observar_linhas('predict.modelo', len(data))
+        
         # Preprocessar
-        X = self._preprocess_features(data, fit=False)
+        with instrumentation.etapa('predict.preprocess'):
+            X = self._preprocess_features(data, fit=False)
         
         # Predizer
-        predictions = self.model.predict(X)
-        
-        # Calcular intervalo de confiança (aproximação usando std dos vizinhos)
-        # Em produção, usar métodos mais sofisticados como Quantile Regression
-        leaf_indices = self.model.apply(X)
-        std_predictions = np.std(leaf_indices, axis=1) * 0.5  # Simplificação
-        
-        # Montar resultado
-        results = []
-        for i, (pred, std) in enumerate(zip(predictions, std_predictions)):
-            jogador_id = data.iloc[i]['jogador_id']
-            results.append({
-                'jogador_id': str(jogador_id),
-                'pontos_esperados': float(max(0, pred)),
-                'desvio_padrao': float(std),
-                'intervalo_inferior': float(max(0, pred - 1.96 * std)),
-                'intervalo_superior': float(max(0, pred + 1.96 * std)),
-            })
-        
-        return results
+        with instrumentation.etapa('predict.inferencia'):
+            predictions = self.model.predict(X)
+        
+        pontos = np.maximum(predictions, 0)
+        
+        # Intervalo de 95% direto dos quantis p2.5/p97.5, sem corte em zero
+        # (há pontuações negativas) e alargado para conter a previsão pontual;
+        # o desvio padrão é derivado de p10/p90.
+        # Sem modelo de quantis, como no pickle legado, volta à aproximação
+        # normal com o RMSE da validação.
+        if self.quantile_model is not None:
+            with instrumentation.etapa('predict.incerteza'):
+                quantis = np.sort(self.quantile_model.predict(X), axis=1)
+            std_predictions = (quantis[:, Q_P90] - quantis[:, Q_P10]) / (2 * Z_P90)
+            inferior = np.minimum(quantis[:, Q_INFERIOR], pontos)
+            superior = np.maximum(quantis[:, Q_SUPERIOR], pontos)
+        else:
+            std_predictions = np.full(len(predictions), self.metrics.get('rmse', 2.0))
+            inferior = np.maximum(predictions - 1.96 * std_predictions, 0)
+            superior = np.maximum(predictions + 1.96 * std_predictions, 0)
+        
+        return {
+            'jogador_id': data['jogador_id'].astype(str).to_numpy(),
+            'pontos_esperados': pontos,
+            'desvio_padrao': std_predictions,
+            'intervalo_inferior': inferior,
+            'intervalo_superior': superior,
+        }
+    
+    def predict(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Faz predições para uma lista de jogadores
+        
+        Args:
+            data: DataFrame com features dos jogadores
+        
+        Returns:
+            Lista de dicionários com predições
+        """
+        return colunas_para_registros(self.predict_columnar(data))
     
     def save_model(self, path: str) -> None:
-        """Salva o modelo em disco"""
+        """
+        Salva o modelo em disco no formato nativo
+        
+        Args:
+            path: Diretório do artefato (criado se não existir)
+        """
         if not self.is_fitted:
             raise RuntimeError("Modelo não está treinado")
         
-        model_data = {
-            'model': self.model,
-            'scaler': self.scaler,
+        os.makedirs(path, exist_ok=True)
+        
+        params = {}
+        for nome, arquivo in ARTEFATO_MODELOS.items():
+            modelo = getattr(self, nome)
+            if modelo is None:
+                continue
+            modelo.save_model(os.path.join(path, arquivo))
+            params[nome] = _params_json(modelo.get_params())
+        
+        np.savez(
+            os.path.join(path, ARTEFATO_SCALER),
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            var=self.scaler.var_,
+            n_samples_seen=self.scaler.n_samples_seen_,
+        )
+        
+        meta = {
+            'formato': FORMATO_ARTEFATO,
+            'xgboost': xgb.__version__,
+            'params': params,
             'metrics': self.metrics,
             'feature_columns': self.feature_columns,
         }
-        
-        with open(path, 'wb') as f:
-            pickle.dump(model_data, f)
+        with open(os.path.join(path, ARTEFATO_META), 'w') as f:
+            json.dump(meta, f)
         
         logger.info(f"Modelo salvo em {path}")
     
-    def load_model(self, path: str) -> None:
-        """Carrega o modelo do disco"""
+    def load_model(self, path: str, lazy: bool = True) -> None:
+        """
+        Carrega o modelo do disco
+        
+        Args:
+            path: Diretório do artefato nativo ou arquivo .pkl legado
+            lazy: Adia a leitura dos boosters até o primeiro uso, para que
+                o serviço (e cada worker) suba sem esperar o modelo
+        """
+        if not os.path.isdir(path):
+            self._load_pickle(path)
+            return
+        
+        with open(os.path.join(path, ARTEFATO_META)) as f:
+            meta = json.load(f)
+        
+        if meta.get('formato') != FORMATO_ARTEFATO:
+            raise ValueError(f"Formato de artefato não suportado: {meta.get('formato')}")
+        
+        with np.load(os.path.join(path, ARTEFATO_SCALER)) as blob:
+            scaler = StandardScaler()
+            scaler.mean_ = blob['mean']
+            scaler.scale_ = blob['scale']
+            scaler.var_ = blob['var']
+            scaler.n_samples_seen_ = blob['n_samples_seen']
+            scaler.n_features_in_ = len(scaler.mean_)
+        
+        self._model = None
+        self._quantile_model = None
+        self._pendentes = {
+            nome: (os.path.join(path, ARTEFATO_MODELOS[nome]), params)
+            for nome, params in meta['params'].items()
+        }
+        self.scaler = scaler
+        self.metrics = meta.get('metrics', {})
+        self.feature_columns = meta.get('feature_columns', self.feature_columns)
+        self.is_fitted = True
+        
+        if not lazy:
+            for nome in list(self._pendentes):
+                self._booster(nome)
+        
+        logger.info(f"Modelo carregado de {path}")
+    
+    def _load_pickle(self, path: str) -> None:
+        """Carrega um artefato legado (pickle do modelo inteiro)"""
         with open(path, 'rb') as f:
             model_data = pickle.load(f)
         
         self.model = model_data['model']
+        self.quantile_model = model_data.get('quantile_model')
         self.scaler = model_data['scaler']
         self.metrics = model_data.get('metrics', {})
         self.feature_columns = model_data.get('feature_columns', self.feature_columns)
         self.is_fitted = True
         
-        logger.info(f"Modelo carregado de {path}")
+        logger.info(f"Modelo legado carregado de {path}")
+    
+    @property
+    def ultima_rodada(self) -> Optional[int]:
+        """Última rodada vista pelo modelo (None se treinado antes do controle)"""
+        return self.metrics.get('ultima_rodada')
+    
+    @property
+    def versao(self) -> str:
+        """Versão do modelo carregado, gravada junto com as previsões"""
+        return self.metrics.get('versao', '1.0.0')
     
     def get_metrics(self) -> Dict[str, Any]:
         """Retorna métricas do modelo"""
@@ -263,6 +640,6 @@ class CartolaPredictor:
             'acuracia_top10': self.metrics.get('acuracia_top10', 0),
             'acuracia_top50': self.metrics.get('acuracia_top50', 0),
             'versao': self.metrics.get('versao', 'N/A'),
-            'ultimo_treinamento': self.metrics.get('versao'),
+            'ultimo_treinamento': self.metrics.get('treinado_em'),
             'total_amostras': self.metrics.get('total_amostras', 0),
         }
@@ -0,0 +1,205 @@
+"""
+Registro de versões do modelo
+
+Cada treino gera uma versão imutável em MODEL_PATH/registry/<versao>/, com o
+artefato e um metadata.json (métricas, features, rodadas, data de criação).
+A versão servida é apontada pelo arquivo ACTIVE, e o histórico de ativações
+permite rollback.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from .predictor import CartolaPredictor
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = 'model'
+METADATA_FILE = 'metadata.json'
+
+# Artefato único usado antes do registro
+LEGACY_FILE = 'cartola_model.pkl'
+
+
+def _escrever_atomico(path: str, conteudo: str) -> None:
+    """Escreve em arquivo temporário e renomeia por cima do destino"""
+    tmp = f'{path}.{uuid.uuid4().hex[:8]}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """
+    Registro de modelos versionados em disco
+    
+    Layout:
+        <base>/registry/<versao>/model/   artefato nativo do predictor
+        <base>/registry/<versao>/metadata.json
+        <base>/ACTIVE              versão servida
+        <base>/ativacoes.json      histórico de ativações (para rollback)
+    """
+    
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.registry_path = os.path.join(base_path, 'registry')
+        self._active_file = os.path.join(base_path, 'ACTIVE')
+        self._history_file = os.path.join(base_path, 'ativacoes.json')
+        
+        os.makedirs(self.registry_path, exist_ok=True)
+        self._limpar_temporarios()
+    
+    def _limpar_temporarios(self) -> None:
+        """Remove versões pela metade deixadas por treinos interrompidos"""
+        for nome in os.listdir(self.registry_path):
+            if nome.startswith('.tmp-'):
+                shutil.rmtree(os.path.join(self.registry_path, nome), ignore_errors=True)
+    
+    def _version_path(self, versao: str) -> str:
+        return os.path.join(self.registry_path, versao)
+    
+    def exists(self, versao: str) -> bool:
+        return os.path.isfile(os.path.join(self._version_path(versao), METADATA_FILE))
+    
+    def save(self, predictor: CartolaPredictor, base: Optional[str] = None) -> str:
+        """
+        Registra o modelo como nova versão (sem ativá-la)
+        
+        O artefato é escrito em um diretório temporário e renomeado de uma
+        vez, então uma versão visível no registro está sempre completa.
+        
+        Args:
+            predictor: Modelo treinado
+            base: Versão de onde o treino incremental partiu, se houver
+        
+        Returns:
+            Id da nova versão
+        """
+        agora = datetime.now()
+        versao = f"v{agora.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        predictor.metrics['versao'] = versao
+        
+        tmp_path = os.path.join(self.registry_path, f'.tmp-{versao}')
+        os.makedirs(tmp_path)
+        
+        predictor.save_model(os.path.join(tmp_path, ARTIFACT_DIR))
+        
+        metrics = predictor.metrics
+        metadata = {
+            'versao': versao,
+            'created_at': agora.isoformat(),
+            'base': base,
+            'metrics': {k: v for k, v in metrics.items() if k != 'feature_importance'},
+            'feature_columns': predictor.feature_columns,
+            'rodadas': [metrics.get('primeira_rodada'), metrics.get('ultima_rodada')],
+        }
+        with open(os.path.join(tmp_path, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+        
+        os.rename(tmp_path, self._version_path(versao))
+        
+        logger.info(f"Modelo registrado: {versao}")
+        
+        return versao
+    
+    def load(self, versao: str, lazy: bool = True) -> CartolaPredictor:
+        """Carrega uma versão registrada"""
+        if not self.exists(versao):
+            raise KeyError(f"Versão não encontrada: {versao}")
+        
+        artefato = os.path.join(self._version_path(versao), ARTIFACT_DIR)
+        
+        predictor = CartolaPredictor()
+        predictor.load_model(artefato, lazy=lazy)
+        predictor.metrics['versao'] = versao
+        
+        return predictor
+    
+    def metadata(self, versao: str) -> Dict[str, Any]:
+        with open(os.path.join(self._version_path(versao), METADATA_FILE)) as f:
+            return json.load(f)
+    
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """Metadados de todas as versões, da mais recente para a mais antiga"""
+        ativa = self.active_version()
+        versoes = []
+        for nome in sorted(os.listdir(self.registry_path), reverse=True):
+            if not nome.startswith('.') and self.exists(nome):
+                metadata = self.metadata(nome)
+                metadata['ativa'] = nome == ativa
+                versoes.append(metadata)
+        return versoes
+    
+    def active_version(self) -> Optional[str]:
+        if not os.path.exists(self._active_file):
+            return None
+        with open(self._active_file) as f:
+            return f.read().strip() or None
+    
+    def _historico(self) -> List[str]:
+        if not os.path.exists(self._history_file):
+            return []
+        with open(self._history_file) as f:
+            return json.load(f)
+    
+    def activate(self, versao: str, _registrar_historico: bool = True) -> None:
+        """Aponta ACTIVE para a versão (troca atômica do ponteiro)"""
+        if not self.exists(versao):
+            raise KeyError(f"Versão não encontrada: {versao}")
+        
+        if _registrar_historico:
+            historico = self._historico()
+            if not historico or historico[-1] != versao:
+                historico.append(versao)
+                _escrever_atomico(self._history_file, json.dumps(historico))
+        
+        _escrever_atomico(self._active_file, versao)
+        
+        logger.info(f"Versão ativa: {versao}")
+    
+    def previous_version(self) -> Optional[str]:
+        """Versão ativa antes da atual, alvo de um rollback"""
+        historico = self._historico()
+        return historico[-2] if len(historico) > 1 else None
+    
+    def rollback(self) -> str:
+        """
+        Volta para a versão ativada antes da atual
+        
+        Returns:
+            Versão reativada
+        """
+        historico = self._historico()
+        if len(historico) < 2:
+            raise ValueError("Não há versão anterior para rollback")
+        
+        historico.pop()
+        anterior = historico[-1]
+        self.activate(anterior, _registrar_historico=False)
+        _escrever_atomico(self._history_file, json.dumps(historico))
+        
+        return anterior
+    
+    def import_legacy(self) -> Optional[str]:
+        """
+        Registra e ativa o antigo cartola_model.pkl, se o registro está vazio
+        """
+        legacy = os.path.join(self.base_path, LEGACY_FILE)
+        if self.active_version() or not os.path.exists(legacy):
+            return None
+        
+        predictor = CartolaPredictor()
+        predictor.load_model(legacy)
+        versao = self.save(predictor)
+        self.activate(versao)
+        
+        logger.info(f"Modelo legado {LEGACY_FILE} importado como {versao}")
+        
+        return versao
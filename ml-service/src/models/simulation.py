@@ -0,0 +1,136 @@
+"""
+Simulação Monte Carlo de escalações do Cartola FC
+
+Sorteia pontuações conjuntas dos jogadores em milhares de cenários e avalia
+escalações candidatas pela distribuição da pontuação total (média, quantis
+e probabilidade de superar um alvo), com o capitão contando em dobro.
+
+Cada jogador pontua mu + sigma * (sqrt(rho) * Z_clube + sqrt(1 - rho) * e):
+jogadores do mesmo clube compartilham o fator Z_clube, então companheiros
+de time vão bem ou mal juntos com correlação rho. Como o total de uma
+escalação é linear nos sorteios, ele sai de produtos de matrizes sobre os
+fatores, sem montar a matriz cenários x jogadores das pontuações.
+"""
+
+import os
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Cenários sorteados por bloco (limita a memória dos sorteios)
+BLOCO_CENARIOS = 2048
+
+QUANTIS = (0.1, 0.5, 0.9)
+
+
+class LineupSimulator:
+    """
+    Avalia escalações por simulação de pontuações conjuntas
+    
+    Args:
+        pontos_esperados: Média prevista de cada jogador do pool
+        desvio_padrao: Desvio previsto de cada jogador do pool
+        clubes: Clube de cada jogador do pool
+        n_cenarios: Cenários sorteados (SIMULATION_SCENARIOS, padrão 10000)
+        correlacao_clube: Correlação entre jogadores do mesmo clube
+            (SIMULATION_CLUB_CORRELATION, padrão 0.2)
+        seed: Semente dos sorteios; a mesma entrada dá o mesmo resultado
+    """
+    
+    def __init__(
+        self,
+        pontos_esperados: Sequence[float],
+        desvio_padrao: Sequence[float],
+        clubes: Sequence[str],
+        n_cenarios: Optional[int] = None,
+        correlacao_clube: Optional[float] = None,
+        seed: int = 0
+    ):
+        self.pontos = np.asarray(pontos_esperados, dtype=np.float64)
+        self.desvio = np.asarray(desvio_padrao, dtype=np.float64)
+        self.n_cenarios = n_cenarios or int(os.getenv('SIMULATION_SCENARIOS', 10000))
+        self.correlacao_clube = (
+            correlacao_clube if correlacao_clube is not None
+            else float(os.getenv('SIMULATION_CLUB_CORRELATION', 0.2))
+        )
+        if not 0 <= self.correlacao_clube <= 1:
+            raise ValueError("correlacao_clube deve estar entre 0 e 1")
+        self.seed = seed
+        
+        nomes, self._clube = np.unique([str(c) for c in clubes], return_inverse=True)
+        self._n_clubes = len(nomes)
+    
+    def _pesos(self, escalacoes: Sequence[Tuple[Sequence[int], int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Jogadores envolvidos e matriz jogador x escalação de pesos (1
+        titular, 2 capitão)
+        """
+        envolvidos = np.unique(np.concatenate([
+            np.asarray(selecionados, dtype=int) for selecionados, _ in escalacoes
+        ]))
+        linha = {int(j): i for i, j in enumerate(envolvidos)}
+        
+        pesos = np.zeros((len(envolvidos), len(escalacoes)))
+        for k, (selecionados, capitao) in enumerate(escalacoes):
+            pesos[[linha[int(j)] for j in selecionados], k] = 1.0
+            pesos[linha[int(capitao)], k] += 1.0
+        
+        return envolvidos, pesos
+    
+    def simulate(self, escalacoes: Sequence[Tuple[Sequence[int], int]]) -> np.ndarray:
+        """
+        Pontuação total de cada escalação em cada cenário
+        
+        Args:
+            escalacoes: (índices dos escalados, índice do capitão) no pool
+        
+        Returns:
+            Matriz cenários x escalações (float32)
+        """
+        envolvidos, pesos = self._pesos(escalacoes)
+        
+        # total = media + sqrt(rho) * Z_clube @ A + sqrt(1 - rho) * E @ B
+        media = self.pontos[envolvidos] @ pesos
+        sigma_pesos = self.desvio[envolvidos, None] * pesos
+        por_clube = np.zeros((self._n_clubes, len(escalacoes)))
+        np.add.at(por_clube, self._clube[envolvidos], sigma_pesos)
+        a = (np.sqrt(self.correlacao_clube) * por_clube).astype(np.float32)
+        b = (np.sqrt(1 - self.correlacao_clube) * sigma_pesos).astype(np.float32)
+        
+        rng = np.random.default_rng(self.seed)
+        totais = np.empty((self.n_cenarios, len(escalacoes)), dtype=np.float32)
+        for inicio in range(0, self.n_cenarios, BLOCO_CENARIOS):
+            n = min(BLOCO_CENARIOS, self.n_cenarios - inicio)
+            bloco = totais[inicio:inicio + n]
+            np.matmul(rng.standard_normal((n, self._n_clubes), dtype=np.float32), a, out=bloco)
+            bloco += rng.standard_normal((n, len(envolvidos)), dtype=np.float32) @ b
+        totais += media.astype(np.float32)
+        
+        return totais
+    
+    def evaluate(
+        self,
+        escalacoes: Sequence[Tuple[Sequence[int], int]],
+        alvo: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Média, desvio, quantis p10/p50/p90 e probabilidade de superar `alvo`
+        da pontuação total de cada escalação
+        """
+        totais = self.simulate(escalacoes)
+        quantis = np.quantile(totais, QUANTIS, axis=0)
+        medias = totais.mean(axis=0, dtype=np.float64)
+        desvios = totais.std(axis=0, dtype=np.float64)
+        probs = (totais > alvo).mean(axis=0) if alvo is not None else None
+        
+        return [
+            {
+                'media': float(medias[k]),
+                'desvio_padrao': float(desvios[k]),
+                'p10': float(quantis[0, k]),
+                'p50': float(quantis[1, k]),
+                'p90': float(quantis[2, k]),
+                'prob_alvo': float(probs[k]) if probs is not None else None,
+            }
+            for k in range(len(escalacoes))
+        ]
@@ -0,0 +1,301 @@
+"""
+Cache de resultados do /optimize
+
+Pedidos idênticos (mesmas previsões, orçamento, esquema, estratégia e
+exclusões) devolvem o resultado já calculado em vez de resolver o ILP de
+novo. Há dois níveis: um LRU em memória, por processo, e o Redis, compartilhado
+entre as instâncias do serviço. Sem REDIS_URL (ou com o Redis fora do ar) o
+cache funciona só em memória.
+
+As previsões entram na chave pela sua assinatura (hash do conteúdo), então
+previsões novas nunca reaproveitam um resultado antigo. No Redis cada
+resultado tem sua chave e seu TTL, agrupadas pelo prefixo da rodada; a
+invalidação por rodada, chamada quando o batch-predict salva previsões,
+descarta pelo prefixo os resultados que deixaram de ser úteis.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Campos das previsões que o otimizador usa
+CAMPOS_JOGADOR = ('id', 'nome', 'apelido', 'posicao', 'clubeId', 'preco', 'status')
+CAMPOS_PREVISAO = ('pontosEsperados', 'desvioPadrao')
+
+# Resultados sem rodada informada ficam neste namespace
+SEM_RODADA = '-'
+
+# Depois de uma falha, o Redis é ignorado por este tempo
+SUSPENSAO_REDIS_S = 30
+
+# Uma chave por resultado, com o próprio TTL: optimize:cache:<rodada>:<chave>
+PREFIXO_REDIS = 'optimize:cache:'
+
+# Chaves apagadas por comando na invalidação de uma rodada
+LOTE_INVALIDACAO = 500
+
+
+def _chave_redis(rodada: str, chave: str) -> str:
+    return f'{PREFIXO_REDIS}{rodada}:{chave}'
+
+
+def _padrao_rodada(rodada: str) -> str:
+    """Padrão do SCAN que casa só as chaves da rodada"""
+    escapada = ''.join('\\' + c if c in '*?[]\\' else c for c in rodada)
+    return f'{PREFIXO_REDIS}{escapada}:*'
+
+
+def assinatura_previsoes(previsoes: List[Dict[str, Any]]) -> str:
+    """
+    Hash estável do conjunto de previsões
+    
+    Considera só os campos lidos pelo otimizador e ignora a ordem dos
+    jogadores, então payloads que diferem apenas nisso têm a mesma assinatura.
+    """
+    linhas = []
+    for p in previsoes:
+        jogador = p.get('jogador', {})
+        linhas.append(
+            [jogador.get(c) for c in CAMPOS_JOGADOR] + [p.get(c) for c in CAMPOS_PREVISAO]
+        )
+    linhas.sort(key=lambda linha: str(linha[0]))
+    
+    conteudo = json.dumps(linhas, separators=(',', ':'), default=str)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def chave_pedido(
+    previsoes: List[Dict[str, Any]],
+    orcamento: float,
+    esquema: str,
+    estrategia: str,
+    clubes_excluidos: Optional[List[str]] = None,
+    n_alternativas: int = 2,
+    distancia_minima: int = 2,
+    simular: bool = False,
+    alvo: Optional[float] = None
+) -> str:
+    """Chave canônica de um pedido de otimização"""
+    parametros = [
+        assinatura_previsoes(previsoes),
+        round(float(orcamento), 2),
+        esquema.upper(),
+        estrategia.upper(),
+        sorted(set(clubes_excluidos or [])),
+        n_alternativas,
+        distancia_minima,
+    ]
+    if simular:
+        # Pedidos sem simulação mantêm a chave de antes dela
+        parametros += [True, alvo]
+    conteudo = json.dumps(parametros, separators=(',', ':'))
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def _json_default(valor):
+    # Escalares numpy que sobram no resultado
+    if hasattr(valor, 'item'):
+        return valor.item()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+class OptimizationCache:
+    """
+    Cache em dois níveis (LRU local + Redis) dos resultados do /optimize
+    
+    Pedidos iguais que chegam enquanto o primeiro ainda está sendo resolvido
+    aguardam esse mesmo resultado em vez de ocupar o pool.
+    
+    Args:
+        max_itens: Resultados no LRU local (OPTIMIZE_CACHE_SIZE, 0 desliga o
+            cache)
+        ttl: Validade de um resultado, em segundos (OPTIMIZE_CACHE_TTL_S)
+        redis_url: Redis compartilhado (REDIS_URL)
+    """
+    
+    def __init__(
+        self,
+        max_itens: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_url: Optional[str] = None
+    ):
+        self.max_itens = (
+            max_itens if max_itens is not None
+            else int(os.getenv('OPTIMIZE_CACHE_SIZE', 256))
+        )
+        self.ttl = ttl or float(os.getenv('OPTIMIZE_CACHE_TTL_S', 900))
+        
+        redis_url = redis_url or os.getenv('REDIS_URL')
+        self._redis = None
+        if redis_url and self.max_itens > 0:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(
+                redis_url, socket_timeout=0.2, socket_connect_timeout=0.2
+            )
+        self._redis_suspenso_ate = 0.0
+        
+        # chave -> (rodada, expira_em, resultado)
+        self._local: "OrderedDict[str, Tuple[str, float, Dict[str, Any]]]" = OrderedDict()
+        self._calculando: Dict[str, asyncio.Future] = {}
+        self._contadores = {
+            'hits_local': 0,
+            'hits_redis': 0,
+            'misses': 0,
+            'compartilhados': 0,
+            'invalidacoes': 0,
+            'erros_redis': 0,
+        }
+    
+    @property
+    def ativo(self) -> bool:
+        return self.max_itens > 0
+    
+    def _redis_disponivel(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_suspenso_ate
+    
+    def _falha_redis(self, erro: Exception) -> None:
+        self._contadores['erros_redis'] += 1
+        self._redis_suspenso_ate = time.time() + SUSPENSAO_REDIS_S
+        logger.warning(f"Redis indisponível para o cache do /optimize: {erro}")
+    
+    def _guardar_local(self, chave: str, rodada: str, resultado: Dict[str, Any]) -> None:
+        self._local[chave] = (rodada, time.time() + self.ttl, resultado)
+        self._local.move_to_end(chave)
+        while len(self._local) > self.max_itens:
+            self._local.popitem(last=False)
+    
+    async def _buscar(self, chave: str, rodada: str) -> Optional[Dict[str, Any]]:
+        item = self._local.get(chave)
+        if item is not None:
+            if item[1] > time.time():
+                self._local.move_to_end(chave)
+                self._contadores['hits_local'] += 1
+                return item[2]
+            del self._local[chave]
+        
+        if self._redis_disponivel():
+            try:
+                bruto = await self._redis.get(_chave_redis(rodada, chave))
+            except Exception as e:
+                self._falha_redis(e)
+            else:
+                if bruto is not None:
+                    resultado = json.loads(bruto)
+                    self._guardar_local(chave, rodada, resultado)
+                    self._contadores['hits_redis'] += 1
+                    return resultado
+        
+        return None
+    
+    async def _salvar(self, chave: str, rodada: str, resultado: Dict[str, Any]) -> None:
+        self._guardar_local(chave, rodada, resultado)
+        
+        if self._redis_disponivel():
+            try:
+                conteudo = json.dumps(resultado, separators=(',', ':'), default=_json_default)
+                await self._redis.set(
+                    _chave_redis(rodada, chave), conteudo, ex=max(int(self.ttl), 1)
+                )
+            except Exception as e:
+                self._falha_redis(e)
+    
+    async def get_or_compute(
+        self,
+        chave: str,
+        rodada_id: Optional[str],
+        calcular: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Devolve o resultado em cache ou o calcula com `calcular`
+        
+        Erros de `calcular` são repassados a todos que aguardam a mesma chave
+        e nada é guardado.
+        """
+        if not self.ativo:
+            return await calcular()
+        
+        rodada = rodada_id or SEM_RODADA
+        
+        resultado = await self._buscar(chave, rodada)
+        if resultado is not None:
+            return resultado
+        
+        em_andamento = self._calculando.get(chave)
+        if em_andamento is not None:
+            self._contadores['compartilhados'] += 1
+            return await asyncio.shield(em_andamento)
+        
+        self._contadores['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._calculando[chave] = future
+        try:
+            resultado = await calcular()
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não lida quando ninguém mais aguardava
+            future.exception()
+            raise
+        else:
+            future.set_result(resultado)
+            await self._salvar(chave, rodada, resultado)
+        finally:
+            del self._calculando[chave]
+        
+        return resultado
+    
+    async def invalidar_rodada(self, rodada_id: str) -> int:
+        """
+        Descarta os resultados de uma rodada (local e Redis)
+        
+        Returns:
+            Quantidade de resultados removidos do LRU local
+        """
+        chaves = [chave for chave, item in self._local.items() if item[0] == rodada_id]
+        for chave in chaves:
+            del self._local[chave]
+        
+        if self._redis_disponivel():
+            try:
+                lote = []
+                async for chave in self._redis.scan_iter(
+                    match=_padrao_rodada(rodada_id), count=LOTE_INVALIDACAO
+                ):
+                    lote.append(chave)
+                    if len(lote) >= LOTE_INVALIDACAO:
+                        await self._redis.unlink(*lote)
+                        lote = []
+                if lote:
+                    await self._redis.unlink(*lote)
+            except Exception as e:
+                self._falha_redis(e)
+        
+        self._contadores['invalidacoes'] += 1
+        logger.info(f"Cache do /optimize invalidado para a rodada {rodada_id}")
+        
+        return len(chaves)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de hit/miss e ocupação"""
+        hits = self._contadores['hits_local'] + self._contadores['hits_redis']
+        consultas = hits + self._contadores['misses'] + self._contadores['compartilhados']
+        
+        return {
+            'ativo': self.ativo,
+            'redis': self._redis is not None,
+            'itens_local': len(self._local),
+            'max_itens': self.max_itens,
+            'ttl_s': self.ttl,
+            **self._contadores,
+            'taxa_hit': (hits + self._contadores['compartilhados']) / consultas if consultas else None,
+        }
+    
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -0,0 +1,236 @@
+"""
+Pool de processos para as otimizações de escalação
+
+O /optimize despacha cada pedido para um pool limitado de processos, cada
+um com seu próprio TeamOptimizer (e cache de modelos compilados). O event
+loop fica livre para outras requisições, a fila tem tamanho máximo e o tempo
+de espera na fila é medido separado do tempo de resolução.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from . import instrumentation, profiling
+
+logger = logging.getLogger(__name__)
+
+# Amostras mantidas para os percentis das métricas
+JANELA_METRICAS = 1000
+
+# Otimizador de cada processo do pool, criado pelo initializer
+_optimizer = None
+
+
+class PoolSaturado(RuntimeError):
+    """Fila de otimizações cheia"""
+
+
+def _inicializar(threads: int, tempo_limite: Optional[float]) -> None:
+    """Initializer dos processos: limita threads e cria o otimizador"""
+    global _optimizer
+    
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    
+    from .models.optimizer import TeamOptimizer
+    _optimizer = TeamOptimizer(tempo_limite=tempo_limite, threads=threads)
+    
+    # As métricas do processo voltam ao principal junto com cada resultado
+    instrumentation.coletar_em_buffer()
+
+
+def _otimizar(params: Dict[str, Any], perfil: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Executa uma otimização no processo do pool, medindo o tempo de resolução
+    
+    Devolve também as métricas das etapas, inclusive as de uma otimização
+    que falhou antes (a exceção não as leva). Com `perfil`, a otimização
+    roda sob o profiler, que grava o perfil e os parâmetros.
+    """
+    inicio = time.time()
+    instrumentation.observar_linhas('optimize.jogadores', len(params['previsoes']))
+    if perfil:
+        entradas = {
+            'params': params,
+            'optimizer': {
+                'backend': _optimizer.backend,
+                'tempo_limite': _optimizer.tempo_limite,
+                'threads': _optimizer.threads,
+                'podar': _optimizer.podar,
+                'margem_poda': _optimizer.margem_poda,
+            },
+        }
+        resultado = profiling.perfilar(perfil, entradas, _optimizer.optimize, **params)
+    else:
+        resultado = _optimizer.optimize(**params)
+    return {
+        'resultado': resultado,
+        'inicio': inicio,
+        'resolucao_s': time.time() - inicio,
+        'metricas': instrumentation.drenar(),
+    }
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class OptimizationPool:
+    """
+    Pool limitado de processos para o TeamOptimizer
+    
+    Args:
+        workers: Processos do pool (OPTIMIZER_WORKERS, padrão: núcleos)
+        max_fila: Pedidos aguardando além dos que estão em execução antes de
+            recusar novos (OPTIMIZER_MAX_QUEUE, padrão: 2 por processo)
+        timeout: Tempo máximo de um pedido, incluindo a fila, em segundos
+            (OPTIMIZER_REQUEST_TIMEOUT_S)
+        tempo_limite: Tempo máximo de cada resolução do solver, em segundos
+            (OPTIMIZER_TIME_LIMIT_S)
+        threads: Threads por processo (OPTIMIZER_THREADS)
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_fila: Optional[int] = None,
+        timeout: Optional[float] = None,
+        tempo_limite: Optional[float] = None,
+        threads: Optional[int] = None
+    ):
+        # Variáveis vazias (como no .env.example) valem o padrão
+        self.workers = workers or _env_int('OPTIMIZER_WORKERS', os.cpu_count() or 1)
+        self.max_fila = (
+            max_fila if max_fila is not None
+            else _env_int('OPTIMIZER_MAX_QUEUE', 2 * self.workers)
+        )
+        self.timeout = timeout or _env_float('OPTIMIZER_REQUEST_TIMEOUT_S', 30)
+        self.tempo_limite = tempo_limite or _env_float('OPTIMIZER_TIME_LIMIT_S', 10)
+        self.threads = threads or _env_int('OPTIMIZER_THREADS', 1)
+        
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_inicializar,
+            initargs=(self.threads, self.tempo_limite),
+        )
+        
+        # Pedidos aceitos que ainda ocupam o pool (na fila ou resolvendo,
+        # inclusive os que já estouraram o timeout)
+        self._em_andamento = 0
+        self._contadores = {'concluidas': 0, 'erros': 0, 'recusadas': 0, 'timeouts': 0}
+        self._espera_s = deque(maxlen=JANELA_METRICAS)
+        self._resolucao_s = deque(maxlen=JANELA_METRICAS)
+    
+    @property
+    def capacidade(self) -> int:
+        return self.workers + self.max_fila
+    
+    async def optimize(self, perfil: Optional[Dict[str, Any]] = None, **params) -> Dict[str, Any]:
+        """
+        Resolve um pedido no pool
+        
+        Com `perfil` (de `profiling.novo_perfil`), o worker roda o pedido
+        sob o profiler.
+        
+        Raises:
+            PoolSaturado: A fila está cheia
+            asyncio.TimeoutError: O pedido passou de `timeout`
+        """
+        if self._em_andamento >= self.capacidade:
+            self._contadores['recusadas'] += 1
+            raise PoolSaturado(
+                f"Fila de otimizações cheia ({self._em_andamento} pedidos em andamento)"
+            )
+        
+        loop = asyncio.get_running_loop()
+        self._em_andamento += 1
+        enviado = time.time()
+        try:
+            future = self._executor.submit(_otimizar, params, perfil)
+        except Exception:
+            self._em_andamento -= 1
+            self._contadores['erros'] += 1
+            raise
+        
+        # A vaga só é liberada quando o worker termina (ou o pedido é
+        # cancelado ainda na fila): após um timeout a resolução continua
+        # ocupando o processo e precisa contar na admissão
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._liberar))
+        
+        try:
+            saida = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._contadores['timeouts'] += 1
+            raise
+        except Exception:
+            self._contadores['erros'] += 1
+            raise
+        
+        self._contadores['concluidas'] += 1
+        espera = max(saida['inicio'] - enviado, 0.0)
+        self._espera_s.append(espera)
+        self._resolucao_s.append(saida['resolucao_s'])
+        
+        instrumentation.observar_etapa('optimize.fila', espera)
+        instrumentation.observar_etapa('optimize.worker', saida['resolucao_s'])
+        instrumentation.registrar(saida['metricas'])
+        
+        return saida['resultado']
+    
+    def _liberar(self) -> None:
+        self._em_andamento -= 1
+    
+    def warmup(self) -> None:
+        """Inicia os processos do pool (imports e otimizador) antes do primeiro pedido"""
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Contadores, ocupação e percentis de espera na fila vs. resolução"""
+        def resumo(amostras) -> Dict[str, Optional[float]]:
+            if not amostras:
+                return {'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+            ms = np.array(amostras) * 1000
+            return {
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p99_ms': float(np.percentile(ms, 99)),
+                'max_ms': float(ms.max()),
+            }
+        
+        return {
+            'workers': self.workers,
+            'max_fila': self.max_fila,
+            'em_andamento': self._em_andamento,
+            'na_fila': max(self._em_andamento - self.workers, 0),
+            **self._contadores,
+            'espera_fila': resumo(self._espera_s),
+            'resolucao': resumo(self._resolucao_s),
+        }
+    
+    def pool_status(self) -> Dict[str, Any]:
+        """Ocupação e contadores no formato de `instrumentation.monitorar_pool`"""
+        return {
+            'em_uso': min(self._em_andamento, self.workers),
+            'capacidade': self.workers,
+            'na_fila': max(self._em_andamento - self.workers, 0),
+            'pedidos': dict(self._contadores),
+        }
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,251 @@
+"""
+Cache de previsões por (versão do modelo, rodada, jogador)
+
+Para uma rodada e uma versão do modelo a previsão de um jogador não muda, e
+o /batch-predict já calcula todas elas. O cache guarda esses valores para o
+/predict, que só busca features e roda o modelo para os jogadores que
+faltarem.
+
+Dois níveis: em memória, um array por (versão, rodada) indexado pelo
+jogador, e opcionalmente o Redis (REDIS_URL), compartilhado entre as
+instâncias. A versão do modelo faz parte da chave, então uma ativação nunca
+serve previsões do modelo anterior; o cache local também é descartado nela
+e mantém só as rodadas mais recentes.
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CAMPOS = ('pontos_esperados', 'desvio_padrao', 'intervalo_inferior', 'intervalo_superior')
+
+# Depois de uma falha, o Redis é ignorado por este tempo
+SUSPENSAO_REDIS_S = 30
+
+PREFIXO_REDIS = 'predict:cache:'
+
+
+class _TabelaRodada:
+    """Previsões de uma (versão, rodada): jogador -> linha de `valores`"""
+    
+    def __init__(self):
+        self.indice: Dict[str, int] = {}
+        self.valores = np.empty((0, len(CAMPOS)))
+    
+    def adicionar(self, jogador_ids: List[str], valores: np.ndarray) -> None:
+        novos = []
+        for jogador_id, linha in zip(jogador_ids, valores):
+            posicao = self.indice.get(jogador_id)
+            if posicao is None:
+                self.indice[jogador_id] = len(self.indice)
+                novos.append(linha)
+            else:
+                self.valores[posicao] = linha
+        if novos:
+            self.valores = np.vstack([self.valores, novos])
+
+
+class PredictionCache:
+    """
+    Cache das previsões servidas pelo /predict
+    
+    Args:
+        max_rodadas: Pares (versão, rodada) mantidos em memória
+            (PREDICTIONS_CACHE_RODADAS, 0 desliga o cache)
+        ttl: Validade das previsões no Redis, em segundos
+            (PREDICTIONS_CACHE_TTL_S)
+        redis_url: Redis compartilhado (REDIS_URL)
+    """
+    
+    def __init__(
+        self,
+        max_rodadas: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_url: Optional[str] = None
+    ):
+        self.max_rodadas = (
+            max_rodadas if max_rodadas is not None
+            else int(os.getenv('PREDICTIONS_CACHE_RODADAS', 2))
+        )
+        self.ttl = ttl or float(os.getenv('PREDICTIONS_CACHE_TTL_S', 86400))
+        
+        redis_url = redis_url or os.getenv('REDIS_URL')
+        self._redis = None
+        if redis_url and self.max_rodadas > 0:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(
+                redis_url, socket_timeout=0.2, socket_connect_timeout=0.2
+            )
+        self._redis_suspenso_ate = 0.0
+        
+        self._tabelas: "OrderedDict[Tuple[str, str], _TabelaRodada]" = OrderedDict()
+        self._contadores = {
+            'requisicoes': 0,
+            'requisicoes_sem_miss': 0,
+            'jogadores_hit_local': 0,
+            'jogadores_hit_redis': 0,
+            'jogadores_miss': 0,
+            'invalidacoes': 0,
+            'erros_redis': 0,
+        }
+        # Latência acumulada das requisições com e sem miss, para estimar o
+        # tempo economizado
+        self._latencia = {'com_miss': [0, 0.0], 'sem_miss': [0, 0.0]}
+    
+    @property
+    def ativo(self) -> bool:
+        return self.max_rodadas > 0
+    
+    def _redis_disponivel(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_suspenso_ate
+    
+    def _falha_redis(self, erro: Exception) -> None:
+        self._contadores['erros_redis'] += 1
+        self._redis_suspenso_ate = time.time() + SUSPENSAO_REDIS_S
+        logger.warning(f"Redis indisponível para o cache de previsões: {erro}")
+    
+    def _tabela(self, versao: str, rodada_id: str) -> _TabelaRodada:
+        chave = (versao, rodada_id)
+        tabela = self._tabelas.get(chave)
+        if tabela is None:
+            tabela = self._tabelas[chave] = _TabelaRodada()
+            while len(self._tabelas) > self.max_rodadas:
+                self._tabelas.popitem(last=False)
+        self._tabelas.move_to_end(chave)
+        return tabela
+    
+    async def buscar(
+        self,
+        versao: str,
+        rodada_id: str,
+        jogador_ids: List[str]
+    ) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        Busca as previsões em cache
+        
+        Returns:
+            (colunas dos jogadores encontrados, ids que faltam)
+        """
+        ids = list(dict.fromkeys(str(j) for j in jogador_ids))
+        self._contadores['requisicoes'] += 1
+        
+        if not self.ativo:
+            return _colunas([], np.empty((0, len(CAMPOS)))), ids
+        
+        tabela = self._tabela(versao, rodada_id)
+        posicoes = [tabela.indice.get(j) for j in ids]
+        encontrados = [j for j, p in zip(ids, posicoes) if p is not None]
+        valores = tabela.valores[[p for p in posicoes if p is not None]]
+        faltantes = [j for j, p in zip(ids, posicoes) if p is None]
+        self._contadores['jogadores_hit_local'] += len(encontrados)
+        
+        if faltantes and self._redis_disponivel():
+            try:
+                brutos = await self._redis.hmget(PREFIXO_REDIS + f'{versao}:{rodada_id}', faltantes)
+            except Exception as e:
+                self._falha_redis(e)
+            else:
+                do_redis = [(j, b) for j, b in zip(faltantes, brutos) if b is not None]
+                if do_redis:
+                    ids_redis = [j for j, _ in do_redis]
+                    valores_redis = np.array([
+                        [float(v) for v in b.split(b',')] for _, b in do_redis
+                    ])
+                    tabela.adicionar(ids_redis, valores_redis)
+                    encontrados += ids_redis
+                    valores = np.vstack([valores, valores_redis])
+                    faltantes = [j for j, b in zip(faltantes, brutos) if b is None]
+                    self._contadores['jogadores_hit_redis'] += len(ids_redis)
+        
+        self._contadores['jogadores_miss'] += len(faltantes)
+        
+        return _colunas(encontrados, valores), faltantes
+    
+    async def guardar(self, versao: str, rodada_id: str, colunas: Dict[str, np.ndarray]) -> None:
+        """Guarda previsões no formato de `CartolaPredictor.predict_columnar`"""
+        if not self.ativo or len(colunas['jogador_id']) == 0:
+            return
+        
+        ids = [str(j) for j in colunas['jogador_id']]
+        valores = np.column_stack([np.asarray(colunas[c], dtype=float) for c in CAMPOS])
+        self._tabela(versao, rodada_id).adicionar(ids, valores)
+        
+        if self._redis_disponivel():
+            chave = PREFIXO_REDIS + f'{versao}:{rodada_id}'
+            mapeamento = {
+                j: ','.join(repr(v) for v in linha)
+                for j, linha in zip(ids, valores.tolist())
+            }
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(chave, mapping=mapeamento)
+                    pipe.expire(chave, int(self.ttl))
+                    await pipe.execute()
+            except Exception as e:
+                self._falha_redis(e)
+    
+    def registrar_latencia(self, segundos: float, teve_miss: bool) -> None:
+        """Latência de uma requisição do /predict, para o tempo economizado"""
+        tipo = 'com_miss' if teve_miss else 'sem_miss'
+        self._latencia[tipo][0] += 1
+        self._latencia[tipo][1] += segundos
+        if not teve_miss:
+            self._contadores['requisicoes_sem_miss'] += 1
+    
+    def invalidar(self) -> None:
+        """Descarta o cache em memória (ex.: ao ativar outro modelo)"""
+        self._tabelas = OrderedDict()
+        self._contadores['invalidacoes'] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Taxa de hit por jogador e tempo economizado estimado"""
+        hits = self._contadores['jogadores_hit_local'] + self._contadores['jogadores_hit_redis']
+        total = hits + self._contadores['jogadores_miss']
+        
+        medias = {
+            tipo: (soma / n * 1000 if n else None)
+            for tipo, (n, soma) in self._latencia.items()
+        }
+        economizado = None
+        if medias['com_miss'] is not None and medias['sem_miss'] is not None:
+            economizado = self._latencia['sem_miss'][0] * (medias['com_miss'] - medias['sem_miss'])
+        
+        return {
+            'ativo': self.ativo,
+            'redis': self._redis is not None,
+            'rodadas_em_memoria': [
+                {'versao': versao, 'rodada_id': rodada, 'jogadores': len(tabela.indice)}
+                for (versao, rodada), tabela in self._tabelas.items()
+            ],
+            **self._contadores,
+            'taxa_hit': hits / total if total else None,
+            'latencia_media_ms': medias,
+            'tempo_economizado_ms': economizado,
+        }
+    
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+def _colunas(jogador_ids: List[str], valores: np.ndarray) -> Dict[str, np.ndarray]:
+    colunas = {'jogador_id': np.array(jogador_ids, dtype=object)}
+    for i, campo in enumerate(CAMPOS):
+        colunas[campo] = valores[:, i] if len(valores) else np.empty(0)
+    return colunas
+
+
+def juntar_colunas(partes: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatena resultados colunares (cache + calculados)"""
+    if len(partes) == 1:
+        return partes[0]
+    return {
+        campo: np.concatenate([parte[campo] for parte in partes])
+        for campo in ('jogador_id',) + CAMPOS
+    }
@@ -0,0 +1,300 @@
+"""
+Perfis de requisições sob demanda
+
+Uma requisição ao /optimize ou ao /train com o cabeçalho X-Profile-Token
+igual a PROFILING_TOKEN roda sob um profiler, no processo que faz o
+trabalho (o worker do pool ou o processo de treino). O perfil fica em
+PROFILING_DIR/<id>/ junto com as entradas capturadas (previsões e parâmetros
+da otimização; dados e parâmetros do treino), para reproduzir o caso
+offline com `python -m benchmarks.replay_profile`.
+
+Dois modos (PROFILING_MODE):
+    amostragem: uma thread registra a pilha de todas as threads a cada
+        PROFILING_INTERVAL_MS e grava o perfil no formato do speedscope;
+        o custo não depende do número de chamadas
+    deterministico: cProfile, gravado como pstats; conta cada chamada, com
+        custo proporcional a elas
+
+Sem PROFILING_TOKEN os perfis ficam desligados; com ele, só os
+PROFILING_MAX_PERFIS mais recentes são mantidos em disco.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import hmac
+import pickle
+import shutil
+import pstats
+import logging
+import cProfile
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODOS = ('amostragem', 'deterministico')
+
+ARQUIVO_META = 'meta.json'
+ARQUIVO_ENTRADAS = 'entradas.pkl'
+ARQUIVO_AMOSTRAGEM = 'perfil.speedscope.json'
+ARQUIVO_DETERMINISTICO = 'perfil.prof'
+
+# Funções com mais tempo próprio listadas no resumo do meta.json
+TOP_FUNCOES = 20
+
+
+def autorizar(token: Optional[str]) -> bool:
+    """Confere o token do cabeçalho com PROFILING_TOKEN"""
+    esperado = os.getenv('PROFILING_TOKEN')
+    if not esperado or not token:
+        return False
+    return hmac.compare_digest(token.encode(), esperado.encode())
+
+
+def diretorio_base() -> str:
+    return os.getenv('PROFILING_DIR', '/app/profiles')
+
+
+def novo_perfil(endpoint: str) -> Dict[str, Any]:
+    """
+    Configuração de um perfil, passada ao processo que executa o pedido
+    
+    Returns:
+        {'id', 'endpoint', 'diretorio', 'modo', 'intervalo_s'}
+    
+    Raises:
+        ValueError: PROFILING_MODE inválido
+    """
+    modo = os.getenv('PROFILING_MODE', 'amostragem')
+    if modo not in MODOS:
+        raise ValueError(f"PROFILING_MODE inválido. Opções: {list(MODOS)}")
+    
+    perfil_id = f"{datetime.now():%Y%m%d-%H%M%S}-{endpoint}-{uuid.uuid4().hex[:6]}"
+    return {
+        'id': perfil_id,
+        'endpoint': endpoint,
+        'diretorio': os.path.join(diretorio_base(), perfil_id),
+        'modo': modo,
+        'intervalo_s': float(os.getenv('PROFILING_INTERVAL_MS', 5)) / 1000,
+    }
+
+
+def carregar_meta(perfil_id: str) -> Optional[Dict[str, Any]]:
+    """meta.json de um perfil gravado, ou None se não existe (ainda)"""
+    # O id vira nome de diretório: nada de separadores
+    if os.path.basename(perfil_id) != perfil_id or perfil_id in ('.', '..'):
+        return None
+    caminho = os.path.join(diretorio_base(), perfil_id, ARQUIVO_META)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho) as f:
+        return json.load(f)
+
+
+def carregar_entradas(diretorio: str) -> Dict[str, Any]:
+    """Entradas capturadas de um perfil (só de perfis gravados por este serviço)"""
+    with open(os.path.join(diretorio, ARQUIVO_ENTRADAS), 'rb') as f:
+        return pickle.load(f)
+
+
+class _Amostrador:
+    """
+    Registra periodicamente a pilha de cada thread do processo
+    
+    Cada amostra é a pilha (da raiz à folha) como índices em `frames`, e o
+    peso é o tempo desde a amostra anterior.
+    """
+    
+    def __init__(self, intervalo_s: float):
+        self.intervalo_s = intervalo_s
+        self.frames: List[Dict[str, Any]] = []
+        self._indices: Dict[Tuple[str, str, int], int] = {}
+        self.amostras: Dict[int, List[Tuple[List[int], float]]] = defaultdict(list)
+        self.nomes_threads: Dict[int, str] = {}
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name='perfil-amostragem', daemon=True)
+    
+    def _indice(self, code) -> int:
+        chave = (code.co_name, code.co_filename, code.co_firstlineno)
+        indice = self._indices.get(chave)
+        if indice is None:
+            indice = self._indices[chave] = len(self.frames)
+            self.frames.append({'name': chave[0], 'file': chave[1], 'line': chave[2]})
+        return indice
+    
+    def _executar(self) -> None:
+        proprio = threading.get_ident()
+        anterior = time.perf_counter()
+        while not self._parar.wait(self.intervalo_s):
+            agora = time.perf_counter()
+            peso, anterior = agora - anterior, agora
+            for tid, frame in sys._current_frames().items():
+                if tid == proprio:
+                    continue
+                pilha = []
+                while frame is not None:
+                    pilha.append(self._indice(frame.f_code))
+                    frame = frame.f_back
+                pilha.reverse()
+                self.amostras[tid].append((pilha, peso))
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._parar.set()
+        self._thread.join()
+        nomes = {t.ident: t.name for t in threading.enumerate()}
+        self.nomes_threads = {tid: nomes.get(tid, str(tid)) for tid in self.amostras}
+    
+    def speedscope(self, nome: str) -> Dict[str, Any]:
+        """Perfil no formato de arquivo do speedscope, um perfil por thread"""
+        perfis = []
+        for tid, amostras in self.amostras.items():
+            total = sum(peso for _, peso in amostras)
+            perfis.append({
+                'type': 'sampled',
+                'name': self.nomes_threads.get(tid, str(tid)),
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': [pilha for pilha, _ in amostras],
+                'weights': [peso for _, peso in amostras],
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': nome,
+            'exporter': 'mitabot-ml-service',
+            'shared': {'frames': self.frames},
+            'profiles': perfis,
+        }
+    
+    def resumo(self, tid: int) -> List[Dict[str, Any]]:
+        """Funções da thread `tid` com mais tempo próprio (no topo da pilha)"""
+        inclusivo: Counter = Counter()
+        proprio: Counter = Counter()
+        total = 0.0
+        for pilha, peso in self.amostras.get(tid, []):
+            total += peso
+            for indice in set(pilha):
+                inclusivo[indice] += peso
+            if pilha:
+                proprio[pilha[-1]] += peso
+        
+        return [
+            {
+                'funcao': f"{self.frames[i]['name']} ({self.frames[i]['file']}:{self.frames[i]['line']})",
+                'inclusivo_s': round(inclusivo[i], 4),
+                'proprio_s': round(segundos, 4),
+                'fracao': round(segundos / total, 4) if total else 0.0,
+            }
+            for i, segundos in proprio.most_common(TOP_FUNCOES)
+        ]
+
+
+def _resumo_pstats(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    estatisticas = pstats.Stats(profiler).sort_stats(pstats.SortKey.TIME)
+    funcoes = []
+    for funcao in estatisticas.fcn_list[:TOP_FUNCOES]:
+        _, chamadas, proprio, cumulativo, _ = estatisticas.stats[funcao]
+        arquivo, linha, nome = funcao
+        funcoes.append({
+            'funcao': f"{nome} ({arquivo}:{linha})",
+            'chamadas': chamadas,
+            'inclusivo_s': round(cumulativo, 4),
+            'proprio_s': round(proprio, 4),
+        })
+    return funcoes
+
+
+def _limpar_antigos(base: str) -> None:
+    """Mantém só os PROFILING_MAX_PERFIS perfis mais recentes"""
+    maximo = int(os.getenv('PROFILING_MAX_PERFIS', 50))
+    perfis = sorted(
+        (entrada for entrada in os.scandir(base) if entrada.is_dir()),
+        key=lambda entrada: entrada.stat().st_mtime
+    )
+    for entrada in perfis[:max(len(perfis) - maximo, 0)]:
+        shutil.rmtree(entrada.path, ignore_errors=True)
+
+
+def perfilar(
+    perfil: Dict[str, Any],
+    entradas: Dict[str, Any],
+    fn: Callable[..., Any],
+    *args,
+    **kwargs
+) -> Any:
+    """
+    Executa `fn(*args, **kwargs)` sob o profiler e grava perfil e entradas
+    
+    O perfil é gravado também quando `fn` falha (com o erro no meta.json),
+    e a exceção segue adiante. Uma falha ao gravar só é registrada no log.
+    
+    Args:
+        perfil: Configuração de `novo_perfil`
+        entradas: O necessário para reproduzir a chamada offline
+    
+    Returns:
+        O retorno de `fn`
+    """
+    amostrador = profiler = None
+    if perfil['modo'] == 'deterministico':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        amostrador = _Amostrador(perfil['intervalo_s'])
+        amostrador.start()
+    
+    erro = None
+    inicio = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    except Exception as e:
+        erro = str(e)
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        if profiler is not None:
+            profiler.disable()
+        else:
+            amostrador.stop()
+        
+        try:
+            diretorio = perfil['diretorio']
+            os.makedirs(diretorio, exist_ok=True)
+            
+            if profiler is not None:
+                arquivo = ARQUIVO_DETERMINISTICO
+                profiler.dump_stats(os.path.join(diretorio, arquivo))
+                funcoes = _resumo_pstats(profiler)
+            else:
+                arquivo = ARQUIVO_AMOSTRAGEM
+                with open(os.path.join(diretorio, arquivo), 'w') as f:
+                    json.dump(amostrador.speedscope(perfil['id']), f)
+                funcoes = amostrador.resumo(threading.get_ident())
+            
+            with open(os.path.join(diretorio, ARQUIVO_ENTRADAS), 'wb') as f:
+                pickle.dump(entradas, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            meta = {
+                **perfil,
+                'criado_em': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'duracao_s': round(duracao, 4),
+                'pid': os.getpid(),
+                'arquivo': arquivo,
+                'erro': erro,
+                'funcoes': funcoes,
+            }
+            with open(os.path.join(diretorio, ARQUIVO_META), 'w') as f:
+                json.dump(meta, f, indent=2)
+            
+            _limpar_antigos(os.path.dirname(diretorio))
+            logger.info(f"Perfil {perfil['id']} gravado em {diretorio} ({duracao:.2f}s)")
+        except Exception as e:
+            logger.error(f"Erro ao gravar o perfil {perfil['id']}: {e}")
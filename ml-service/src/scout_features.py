@@ -0,0 +1,334 @@
+"""
+Features de scouts e de confronto por (jogador, rodada)
+
+Calculadas numa única passada vetorizada sobre a temporada: os scouts viram
+matrizes jogador x rodada e os jogos, matrizes clube x rodada, e as janelas
+"N rodadas anteriores" saem de somas acumuladas ao longo das rodadas (a
+mesma semântica da feature store: rodada sem scout não conta como jogo).
+O treino (`get_training_data`) e a predição (`get_jogadores_features`,
+`iter_features_rodadas`) leem o mesmo resultado, então não há divergência
+entre as features de um e de outro, e ele fica em cache por rodada.
+
+Features:
+    gols_ultimas_3, assistencias_ultimas_3: soma nas 3 rodadas anteriores
+    scout_ofensivo: gols + assistências + finalizações por jogo nas 5
+        rodadas anteriores
+    scout_defensivo: desarmes + defesas por jogo nas 5 rodadas anteriores
+    eh_mandante: o clube do jogador joga em casa na rodada
+    forca_adversario: elo do adversário antes da rodada, calculado só com
+        os resultados das rodadas anteriores (todos começam a temporada com
+        ELO_INICIAL)
+    prob_fazer_gol, prob_sofrer_gol: 1 - exp(-λ), com λ a média entre os
+        gols marcados pelo clube e os sofridos pelo adversário por jogo nas
+        5 rodadas anteriores (e o inverso para sofrer)
+
+Sem jogo na rodada ou sem histórico ficam os valores de PADROES.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Valor de cada feature sem jogo na rodada ou sem histórico
+PADROES = {
+    'gols_ultimas_3': 0.0,
+    'assistencias_ultimas_3': 0.0,
+    'scout_ofensivo': 0.0,
+    'scout_defensivo': 0.0,
+    'eh_mandante': 0,
+    'forca_adversario': 1500.0,
+    'prob_fazer_gol': 0.5,
+    'prob_sofrer_gol': 0.5,
+}
+
+COLUNAS = list(PADROES)
+
+# Elo dos clubes por rodada: valor inicial e passo da atualização por jogo
+ELO_INICIAL = PADROES['forca_adversario']
+ELO_K = 20.0
+
+
+def _janela(matriz: np.ndarray, k: int) -> np.ndarray:
+    """Soma, para cada rodada (coluna), das `k` rodadas anteriores"""
+    acumulada = np.zeros((matriz.shape[0], matriz.shape[1] + 1))
+    np.cumsum(matriz, axis=1, out=acumulada[:, 1:])
+    fim = np.arange(matriz.shape[1])
+    return acumulada[:, fim] - acumulada[:, np.maximum(fim - k, 0)]
+
+
+def _por_jogo(total: np.ndarray, jogos: np.ndarray) -> np.ndarray:
+    """Média por jogo; NaN onde não houve jogo na janela"""
+    return np.divide(total, jogos, out=np.full(total.shape, np.nan), where=jogos > 0)
+
+
+def _elo_antes_da_rodada(
+    mandantes: np.ndarray,
+    visitantes: np.ndarray,
+    rodadas_jogo: np.ndarray,
+    saldo: np.ndarray,
+    n_clubes: int,
+    n_rodadas: int
+) -> np.ndarray:
+    """
+    Elo de cada clube (linha) no início de cada rodada (coluna)
+    
+    Os jogos de uma rodada usam o elo do início dela e são aplicados
+    juntos; jogos sem placar (saldo NaN) não mudam o elo.
+    """
+    elo = np.full(n_clubes, ELO_INICIAL)
+    antes = np.empty((n_clubes, n_rodadas))
+    com_placar = ~np.isnan(saldo)
+    ordem = np.argsort(rodadas_jogo, kind='stable')
+    limites = np.searchsorted(rodadas_jogo[ordem], np.arange(n_rodadas + 1))
+    
+    for r in range(n_rodadas):
+        antes[:, r] = elo
+        jogos = ordem[limites[r]:limites[r + 1]]
+        jogos = jogos[com_placar[jogos]]
+        m, v = mandantes[jogos], visitantes[jogos]
+        esperado = 1 / (1 + 10 ** ((elo[v] - elo[m]) / 400))
+        delta = ELO_K * ((np.sign(saldo[jogos]) + 1) / 2 - esperado)
+        np.add.at(elo, m, delta)
+        np.add.at(elo, v, -delta)
+    
+    return antes
+
+
+def calcular_features(
+    rodadas: pd.DataFrame,
+    clubes: pd.DataFrame,
+    jogadores: pd.DataFrame,
+    scouts: pd.DataFrame,
+    jogos: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Features de todos os jogadores em todas as rodadas
+    
+    Args:
+        rodadas: id e numero, em ordem de numero
+        clubes: id
+        jogadores: id e clube_id (clube atual, usado nas rodadas sem scout)
+        scouts: jogador_id, rodada_id, clube_id, gols, assistencias,
+            finalizacoes, desarmes e defesas
+        jogos: rodada_id, clube_mandante_id, clube_visitante_id,
+            gols_mandante e gols_visitante (nulos antes do jogo)
+    
+    Returns:
+        Uma linha por (rodada, jogador), ordenada por rodada: jogador_id,
+        rodada_id, rodada_numero e as colunas de COLUNAS
+    """
+    indice_rodada = pd.Index(rodadas['id'])
+    indice_jogador = pd.Index(jogadores['id'])
+    indice_clube = pd.Index(clubes['id'])
+    n_jogadores, n_rodadas, n_clubes = len(indice_jogador), len(indice_rodada), len(indice_clube)
+    
+    # Scouts: matrizes jogador x rodada (0 onde o jogador não jogou)
+    j = indice_jogador.get_indexer(scouts['jogador_id'])
+    r = indice_rodada.get_indexer(scouts['rodada_id'])
+    validos = (j >= 0) & (r >= 0)
+    j, r = j[validos], r[validos]
+    
+    def matriz(valores) -> np.ndarray:
+        m = np.zeros((n_jogadores, n_rodadas))
+        m[j, r] = np.asarray(valores, dtype=float)[validos]
+        return m
+    
+    jogou = matriz(np.ones(len(scouts)))
+    gols = matriz(scouts['gols'])
+    assistencias = matriz(scouts['assistencias'])
+    ofensivo = gols + assistencias + matriz(scouts['finalizacoes'])
+    defensivo = matriz(scouts['desarmes']) + matriz(scouts['defesas'])
+    
+    jogos_5 = _janela(jogou, 5)
+    
+    # Clube do jogador em cada rodada: o do scout quando há, senão o atual
+    clube = np.repeat(indice_clube.get_indexer(jogadores['clube_id'])[:, None], n_rodadas, axis=1)
+    clube_scout = indice_clube.get_indexer(scouts['clube_id'])[validos]
+    conhecido = clube_scout >= 0
+    clube[j[conhecido], r[conhecido]] = clube_scout[conhecido]
+    
+    # Jogos: adversário, mando e placar por clube x rodada
+    m = indice_clube.get_indexer(jogos['clube_mandante_id'])
+    v = indice_clube.get_indexer(jogos['clube_visitante_id'])
+    rj = indice_rodada.get_indexer(jogos['rodada_id'])
+    validos_jogo = (m >= 0) & (v >= 0) & (rj >= 0)
+    m, v, rj = m[validos_jogo], v[validos_jogo], rj[validos_jogo]
+    
+    adversario = np.full((n_clubes, n_rodadas), -1)
+    mandante = np.zeros((n_clubes, n_rodadas), dtype=bool)
+    adversario[m, rj] = v
+    adversario[v, rj] = m
+    mandante[m, rj] = True
+    
+    gols_mandante = jogos['gols_mandante'].to_numpy(dtype=float)[validos_jogo]
+    gols_visitante = jogos['gols_visitante'].to_numpy(dtype=float)[validos_jogo]
+    com_placar = ~(np.isnan(gols_mandante) | np.isnan(gols_visitante))
+    gols_pro = np.zeros((n_clubes, n_rodadas))
+    gols_contra = np.zeros((n_clubes, n_rodadas))
+    jogou_clube = np.zeros((n_clubes, n_rodadas))
+    for lado, marcados, sofridos in ((m, gols_mandante, gols_visitante), (v, gols_visitante, gols_mandante)):
+        gols_pro[lado[com_placar], rj[com_placar]] = marcados[com_placar]
+        gols_contra[lado[com_placar], rj[com_placar]] = sofridos[com_placar]
+        jogou_clube[lado[com_placar], rj[com_placar]] = 1
+    
+    elo = _elo_antes_da_rodada(m, v, rj, gols_mandante - gols_visitante, n_clubes, n_rodadas)
+    
+    jogos_clube_5 = _janela(jogou_clube, 5)
+    marcados_5 = _por_jogo(_janela(gols_pro, 5), jogos_clube_5)
+    sofridos_5 = _por_jogo(_janela(gols_contra, 5), jogos_clube_5)
+    
+    # Do clube para o jogador: índices (clube, rodada) de cada célula, com -1
+    # (clube desconhecido ou sem jogo) apontando para uma linha de NaN
+    rodada = np.broadcast_to(np.arange(n_rodadas), (n_jogadores, n_rodadas))
+    com_clube = clube >= 0
+    adv = np.where(com_clube, adversario[np.maximum(clube, 0), rodada], -1)
+    com_jogo = adv >= 0
+    
+    def do_clube(valores: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        estendida = np.vstack([valores, np.full((1, n_rodadas), np.nan)])
+        return estendida[np.where(indices >= 0, indices, n_clubes), rodada]
+    
+    def media(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Média ignorando NaN; NaN se ambos são NaN"""
+        n = (~np.isnan(a)).astype(float) + ~np.isnan(b)
+        return _por_jogo(np.nan_to_num(a) + np.nan_to_num(b), n)
+    
+    clube_jogo = np.where(com_jogo, clube, -1)
+    lambda_fazer = media(do_clube(marcados_5, clube_jogo), do_clube(sofridos_5, adv))
+    lambda_sofrer = media(do_clube(sofridos_5, clube_jogo), do_clube(marcados_5, adv))
+    
+    features = {
+        'gols_ultimas_3': _janela(gols, 3),
+        'assistencias_ultimas_3': _janela(assistencias, 3),
+        'scout_ofensivo': np.nan_to_num(_por_jogo(_janela(ofensivo, 5), jogos_5)),
+        'scout_defensivo': np.nan_to_num(_por_jogo(_janela(defensivo, 5), jogos_5)),
+        'eh_mandante': (com_jogo & mandante[np.maximum(clube, 0), rodada]).astype(int),
+        'forca_adversario': np.nan_to_num(do_clube(elo, adv), nan=PADROES['forca_adversario']),
+        'prob_fazer_gol': np.where(
+            np.isnan(lambda_fazer), PADROES['prob_fazer_gol'], 1 - np.exp(-lambda_fazer)
+        ),
+        'prob_sofrer_gol': np.where(
+            np.isnan(lambda_sofrer), PADROES['prob_sofrer_gol'], 1 - np.exp(-lambda_sofrer)
+        ),
+    }
+    
+    # Ordem por rodada: as linhas de cada rodada ficam contíguas
+    return pd.DataFrame({
+        'jogador_id': np.tile(indice_jogador.to_numpy(), n_rodadas),
+        'rodada_id': np.repeat(indice_rodada.to_numpy(), n_jogadores),
+        'rodada_numero': np.repeat(rodadas['numero'].to_numpy(), n_jogadores),
+        **{coluna: valores.T.ravel() for coluna, valores in features.items()},
+    })
+
+
+class ScoutFeatures:
+    """
+    Features de scouts e confronto lidas do banco, em cache por rodada
+    
+    Uma rodada fora do cache dispara a passada sobre a temporada inteira,
+    que guarda todas as rodadas. O cache expira após `ttl` segundos
+    (FEATURES_CACHE_TTL_S, padrão 300) ou com `invalidar`.
+    """
+    
+    def __init__(self, engine: Engine, ttl: Optional[float] = None):
+        self.engine = engine
+        self.ttl = ttl if ttl is not None else float(os.getenv('FEATURES_CACHE_TTL_S', 300))
+        self._rodadas: Dict[str, pd.DataFrame] = {}
+        # Rodadas pedidas que não existiam no último cálculo
+        self._desconhecidas: Set[str] = set()
+        self._calculado_em = 0.0
+        self._lock = threading.Lock()
+    
+    def _carregar(self) -> Dict[str, pd.DataFrame]:
+        consultas = {
+            'rodadas': "SELECT id, numero FROM rodadas ORDER BY numero",
+            'clubes': "SELECT id FROM clubes",
+            'jogadores': "SELECT id, clube_id FROM jogadores",
+            'scouts': """
+                SELECT jogador_id, rodada_id, clube_id, gols, assistencias,
+                       finalizacoes, desarmes, defesas
+                FROM scouts
+            """,
+            'jogos': """
+                SELECT rodada_id, clube_mandante_id, clube_visitante_id,
+                       gols_mandante, gols_visitante
+                FROM jogos
+            """,
+        }
+        with self.engine.connect() as conn:
+            return {nome: pd.read_sql(text(sql), conn) for nome, sql in consultas.items()}
+    
+    def _calcular(self) -> None:
+        with instrumentation.etapa('db.scout_features'):
+            dados = self._carregar()
+            features = calcular_features(**dados)
+        instrumentation.observar_linhas('db.scout_features', len(dados['scouts']))
+        
+        n_jogadores = len(dados['jogadores'])
+        self._rodadas = {
+            rodada_id: features.iloc[k * n_jogadores:(k + 1) * n_jogadores]
+            for k, rodada_id in enumerate(dados['rodadas']['id'])
+        }
+        self._desconhecidas = set()
+        self._calculado_em = time.time()
+        
+        logger.info(
+            f"Features de scouts calculadas: {len(dados['scouts'])} scouts, "
+            f"{len(dados['jogos'])} jogos, {len(self._rodadas)} rodadas"
+        )
+    
+    def features(self, rodada_ids: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Features das rodadas pedidas (todas se None), no formato de
+        `calcular_features`; rodadas desconhecidas não têm linhas
+        """
+        with self._lock:
+            expirado = time.time() - self._calculado_em > self.ttl
+            if expirado or (rodada_ids is not None and any(
+                r not in self._rodadas and r not in self._desconhecidas for r in rodada_ids
+            )):
+                self._calcular()
+                self._desconhecidas = set(rodada_ids or ()) - set(self._rodadas)
+            
+            if rodada_ids is None:
+                partes = list(self._rodadas.values())
+            else:
+                partes = [self._rodadas[r] for r in dict.fromkeys(rodada_ids) if r in self._rodadas]
+        
+        if not partes:
+            return pd.DataFrame({
+                'jogador_id': pd.Series(dtype=object),
+                'rodada_id': pd.Series(dtype=object),
+                'rodada_numero': pd.Series(dtype='int64'),
+                **{coluna: pd.Series(dtype=float) for coluna in COLUNAS},
+            })
+        return pd.concat(partes, ignore_index=True)
+    
+    def invalidar(self) -> None:
+        """Descarta o cache (scouts ou jogos novos)"""
+        with self._lock:
+            self._rodadas = {}
+            self._calculado_em = 0.0
+    
+    @staticmethod
+    def juntar(df: pd.DataFrame, features: pd.DataFrame, chave: str) -> pd.DataFrame:
+        """
+        Acrescenta as features a `df` pelas colunas jogador_id e `chave`
+        (rodada_id ou rodada_numero), mantendo a ordem das linhas
+        """
+        df = df.drop(columns=[c for c in COLUNAS if c in df.columns])
+        df = df.merge(features[['jogador_id', chave] + COLUNAS], on=['jogador_id', chave], how='left')
+        df = df.fillna(PADROES)
+        df['eh_mandante'] = df['eh_mandante'].astype(int)
+        return df
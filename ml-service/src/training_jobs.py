@@ -0,0 +1,284 @@
+"""
+Jobs de treinamento em segundo plano
+
+O treinamento roda em um processo separado (spawn), sem bloquear o event
+loop nem disputar o GIL com as requisições de predição. O processo filho
+envia o progresso por uma fila e registra o modelo como nova versão no
+registro; o processo principal só ativa e troca o modelo servido quando o
+treino termina com sucesso.
+"""
+
+import time
+import uuid
+import queue
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Jobs finalizados mantidos para consulta de status
+MAX_JOBS_HISTORICO = 20
+
+STATUS_FINAIS = ('COMPLETADO', 'ERRO', 'CANCELADO')
+
+
+@dataclass
+class TrainingJob:
+    id: str
+    params: Dict[str, Any]
+    status: str = 'PENDENTE'  # PENDENTE, PROCESSANDO, COMPLETADO, ERRO, CANCELADO
+    fase: Optional[str] = None
+    folds_concluidos: int = 0
+    total_folds: int = 0
+    iniciado_em: float = field(default_factory=time.time)
+    finalizado_em: Optional[float] = None
+    metrics: Optional[Dict[str, Any]] = None
+    message: Optional[str] = None
+    error: Optional[str] = None
+    
+    @property
+    def finalizado(self) -> bool:
+        return self.status in STATUS_FINAIS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        fim = self.finalizado_em or time.time()
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'fase': self.fase,
+            'folds_concluidos': self.folds_concluidos,
+            'total_folds': self.total_folds,
+            'tempo_decorrido_s': round(fim - self.iniciado_em, 2),
+            'metrics': self.metrics,
+            'message': self.message,
+            'error': self.error,
+        }
+
+
+def _executar_treino(
+    params: Dict[str, Any],
+    database_url: Optional[str],
+    model_path: str,
+    fila
+) -> None:
+    """
+    Corpo do processo filho: carrega os dados, treina e registra a versão
+    
+    Com params['perfil'] (de `profiling.novo_perfil`), o treino roda sob o
+    profiler, que grava o perfil com os dados e parâmetros do treino.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    from . import profiling
+    from .database import Database
+    from .models.predictor import CartolaPredictor
+    from .models.registry import ModelRegistry
+    
+    def progresso(fase: str, detalhes: Dict[str, Any]) -> None:
+        fila.put(('progresso', fase, detalhes))
+    
+    try:
+        registry = ModelRegistry(model_path)
+        base = registry.active_version()
+        
+        predictor = CartolaPredictor()
+        if not params['retrain'] and base:
+            predictor = registry.load(base)
+        
+        # Incremental: basta buscar as rodadas que o modelo ainda não viu
+        incremental = (
+            not params['retrain']
+            and predictor.is_fitted
+            and predictor.ultima_rodada is not None
+        )
+        desde_rodada = predictor.ultima_rodada + 1 if incremental else None
+        
+        progresso('carregando_dados', {})
+        db = Database(database_url, pool_size=0)
+        try:
+            training_data = db.get_training_data(params['rodadas'], desde_rodada)
+        finally:
+            db.close()
+        
+        if incremental and training_data.empty:
+            fila.put((
+                'concluido', None, predictor.metrics,
+                "Nenhuma rodada nova desde o último treinamento"
+            ))
+            return
+        
+        if not incremental and len(training_data) < 100:
+            raise ValueError(
+                f"Dados insuficientes para treinamento. Encontrados: {len(training_data)}"
+            )
+        
+        opcoes = {
+            'retrain': params['retrain'],
+            'folds_paralelos': params.get('folds_paralelos'),
+            'threads_por_fold': params.get('threads_por_fold'),
+            'early_stopping_rounds': params.get('early_stopping_rounds'),
+        }
+        if params.get('perfil'):
+            entradas = {
+                'training_data': training_data,
+                'opcoes': opcoes,
+                # O incremental continua a partir desta versão do registro
+                'base': base if incremental else None,
+            }
+            metrics = profiling.perfilar(
+                params['perfil'], entradas, predictor.train,
+                training_data, progresso=progresso, **opcoes
+            )
+        else:
+            metrics = predictor.train(training_data, progresso=progresso, **opcoes)
+        
+        progresso('salvando', {})
+        versao = registry.save(predictor, base=base if incremental else None)
+        
+        fila.put(('concluido', versao, metrics, "Modelo treinado com sucesso"))
+    
+    except Exception as e:
+        logger.error(f"Erro no treinamento: {e}")
+        fila.put(('erro', str(e)))
+
+
+class TrainingJobManager:
+    """
+    Dispara e acompanha jobs de treinamento (um por vez)
+    
+    Args:
+        database_url: URL do banco usada pelo processo de treino
+        model_path: Diretório do registro de modelos (a versão ativa é a
+            base do treino incremental)
+        on_model_ready: Chamado com a nova versão ao fim de um treino
+            bem-sucedido; é quem ativa e troca o modelo servido
+    """
+    
+    def __init__(
+        self,
+        database_url: Optional[str],
+        model_path: str,
+        on_model_ready: Callable[[str], None]
+    ):
+        self.database_url = database_url
+        self.model_path = model_path
+        self.on_model_ready = on_model_ready
+        self.jobs: 'OrderedDict[str, TrainingJob]' = OrderedDict()
+        self._processos: Dict[str, multiprocessing.Process] = {}
+        self._ctx = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+    
+    def em_andamento(self) -> Optional[TrainingJob]:
+        """Job ainda não finalizado, se houver"""
+        return next((j for j in self.jobs.values() if not j.finalizado), None)
+    
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        return self.jobs.get(job_id)
+    
+    def submit(self, params: Dict[str, Any]) -> TrainingJob:
+        """Inicia um treinamento e retorna o job imediatamente"""
+        with self._lock:
+            if self.em_andamento():
+                raise RuntimeError("Já existe um treinamento em andamento")
+            
+            job = TrainingJob(id=uuid.uuid4().hex[:12], params=params)
+            self.jobs[job.id] = job
+            while len(self.jobs) > MAX_JOBS_HISTORICO:
+                self.jobs.popitem(last=False)
+        
+        fila = self._ctx.Queue()
+        processo = self._ctx.Process(
+            target=_executar_treino,
+            args=(params, self.database_url, self.model_path, fila),
+            name=f'treino-{job.id}',
+            daemon=True,
+        )
+        processo.start()
+        self._processos[job.id] = processo
+        job.status = 'PROCESSANDO'
+        
+        threading.Thread(
+            target=self._acompanhar,
+            args=(job, processo, fila),
+            name=f'acompanha-{job.id}',
+            daemon=True,
+        ).start()
+        
+        logger.info(f"Treinamento {job.id} iniciado (pid {processo.pid})")
+        
+        return job
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancela um job em andamento; False se não existe ou já terminou"""
+        job = self.jobs.get(job_id)
+        processo = self._processos.get(job_id)
+        if not job or job.finalizado or not processo:
+            return False
+        
+        self._finalizar(job, 'CANCELADO', message="Treinamento cancelado")
+        processo.terminate()
+        
+        logger.info(f"Treinamento {job_id} cancelado")
+        
+        return True
+    
+    def shutdown(self) -> None:
+        """Cancela os jobs em andamento (encerramento do serviço)"""
+        for job_id in list(self._processos):
+            self.cancel(job_id)
+    
+    def _finalizar(self, job: TrainingJob, status: str, **campos) -> None:
+        for chave, valor in campos.items():
+            setattr(job, chave, valor)
+        job.status = status
+        job.finalizado_em = time.time()
+    
+    def _acompanhar(self, job: TrainingJob, processo, fila) -> None:
+        """Consome a fila de progresso do processo filho até o fim do job"""
+        try:
+            while not job.finalizado:
+                try:
+                    mensagem = fila.get(timeout=1)
+                except queue.Empty:
+                    if not processo.is_alive() and not job.finalizado:
+                        self._finalizar(
+                            job, 'ERRO',
+                            error=f"Processo de treino terminou (código {processo.exitcode})"
+                        )
+                    continue
+                
+                tipo = mensagem[0]
+                if tipo == 'progresso':
+                    _, fase, detalhes = mensagem
+                    if fase == 'fold':
+                        job.folds_concluidos += 1
+                    else:
+                        job.fase = fase
+                        job.total_folds = detalhes.get('total_folds', job.total_folds)
+                
+                elif tipo == 'concluido':
+                    _, versao, metrics, message = mensagem
+                    if job.finalizado:
+                        break
+                    if versao:
+                        self.on_model_ready(versao)
+                    self._finalizar(job, 'COMPLETADO', metrics=metrics, message=message)
+                
+                elif tipo == 'erro':
+                    self._finalizar(job, 'ERRO', error=mensagem[1])
+        
+        except Exception as e:
+            logger.error(f"Erro ao finalizar treinamento {job.id}: {e}")
+            self._finalizar(job, 'ERRO', error=str(e))
+        
+        finally:
+            processo.join(timeout=10)
+            self._processos.pop(job.id, None)
+            logger.info(f"Treinamento {job.id} finalizado: {job.status}")
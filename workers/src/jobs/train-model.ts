@@ -4,9 +4,13 @@
 
 import axios from 'axios';
 
+// Intervalo entre consultas ao status do treinamento
+const POLL_INTERVAL_MS = 5000;
+
 interface TrainingData {
   timestamp: string;
   rodadas?: number[];
+  retrain?: boolean; // true força o treino completo; padrão é incremental
 }
 
 export async function processModelTraining(data: TrainingData): Promise<void> {
@@ -15,13 +19,15 @@ export async function processModelTraining(data: TrainingData): Promise<void> {
   const mlServiceUrl = process.env.ML_SERVICE_URL || 'http://localhost:8000';
   
   try {
-    // Chamar API de treinamento do ML Service
+    // Chamar API de treinamento do ML Service (roda em segundo plano)
     const response = await axios.post(`${mlServiceUrl}/train`, {
       rodadas: data.rodadas,
-      retrain: true,
+      retrain: data.retrain ?? false,
     });
     
-    console.log('[Train Model] Treinamento concluído:', response.data);
+    const status = await aguardarTreinamento(mlServiceUrl, response.data.job_id);
+    
+    console.log('[Train Model] Treinamento concluído:', status.message, status.metrics);
     
     // Após treinamento, gerar previsões para a rodada atual
     await gerarPrevisoesRodadaAtual(mlServiceUrl);
@@ -32,6 +38,29 @@ export async function processModelTraining(data: TrainingData): Promise<void> {
   }
 }
 
+async function aguardarTreinamento(mlServiceUrl: string, jobId: string): Promise<any> {
+  console.log(`[Train Model] Aguardando job ${jobId}...`);
+  
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    
+    const { data: status } = await axios.get(`${mlServiceUrl}/train/${jobId}`);
+    
+    if (status.status === 'COMPLETADO') {
+      return status;
+    }
+    
+    if (status.status === 'ERRO' || status.status === 'CANCELADO') {
+      throw new Error(`Treinamento ${jobId} ${status.status}: ${status.error || status.message}`);
+    }
+    
+    console.log(
+      `[Train Model] ${status.fase || 'iniciando'} ` +
+      `(folds ${status.folds_concluidos}/${status.total_folds}, ${status.tempo_decorrido_s}s)`
+    );
+  }
+}
+
 async function gerarPrevisoesRodadaAtual(mlServiceUrl: string): Promise<void> {
   console.log('[Train Model] Gerando previsões para rodada atual...');
   